@@ -205,29 +205,6 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
-try:
-    import plotly.graph_objects as go
-    import plotly.express as px
-except:
-    st.error("need to install plotly")
-    st.stop()
-
-sys.path.append(os.path.dirname(__file__))
-
-try:
-    from src.data_fetchers import YahooFinanceFetcher
-    from src.data_processing import ReturnCalculator, VolatilityCalculator
-except Exception as e:
-    st.error(f"error: {e}")
-    st.stop()
-
-if 'fetcher' not in st.session_state:
-    st.session_state.fetcher = YahooFinanceFetcher()
-if 'calc' not in st.session_state:
-    st.session_state.calc = ReturnCalculator()
-if 'risk_calc' not in st.session_state:
-    st.session_state.risk_calc = VolatilityCalculator()
-
 st.markdown("""
 <div style='text-align: left; margin-bottom: 0.5rem; padding-top: 5rem;'>
     <h1 style='font-size: 4.5rem; font-weight: 300; color: #ffffff; letter-spacing: -0.03em; line-height: 1.1; margin: 0; padding: 0; font-family: "Google Sans Code", sans-serif;'>
@@ -268,6 +245,35 @@ plotly_template = {
     }
 }
 
+# Heavy imports are deferred until the header and navigation have rendered,
+# and page-specific ones are made inside the page that needs them
+try:
+    import plotly.graph_objects as go
+except:
+    st.error("need to install plotly")
+    st.stop()
+
+sys.path.append(os.path.dirname(__file__))
+
+try:
+    from src.data_fetchers import YahooFinanceFetcher, OHLCVStore
+    from src.data_processing import ReturnCalculator, MemoizedCalculator
+except Exception as e:
+    st.error(f"error: {e}")
+    st.stop()
+
+if 'fetcher' not in st.session_state:
+    try:
+        store = OHLCVStore()
+    except ImportError:
+        store = None
+    st.session_state.fetcher = YahooFinanceFetcher(store=store)
+if 'calc' not in st.session_state:
+    st.session_state.calc = MemoizedCalculator(ReturnCalculator())
+if page in ("Compare Stocks", "Risk Metrics") and 'risk_calc' not in st.session_state:
+    from src.data_processing import VolatilityCalculator
+    st.session_state.risk_calc = MemoizedCalculator(VolatilityCalculator())
+
 if page == "Stock Analysis":
     st.markdown("<h2 style='color: #ffffff; margin-top: 0; margin-bottom: 0.5rem;'>Stock Analysis</h2>", unsafe_allow_html=True)
     st.markdown("<p style='color: #a0a0a0; margin-bottom: 0.75rem; font-size: 1rem;'>Analyze individual stocks with price charts, volume data, and returns analysis</p>", unsafe_allow_html=True)
@@ -299,11 +305,37 @@ if page == "Stock Analysis":
                 with col3:
                     st.metric("Volume", f"{data['volume'].iloc[-1]:,.0f}")
                 
+                from src.data_processing import ResamplingPyramid
+                
+                # Daily and weekly bars are kept per ticker and only extended
+                # with new rows, so switching bar size does no resampling
+                ohlcv = data[['open', 'high', 'low', 'close', 'volume']]
+                pyramid = st.session_state.pyramid if st.session_state.get('pyramid_key') == (ticker, period) else None
+                if pyramid is not None:
+                    daily = pyramid['1d']
+                    last = daily.index[-1]
+                    # Rows before the forming bar must be unchanged; restated
+                    # history (e.g. dividend-adjusted closes) or a window that
+                    # moved forward means a rebuild
+                    before = ohlcv[ohlcv.index < last]
+                    kept = daily[daily.index < last]
+                    if not (before.index.equals(kept.index) and np.array_equal(before.to_numpy(float), kept.to_numpy(float), equal_nan=True)):
+                        pyramid = None
+                if pyramid is None:
+                    pyramid = ResamplingPyramid(['1d', '1w'])
+                    pyramid.append(ohlcv)
+                    st.session_state.pyramid = pyramid
+                    st.session_state.pyramid_key = (ticker, period)
+                else:
+                    pyramid.append(ohlcv[ohlcv.index >= last])
+                bar_size = st.selectbox("Bar size", ["1d", "1w"], index=0)
+                bars = pyramid[bar_size]
+                
                 st.markdown("<h3 style='color: #ffffff; margin-top: 1rem; margin-bottom: 0.5rem;'>Price Chart</h3>", unsafe_allow_html=True)
                 fig = go.Figure()
                 fig.add_trace(go.Scatter(
-                    x=data.index, 
-                    y=data['close'], 
+                    x=bars.index, 
+                    y=bars['close'], 
                     mode='lines', 
                     name='Price',
                     line=dict(color=colors['tropical_indigo'], width=2),
@@ -322,8 +354,8 @@ if page == "Stock Analysis":
                 st.markdown("<h3 style='color: #ffffff; margin-top: 1rem; margin-bottom: 0.5rem;'>Volume</h3>", unsafe_allow_html=True)
                 fig2 = go.Figure()
                 fig2.add_trace(go.Bar(
-                    x=data.index, 
-                    y=data['volume'], 
+                    x=bars.index, 
+                    y=bars['volume'], 
                     name='Volume',
                     marker_color=colors['tekhelet'],
                     marker_line_color=colors['tropical_indigo'],
@@ -400,6 +432,8 @@ if page == "Stock Analysis":
             st.error(f"error: {e}")
 
 elif page == "Compare Stocks":
+    import plotly.express as px
+    
     st.markdown("<h2 style='color: #ffffff; margin-top: 0; margin-bottom: 0.5rem;'>Compare Stocks</h2>", unsafe_allow_html=True)
     st.markdown("<p style='color: #a0a0a0; margin-bottom: 0.75rem; font-size: 1rem;'>Compare multiple stocks side-by-side with performance metrics and risk analysis</p>", unsafe_allow_html=True)
     
@@ -416,27 +450,20 @@ elif page == "Compare Stocks":
             if len(data) == 0:
                 st.error("no data")
             else:
-                results = {}
-                for ticker in tickers:
-                    try:
-                        # yfinance returns multi-index columns for multiple stocks
-                        if isinstance(data.columns, pd.MultiIndex):
-                            prices = data[('Close', ticker)]
-                        else:
-                            prices = data['close'] if 'close' in data.columns else data['Close']
-                        
-                        returns = st.session_state.calc.simple_returns(prices)
-                        results[ticker] = {
-                            'Return': st.session_state.calc.annualized_return(returns),
-                            'Volatility': st.session_state.risk_calc.realized_volatility(returns),
-                            'Sharpe': st.session_state.risk_calc.sharpe_ratio(returns),
-                            'MaxDD': st.session_state.risk_calc.max_drawdown(returns)
-                        }
-                    except:
-                        continue
+                # yfinance returns multi-index columns for multiple stocks
+                if isinstance(data.columns, pd.MultiIndex):
+                    prices = data['Close']
+                else:
+                    prices = data[['close' if 'close' in data.columns else 'Close']]
+                    prices.columns = tickers[:1]
+                prices = prices.reindex(columns=[t for t in tickers if t in prices.columns])
+                
+                # One vectorized pass for every ticker; the cumulative returns
+                # are reused for the chart below
+                df, cum_returns = st.session_state.risk_calc.batch_metrics(prices, cumulative=True)
+                df = df.dropna(how='all')
                 
-                if len(results) > 0:
-                    df = pd.DataFrame(results).T
+                if len(df) > 0:
                     st.markdown("<h3 style='color: #ffffff; margin-top: 1rem; margin-bottom: 0.5rem;'>Metrics</h3>", unsafe_allow_html=True)
                     st.dataframe(df.style.format({
                         'Return': '{:.2%}',
@@ -483,29 +510,80 @@ elif page == "Compare Stocks":
                     st.markdown("<h3 style='color: #ffffff; margin-top: 1rem; margin-bottom: 0.5rem;'>Cumulative Returns</h3>", unsafe_allow_html=True)
                     fig3 = go.Figure()
                     chart_colors = [colors['tropical_indigo'], colors['tekhelet'], colors['mountbatten_pink'], colors['brown_sugar']]
-                    for i, ticker in enumerate(tickers):
-                        try:
-                            if isinstance(data.columns, pd.MultiIndex):
-                                prices = data[('Close', ticker)]
-                            else:
-                                prices = data['close'] if 'close' in data.columns else data['Close']
-                            returns = st.session_state.calc.simple_returns(prices)
-                            cum = st.session_state.calc.cumulative_returns(returns)
-                            fig3.add_trace(go.Scatter(
-                                x=cum.index, 
-                                y=cum, 
-                                mode='lines', 
-                                name=ticker,
-                                line=dict(color=chart_colors[i % len(chart_colors)], width=3)
-                            ))
-                        except:
-                            continue
+                    for i, ticker in enumerate(df.index):
+                        cum = cum_returns[ticker].dropna()
+                        fig3.add_trace(go.Scatter(
+                            x=cum.index, 
+                            y=cum, 
+                            mode='lines', 
+                            name=ticker,
+                            line=dict(color=chart_colors[i % len(chart_colors)], width=3)
+                        ))
                     fig3.update_layout(
                         title=dict(text="Cumulative Returns Over Time", font=dict(color='#ffffff', size=16, family='Google Sans Code')),
                         height=450,
                         **plotly_template['layout']
                     )
                     st.plotly_chart(fig3, use_container_width=True)
+                    
+                    if len(df) > 1:
+                        from src.data_processing import EWMACovariance, EfficientFrontier
+                        
+                        returns = st.session_state.calc.batch_simple_returns(prices[df.index])
+                        st.markdown("<h3 style='color: #ffffff; margin-top: 1rem; margin-bottom: 0.5rem;'>Correlation</h3>", unsafe_allow_html=True)
+                        corr = EWMACovariance(df.index).update(returns).correlation()
+                        fig4 = px.imshow(
+                            corr,
+                            zmin=-1,
+                            zmax=1,
+                            text_auto='.2f',
+                            color_continuous_scale='Purples',
+                            title="EWMA Correlation"
+                        )
+                        fig4.update_layout(
+                            **plotly_template['layout'],
+                            height=450
+                        )
+                        st.plotly_chart(fig4, use_container_width=True)
+                        
+                        st.markdown("<h3 style='color: #ffffff; margin-top: 1rem; margin-bottom: 0.5rem;'>Efficient Frontier</h3>", unsafe_allow_html=True)
+                        frontier = EfficientFrontier.from_returns(returns).trace(n_points=100)
+                        best = frontier.points['Sharpe'].idxmax()
+                        fig5 = go.Figure()
+                        fig5.add_trace(go.Scatter(
+                            x=frontier.points['Volatility'],
+                            y=frontier.points['Return'],
+                            mode='lines',
+                            name='Frontier (long-only)',
+                            line=dict(color=colors['tropical_indigo'], width=3)
+                        ))
+                        fig5.add_trace(go.Scatter(
+                            x=df['Volatility'],
+                            y=df['Return'],
+                            mode='markers+text',
+                            name='Tickers',
+                            text=df.index,
+                            textposition='top center',
+                            marker=dict(color=colors['mountbatten_pink'], size=10)
+                        ))
+                        fig5.add_trace(go.Scatter(
+                            x=[frontier.points.loc[best, 'Volatility']],
+                            y=[frontier.points.loc[best, 'Return']],
+                            mode='markers',
+                            name='Max Sharpe',
+                            marker=dict(color=colors['brown_sugar'], size=14, symbol='star')
+                        ))
+                        fig5.update_layout(
+                            title=dict(text="Efficient Frontier", font=dict(color='#ffffff', size=16, family='Google Sans Code')),
+                            xaxis_title="Volatility",
+                            yaxis_title="Return",
+                            height=450,
+                            **plotly_template['layout']
+                        )
+                        st.plotly_chart(fig5, use_container_width=True)
+                        
+                        weights = frontier.weights.loc[best]
+                        st.dataframe(weights[weights > 1e-4].sort_values(ascending=False).to_frame('Max Sharpe weight').style.format('{:.1%}'), use_container_width=True)
         
         except Exception as e:
             st.error(f"error: {e}")
@@ -518,6 +596,13 @@ elif page == "Risk Metrics":
     period = st.selectbox("Period", ["3mo", "6mo", "1y", "2y"], index=2)
     rf_rate = st.slider("Risk free rate (%)", 0.0, 10.0, 2.0, 0.1) / 100
     
+    col1, col2 = st.columns([2, 1])
+    with col1:
+        windows = st.multiselect("Rolling windows (days)", [20, 30, 60, 120, 252], default=[30])
+    with col2:
+        rolling_labels = {'Volatility': 'volatility', 'Sharpe': 'sharpe', 'VaR (95%)': 'var', 'CVaR (95%)': 'cvar', 'Max Drawdown': 'max_drawdown'}
+        rolling_label = st.selectbox("Rolling metric", list(rolling_labels))
+    
     if st.button("Calculate", use_container_width=True):
         try:
             with st.spinner("Calculating..."):
@@ -543,35 +628,38 @@ elif page == "Risk Metrics":
                     st.metric("VaR (95%)", f"{var_95:.2%}")
                     st.metric("CVaR (95%)", f"{cvar_95:.2%}")
                 
-                st.markdown("<h3 style='color: #ffffff; margin-top: 1rem; margin-bottom: 0.5rem;'>Rolling Volatility</h3>", unsafe_allow_html=True)
-                rolling_vol = st.session_state.risk_calc.rolling_volatility(returns, 30)
-                fig = go.Figure()
-                fig.add_trace(go.Scatter(
-                    x=rolling_vol.index, 
-                    y=rolling_vol, 
-                    mode='lines', 
-                    name='30-day Vol',
-                    line=dict(color=colors['tropical_indigo'], width=2),
-                    fill='tozeroy',
-                    fillcolor=f"rgba(153, 132, 212, 0.2)"
-                ))
-                fig.add_hline(
-                    y=vol, 
-                    line_dash="dash", 
-                    annotation_text="Average Volatility",
-                    line_color=colors['tekhelet']
+                st.markdown(f"<h3 style='color: #ffffff; margin-top: 1rem; margin-bottom: 0.5rem;'>Rolling {rolling_label}</h3>", unsafe_allow_html=True)
+                rolling_metric = rolling_labels[rolling_label]
+                rolling = st.session_state.risk_calc.rolling_metrics(
+                    returns.rename(ticker), windows=windows or [30], metrics=[rolling_metric], risk_free_rate=rf_rate
                 )
+                fig = go.Figure()
+                chart_colors = [colors['tropical_indigo'], colors['tekhelet'], colors['mountbatten_pink'], colors['brown_sugar']]
+                for i, window in enumerate(sorted(windows or [30])):
+                    series = rolling[(rolling_metric, window, ticker)]
+                    fig.add_trace(go.Scatter(
+                        x=series.index, 
+                        y=series, 
+                        mode='lines', 
+                        name=f'{window}-day',
+                        line=dict(color=chart_colors[i % len(chart_colors)], width=2)
+                    ))
+                if rolling_metric == 'volatility':
+                    fig.add_hline(
+                        y=vol, 
+                        line_dash="dash", 
+                        annotation_text="Average Volatility",
+                        line_color=colors['tekhelet']
+                    )
                 fig.update_layout(
-                    title=dict(text="Rolling Volatility", font=dict(color='#ffffff', size=16, family='Google Sans Code')),
+                    title=dict(text=f"Rolling {rolling_label}", font=dict(color='#ffffff', size=16, family='Google Sans Code')),
                     height=400,
                     **plotly_template['layout']
                 )
                 st.plotly_chart(fig, use_container_width=True)
                 
                 st.markdown("<h3 style='color: #ffffff; margin-top: 1rem; margin-bottom: 0.5rem;'>Drawdown</h3>", unsafe_allow_html=True)
-                cum = (1 + returns).cumprod()
-                running_max = cum.expanding().max()
-                drawdown = (cum - running_max) / running_max
+                drawdown = st.session_state.risk_calc.drawdown(returns)
                 fig2 = go.Figure()
                 fig2.add_trace(go.Scatter(
                     x=drawdown.index, 
@@ -89,6 +89,29 @@ def test_data_processing():
         return False
 
 
+def test_kernel_parity():
+    """Check that the numba and NumPy kernel backends agree."""
+    print("\n" + "=" * 60)
+    print("Testing kernel backends...")
+    print("=" * 60)
+    
+    try:
+        from src.data_processing import kernels
+        
+        results = kernels.check_parity()
+        if not results:
+            print("  [SKIPPED] numba not installed, using the NumPy backend")
+            return True
+        
+        for name, ok in results.items():
+            print(f"  [{'OK' if ok else 'MISMATCH'}] {name}")
+        return all(results.values())
+        
+    except Exception as e:
+        print(f"  [ERROR] {e}")
+        return False
+
+
 def main():
     """Run all setup checks."""
     print("=" * 60)
@@ -102,6 +125,7 @@ def main():
         ("Dependencies", check_dependencies),
         ("Yahoo Finance", test_yahoo_finance),
         ("Data Processing", test_data_processing),
+        ("Kernel Parity", test_kernel_parity),
     ]
     
     results = []
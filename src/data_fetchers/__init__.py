@@ -1,24 +1,52 @@
 """
 Data fetching modules for various financial data sources.
+
+Submodules are imported lazily on first attribute access, so importing the
+package does not pull in yfinance, fredapi or alpha_vantage until a fetcher
+is actually used.
 """
 
-from .yahoo_finance import YahooFinanceFetcher
+import importlib
+
+_EXPORTS = {
+    'YahooFinanceFetcher': '.yahoo_finance',
+    'FREDFetcher': '.fred_data',
+    'AlphaVantageFetcher': '.alpha_vantage',
+    'OHLCVStore': '.store',
+    'CorporateActionsStore': '.store',
+    'IntradayBarStore': '.intraday_store',
+    'SharedRateLimiter': '.rate_limiter',
+    'RateLimitExceeded': '.rate_limiter',
+    'INTERACTIVE': '.rate_limiter',
+    'BACKGROUND': '.rate_limiter',
+    'LiveTransport': '.transport',
+    'RecordingTransport': '.transport',
+    'ReplayTransport': '.transport',
+}
 
 # Make these optional imports - they might not be available if dependencies aren't installed
-# Catch any exception, not just ImportError, because the module might fail during import
-try:
-    from .fred_data import FREDFetcher
-except (ImportError, ValueError, Exception):
-    FREDFetcher = None
-
-try:
-    from .alpha_vantage import AlphaVantageFetcher
-except (ImportError, ValueError, Exception):
-    AlphaVantageFetcher = None
-
-__all__ = ['YahooFinanceFetcher']
-if FREDFetcher is not None:
-    __all__.append('FREDFetcher')
-if AlphaVantageFetcher is not None:
-    __all__.append('AlphaVantageFetcher')
+# They resolve to None instead of raising; catch any exception, not just ImportError,
+# because the module might fail during import
+_OPTIONAL = {'FREDFetcher', 'AlphaVantageFetcher'}
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    
+    try:
+        value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    except Exception:
+        if name not in _OPTIONAL:
+            raise
+        value = None
+    
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS))
+
 
+__all__ = list(_EXPORTS)
@@ -2,13 +2,20 @@
 Alpha Vantage data fetcher.
 Requires Alpha Vantage API key: https://www.alphavantage.co/support/#api-key
 Free tier: 5 API calls per minute, 500 calls per day
+Technical indicators are computed locally from cached OHLCV bars by default,
+so they do not use up API calls.
 """
 
 import pandas as pd
-from typing import Optional, Dict
+from typing import Optional, Dict, Iterator, Tuple
 import os
 from dotenv import load_dotenv
-import time
+
+from .intraday_store import IntradayBarStore
+from .rate_limiter import SharedRateLimiter, INTERACTIVE, BACKGROUND
+from .singleflight import coalesce
+from .transport import get_default_transport
+from .ttl_cache import TTLCache
 
 try:
     from alpha_vantage.timeseries import TimeSeries
@@ -17,11 +24,56 @@ except ImportError:
     TimeSeries = None
     TechIndicators = None
 
+# How long fetched bars are reused for locally computed indicators; daily,
+# weekly and monthly bars use the cache's default of six hours
+BAR_TTLS = {'1min': 60, '5min': 5 * 60, '15min': 15 * 60, '30min': 30 * 60, '60min': 60 * 60}
+
+API_URL = 'https://www.alphavantage.co/query'
+
+
+class _IntradayClient:
+    # Requests single months of intraday history from the REST endpoint;
+    # alpha-vantage's TimeSeries.get_intraday has no month parameter
+    def __init__(self, api_key):
+        self.api_key = api_key
+    
+    def intraday_month(self, symbol, interval, month):
+        import requests
+        
+        params = {
+            'function': 'TIME_SERIES_INTRADAY',
+            'symbol': symbol,
+            'interval': interval,
+            'month': month,
+            'outputsize': 'full',
+            'apikey': self.api_key,
+        }
+        response = requests.get(API_URL, params=params, timeout=30)
+        response.raise_for_status()
+        payload = response.json()
+        
+        key = f'Time Series ({interval})'
+        if key not in payload:
+            # Errors and rate-limit notices come back as 200 responses
+            message = payload.get('Error Message') or payload.get('Note') or payload.get('Information') or payload
+            raise ValueError(f"Alpha Vantage returned no {interval} bars for {symbol} {month}: {message}")
+        
+        data = pd.DataFrame.from_dict(payload[key], orient='index', dtype=float)
+        data.index = pd.to_datetime(data.index)
+        data.index.name = 'date'
+        return data
+
 
 class AlphaVantageFetcher:
     """Fetch data from Alpha Vantage API."""
     
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        rate_limiter: Optional[SharedRateLimiter] = None,
+        transport=None,
+        intraday_store: Optional[IntradayBarStore] = None
+    ):
         """
         Initialize Alpha Vantage fetcher.
         
@@ -29,9 +81,28 @@ class AlphaVantageFetcher:
         -----------
         api_key : str, optional
             Alpha Vantage API key. If not provided, will try to load from .env file
+        rate_limiter : SharedRateLimiter, optional
+            Limiter enforcing the API budget. Defaults to one shared by every
+            process on this machine using the same API key
+        transport : optional
+            Transport for upstream calls (see transport.py). Replay transports
+            need neither an API key nor alpha-vantage, and skip rate limiting
+        intraday_store : IntradayBarStore, optional
+            When set, every 1-minute series fetched is also saved to this
+            store and can be queried back with get_intraday_bars
         """
         load_dotenv()
         self.api_key = api_key or os.getenv('ALPHA_VANTAGE_API_KEY')
+        self.transport = transport or get_default_transport()
+        self.intraday_store = intraday_store
+        self.bar_cache = TTLCache(maxsize=256, field_ttls=BAR_TTLS)
+        self.intraday_client = _IntradayClient(self.api_key)
+        
+        if self.transport.offline:
+            self.ts = None
+            self.ti = None
+            self.rate_limiter = None
+            return
         
         if not self.api_key:
             raise ValueError(
@@ -45,25 +116,20 @@ class AlphaVantageFetcher:
         
         self.ts = TimeSeries(key=self.api_key, output_format='pandas')
         self.ti = TechIndicators(key=self.api_key, output_format='pandas')
-        self.last_call_time = 0
-        self.min_call_interval = 12  # 5 calls per minute = 12 seconds between calls
+        self.rate_limiter = rate_limiter or SharedRateLimiter.for_alpha_vantage(self.api_key)
     
-    def _rate_limit(self):
-        """Enforce rate limiting (5 calls per minute)."""
-        current_time = time.time()
-        time_since_last_call = current_time - self.last_call_time
-        
-        if time_since_last_call < self.min_call_interval:
-            sleep_time = self.min_call_interval - time_since_last_call
-            time.sleep(sleep_time)
-        
-        self.last_call_time = time.time()
+    def _rate_limit(self, priority: int = INTERACTIVE):
+        """Enforce rate limiting (5 calls per minute, 500 per day) across processes."""
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire(priority)
     
+    @coalesce(ignore=('priority',))
     def get_stock_data(
         self,
         symbol: str,
         interval: str = 'daily',
-        outputsize: str = 'compact'
+        outputsize: str = 'compact',
+        priority: int = INTERACTIVE
     ) -> pd.DataFrame:
         """
         Fetch stock time series data.
@@ -76,33 +142,144 @@ class AlphaVantageFetcher:
             Time interval ('1min', '5min', '15min', '30min', '60min', 'daily', 'weekly', 'monthly')
         outputsize : str
             'compact' (last 100 data points) or 'full' (full historical data)
+        priority : int
+            Rate limiter priority; use BACKGROUND for backfills so interactive
+            requests are served first
         
         Returns:
         --------
         pd.DataFrame
             DataFrame with OHLCV data
         """
-        self._rate_limit()
+        self._rate_limit(priority)
         
         if interval == 'daily':
-            data, meta = self.ts.get_daily(symbol=symbol, outputsize=outputsize)
+            data, meta = self.transport.call('alpha_vantage', self.ts, 'get_daily', symbol=symbol, outputsize=outputsize)
         elif interval == 'weekly':
-            data, meta = self.ts.get_weekly(symbol=symbol)
+            data, meta = self.transport.call('alpha_vantage', self.ts, 'get_weekly', symbol=symbol)
         elif interval == 'monthly':
-            data, meta = self.ts.get_monthly(symbol=symbol)
+            data, meta = self.transport.call('alpha_vantage', self.ts, 'get_monthly', symbol=symbol)
         else:
-            data, meta = self.ts.get_intraday(symbol=symbol, interval=interval, outputsize=outputsize)
+            data, meta = self.transport.call(
+                'alpha_vantage', self.ts, 'get_intraday',
+                symbol=symbol, interval=interval, outputsize=outputsize
+            )
         
         # Rename columns to lowercase
         data.columns = [col.split('. ')[1].lower().replace(' ', '_') for col in data.columns]
         
+        if self.intraday_store is not None and interval == '1min':
+            self.intraday_store.write(symbol, data)
+        
         return data
     
+    def iter_intraday_history(
+        self,
+        symbol: str,
+        start_month: str,
+        end_month: Optional[str] = None,
+        interval: str = '1min',
+        resume_after: Optional[str] = None,
+        priority: int = BACKGROUND
+    ) -> Iterator[Tuple[str, pd.DataFrame]]:
+        """
+        Stream full intraday history one month at a time.
+        
+        Each month is requested separately and yielded as soon as it arrives,
+        so only one month is held in memory at a time. Every request goes
+        through the rate limiter. Months the intraday store (1-minute data
+        only) has fetched in full after they ended are read from disk instead
+        of the API; partial months (compact fetches, months still in
+        progress) are fetched again.
+        
+        Parameters:
+        -----------
+        symbol : str
+            Stock ticker symbol
+        start_month : str
+            First month to fetch ('YYYY-MM')
+        end_month : str, optional
+            Last month to fetch ('YYYY-MM'). Defaults to the current month
+        interval : str
+            Intraday interval ('1min', '5min', '15min', '30min', '60min')
+        resume_after : str, optional
+            Last month ('YYYY-MM') a previous run completed; streaming
+            resumes with the month after it
+        priority : int
+            Rate limiter priority; backfills default to BACKGROUND
+        
+        Yields:
+        -------
+        tuple
+            (month, DataFrame) with OHLCV bars in ascending time order
+        """
+        current = pd.Timestamp.now().to_period('M')
+        months = pd.period_range(start_month, end_month or current, freq='M')
+        use_store = self.intraday_store is not None and interval == '1min'
+        complete = set(self.intraday_store.complete_months(symbol)) if use_store else set()
+        
+        for period in months:
+            month = str(period)
+            if resume_after is not None and month <= resume_after:
+                continue
+            
+            if month in complete:
+                data = self.intraday_store.query_frame(
+                    symbol, period.start_time, (period + 1).start_time
+                )
+            else:
+                self._rate_limit(priority)
+                data = self.transport.call(
+                    'alpha_vantage', self.intraday_client, 'intraday_month',
+                    symbol, interval=interval, month=month
+                )
+                data.columns = [col.split('. ')[1].lower().replace(' ', '_') for col in data.columns]
+                data = data.sort_index()
+                
+                if use_store:
+                    self.intraday_store.write(symbol, data)
+                    if period < current:
+                        self.intraday_store.mark_complete(symbol, month)
+            
+            yield month, data
+    
+    def get_intraday_bars(
+        self,
+        symbol: str,
+        start: Optional[str] = None,
+        end: Optional[str] = None
+    ) -> pd.DataFrame:
+        """
+        Read previously fetched 1-minute bars from the local store.
+        
+        Parameters:
+        -----------
+        symbol : str
+            Stock ticker symbol
+        start : str, optional
+            Start timestamp (inclusive)
+        end : str, optional
+            End timestamp (exclusive)
+        
+        Returns:
+        --------
+        pd.DataFrame
+            OHLCV bars; a range within one month is backed by the
+            memory-mapped store file, longer ranges are read into memory
+        """
+        if self.intraday_store is None:
+            raise ValueError("No intraday store configured. Pass intraday_store=IntradayBarStore().")
+        
+        return self.intraday_store.query_frame(symbol, start, end)
+    
+    @coalesce(ignore=('priority',))
     def get_technical_indicator(
         self,
         symbol: str,
         indicator: str,
         interval: str = 'daily',
+        priority: int = INTERACTIVE,
+        source: str = 'local',
         **kwargs
     ) -> pd.DataFrame:
         """
@@ -113,9 +290,15 @@ class AlphaVantageFetcher:
         symbol : str
             Stock ticker symbol
         indicator : str
-            Indicator name ('SMA', 'EMA', 'RSI', 'MACD', 'BBANDS', 'STOCH', etc.)
+            Indicator name ('SMA', 'EMA', 'RSI', 'MACD', 'BBANDS', 'STOCH'; locally also 'ATR' and 'OBV')
         interval : str
             Time interval
+        priority : int
+            Rate limiter priority (INTERACTIVE or BACKGROUND)
+        source : str
+            'local' computes the indicator from the symbol's OHLCV bars, which
+            are fetched once and reused (see BAR_TTLS); 'api' requests it
+            from Alpha Vantage
         **kwargs
             Additional parameters for the indicator
         
@@ -124,22 +307,36 @@ class AlphaVantageFetcher:
         pd.DataFrame
             DataFrame with indicator values
         """
-        self._rate_limit()
+        if source == 'local':
+            # Imported here so the fetcher layer does not load scipy at import time
+            from ..data_processing.indicators import compute_indicator
+            
+            bars = self.bar_cache.get(
+                (symbol, interval),
+                lambda: self.get_stock_data(symbol, interval, outputsize='full', priority=priority),
+                fields=[interval]
+            )
+            # Alpha Vantage lists the newest bar first
+            return compute_indicator(bars.sort_index(), indicator, **kwargs).dropna(how='all')
+        if source != 'api':
+            raise ValueError(f"Source {source} not supported. Available: ['local', 'api']")
+        
+        self._rate_limit(priority)
         
         indicator_map = {
-            'SMA': self.ti.get_sma,
-            'EMA': self.ti.get_ema,
-            'RSI': self.ti.get_rsi,
-            'MACD': self.ti.get_macd,
-            'BBANDS': self.ti.get_bbands,
-            'STOCH': self.ti.get_stoch,
+            'SMA': 'get_sma',
+            'EMA': 'get_ema',
+            'RSI': 'get_rsi',
+            'MACD': 'get_macd',
+            'BBANDS': 'get_bbands',
+            'STOCH': 'get_stoch',
         }
         
         if indicator not in indicator_map:
             raise ValueError(f"Indicator {indicator} not supported. Available: {list(indicator_map.keys())}")
         
-        func = indicator_map[indicator]
-        data, meta = func(symbol=symbol, interval=interval, **kwargs)
+        method = indicator_map[indicator]
+        data, meta = self.transport.call('alpha_vantage', self.ti, method, symbol=symbol, interval=interval, **kwargs)
         
         return data
 
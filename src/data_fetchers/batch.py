@@ -0,0 +1,119 @@
+"""
+Bounded-parallelism batch execution for per-symbol fetch calls.
+
+Upstream calls are latency bound, so running them on a small thread pool
+turns a serial walk over a universe into one limited by bandwidth.
+"""
+
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Callable, Dict, Iterable, Iterator, Optional
+
+
+# Outcome of one batch item: exactly one of value/error is set
+BatchResult = namedtuple('BatchResult', ['key', 'value', 'error', 'elapsed'])
+
+
+def iter_concurrent(
+    func: Callable,
+    keys: Iterable,
+    max_workers: int = 8,
+    timeout: Optional[float] = None,
+    **kwargs
+) -> Iterator[BatchResult]:
+    """
+    Run func(key, **kwargs) for every key on a bounded thread pool.
+    
+    Results are yielded as soon as each call completes, in completion order.
+    Failures never abort the batch; they are reported through the error
+    field of the yielded result.
+    
+    Parameters:
+    -----------
+    func : callable
+        Function called once per key
+    keys : iterable
+        Keys to process (e.g. ticker symbols)
+    max_workers : int
+        Maximum number of concurrent calls
+    timeout : float, optional
+        Per-key timeout in seconds, measured from when the call starts
+        running. Timed-out calls are reported with a TimeoutError; the
+        underlying thread cannot be interrupted and finishes in the background
+    **kwargs
+        Extra keyword arguments passed to func
+    
+    Yields:
+    -------
+    BatchResult
+        (key, value, error, elapsed) for each key
+    """
+    keys = list(dict.fromkeys(keys))
+    started: Dict = {}
+    
+    def run(key):
+        started[key] = time.monotonic()
+        return func(key, **kwargs)
+    
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    try:
+        futures = {executor.submit(run, key): key for key in keys}
+        pending = set(futures)
+        
+        while pending:
+            wait_for = None
+            if timeout is not None:
+                # Wake up in time for the earliest running call to expire
+                now = time.monotonic()
+                deadlines = [started[futures[f]] + timeout for f in pending if futures[f] in started]
+                wait_for = max(min(deadlines) - now, 0) if deadlines else timeout
+            
+            done, pending = wait(pending, timeout=wait_for, return_when=FIRST_COMPLETED)
+            
+            for future in done:
+                key = futures[future]
+                elapsed = time.monotonic() - started.get(key, time.monotonic())
+                error = future.exception()
+                if error is not None:
+                    yield BatchResult(key, None, error, elapsed)
+                else:
+                    yield BatchResult(key, future.result(), None, elapsed)
+            
+            if timeout is not None:
+                now = time.monotonic()
+                expired = {f for f in pending if futures[f] in started and now - started[futures[f]] >= timeout}
+                for future in expired:
+                    key = futures[future]
+                    future.cancel()
+                    error = TimeoutError(f"{key} timed out after {timeout}s")
+                    yield BatchResult(key, None, error, now - started[key])
+                pending -= expired
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def run_concurrent(
+    func: Callable,
+    keys: Iterable,
+    max_workers: int = 8,
+    timeout: Optional[float] = None,
+    **kwargs
+):
+    """
+    Run func over all keys concurrently and collect the outcome.
+    
+    Returns:
+    --------
+    tuple
+        (results, errors) dicts keyed by key. Keys that failed or timed out
+        appear only in errors
+    """
+    results = {}
+    errors = {}
+    for item in iter_concurrent(func, keys, max_workers=max_workers, timeout=timeout, **kwargs):
+        if item.error is not None:
+            errors[item.key] = item.error
+        else:
+            results[item.key] = item.value
+    return results, errors
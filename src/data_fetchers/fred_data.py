@@ -4,21 +4,58 @@ Requires FRED API key: https://fred.stlouisfed.org/docs/api/api_key.html
 """
 
 import pandas as pd
-from typing import Optional, List
+from typing import Optional, List, Dict
 from datetime import datetime
 import os
+import time
 from dotenv import load_dotenv
 
+from .batch import run_concurrent
+from .singleflight import coalesce
+from .store import FrameStore, default_cache_dir
+from .transport import get_default_transport
+
 try:
     from fredapi import Fred
 except ImportError:
     Fred = None
 
 
+# How long cached observations stay fresh, by release frequency
+# ('d', 'w', 'm', 'q', 'a'). Once stale, only observations from the last
+# cached date onward are requested again.
+RELEASE_TTLS = {
+    'd': 6 * 60 * 60,
+    'w': 24 * 60 * 60,
+    'm': 3 * 24 * 60 * 60,
+    'q': 7 * 24 * 60 * 60,
+    'a': 30 * 24 * 60 * 60,
+}
+
+
+def infer_release_frequency(series: pd.Series) -> str:
+    """Infer a series' release frequency ('d', 'w', 'm', 'q', 'a') from its dates."""
+    if len(series) < 2:
+        return 'd'
+    
+    spacing = pd.Series(series.index).diff().median().days
+    for frequency, max_days in [('d', 4), ('w', 8), ('m', 35), ('q', 100)]:
+        if spacing <= max_days:
+            return frequency
+    return 'a'
+
+
 class FREDFetcher:
     """Fetch economic data from FRED."""
     
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        cache: Optional[FrameStore] = None,
+        use_cache: bool = True,
+        cache_ttls: Optional[Dict[str, float]] = None,
+        transport=None
+    ):
         """
         Initialize FRED fetcher.
         
@@ -26,22 +63,44 @@ class FREDFetcher:
         -----------
         api_key : str, optional
             FRED API key. If not provided, will try to load from .env file
+        cache : FrameStore, optional
+            Local series cache. Defaults to a store under the cache dir
+            (requires pyarrow)
+        use_cache : bool
+            Set to False to always fetch from FRED
+        cache_ttls : dict, optional
+            Freshness TTLs in seconds by release frequency, overriding RELEASE_TTLS
+        transport : optional
+            Transport for upstream calls (see transport.py). Replay transports
+            need neither an API key nor fredapi
         """
         load_dotenv()
         self.api_key = api_key or os.getenv('FRED_API_KEY')
+        self.transport = transport or get_default_transport()
         
-        if not self.api_key:
+        if self.transport.offline:
+            self.fred = None
+        elif not self.api_key:
             raise ValueError(
                 "FRED API key required. "
                 "Get one at https://fred.stlouisfed.org/docs/api/api_key.html "
                 "and set FRED_API_KEY in .env file or pass as parameter."
             )
         
-        if Fred is None:
+        elif Fred is None:
             raise ImportError("fredapi package not installed. Run: pip install fredapi")
+        else:
+            self.fred = Fred(api_key=self.api_key)
         
-        self.fred = Fred(api_key=self.api_key)
+        if use_cache and cache is None:
+            try:
+                cache = FrameStore(os.path.join(default_cache_dir(), 'fred'))
+            except ImportError:
+                cache = None
+        self.cache = cache if use_cache else None
+        self.cache_ttls = {**RELEASE_TTLS, **(cache_ttls or {})}
     
+    @coalesce
     def get_series(
         self,
         series_id: str,
@@ -68,21 +127,99 @@ class FREDFetcher:
         pd.Series
             Time series data
         """
-        return self.fred.get_series(
+        if self.cache is None:
+            return self._fetch_series(series_id, start_date, end_date, frequency)
+        
+        return self._get_cached_series(series_id, start_date, end_date, frequency)
+    
+    def _fetch_series(self, series_id, start_date=None, end_date=None, frequency=None) -> pd.Series:
+        kwargs = {'frequency': frequency} if frequency else {}
+        return self.transport.call(
+            'fred',
+            self.fred,
+            'get_series',
             series_id,
             observation_start=start_date,
             observation_end=end_date,
-            frequency=frequency
+            **kwargs
         )
     
+    def _get_cached_series(self, series_id, start_date, end_date, frequency) -> pd.Series:
+        """
+        Serve a series from the local cache, fetching only what is missing.
+        
+        The cache holds one contiguous range per (series_id, frequency). A
+        start of None means the range reaches back to the first observation
+        and an end of None means it runs up to the latest release as of
+        the last refresh.
+        """
+        key = (series_id, frequency or 'native')
+        start = pd.Timestamp(start_date) if start_date else None
+        end = pd.Timestamp(end_date) if end_date else None
+        
+        stored, meta = self.cache.read(*key)
+        if stored is None:
+            series = self._fetch_series(series_id, start_date, end_date, frequency)
+            self._save_series(key, series, start, end)
+            return series
+        
+        series = stored['value']
+        series.name = None
+        cov_start = pd.Timestamp(meta['start']) if meta['start'] else None
+        cov_end = pd.Timestamp(meta['end']) if meta['end'] else None
+        fetched_at = meta['fetched_at']
+        updates = []
+        
+        # Head: observations before the cached range
+        if cov_start is not None and (start is None or start < cov_start):
+            head_end = cov_start - pd.Timedelta(days=1)
+            updates.append(self._fetch_series(series_id, start_date, head_end, frequency))
+            cov_start = start
+        
+        # Tail: a fixed cached end only grows when asked for more; an open end
+        # is refreshed from the last observation once the release TTL expires
+        if cov_end is not None and (end is None or end > cov_end):
+            tail_start = series.index[-1] if len(series) > 0 else cov_end
+            updates.append(self._fetch_series(series_id, tail_start, end_date, frequency))
+            cov_end = end
+            fetched_at = time.time()
+        elif cov_end is None:
+            ttl = self.cache_ttls[meta['release_frequency']]
+            if time.time() - fetched_at > ttl:
+                tail_start = series.index[-1] if len(series) > 0 else None
+                updates.append(self._fetch_series(series_id, tail_start, None, frequency))
+                fetched_at = time.time()
+        
+        if updates:
+            series = pd.concat([series] + updates)
+            series = series[~series.index.duplicated(keep='last')].sort_index()
+            self._save_series(key, series, cov_start, cov_end, fetched_at)
+        
+        if start is not None:
+            series = series[series.index >= start]
+        if end is not None:
+            series = series[series.index <= end]
+        return series
+    
+    def _save_series(self, key, series, start, end, fetched_at=None):
+        meta = {
+            'start': start.isoformat() if start is not None else None,
+            'end': end.isoformat() if end is not None else None,
+            'fetched_at': fetched_at or time.time(),
+            'release_frequency': infer_release_frequency(series),
+        }
+        self.cache.write(series.to_frame('value'), meta, *key)
+    
     def get_multiple_series(
         self,
         series_ids: List[str],
         start_date: Optional[str] = None,
-        end_date: Optional[str] = None
+        end_date: Optional[str] = None,
+        frequency: Optional[str] = None,
+        max_workers: int = 8
     ) -> pd.DataFrame:
         """
-        Fetch multiple FRED series.
+        Fetch multiple FRED series concurrently.
         
         Parameters:
         -----------
@@ -92,22 +229,32 @@ class FREDFetcher:
             Start date
         end_date : str, optional
             End date
+        frequency : str, optional
+            Data frequency ('d', 'w', 'm', 'q', 'a')
+        max_workers : int
+            Maximum number of series fetched at the same time
         
         Returns:
         --------
         pd.DataFrame
             DataFrame with multiple series as columns
         """
-        data = {}
-        for series_id in series_ids:
-            try:
-                data[series_id] = self.get_series(series_id, start_date, end_date)
-            except Exception as e:
-                print(f"Error fetching {series_id}: {e}")
-                continue
+        results, errors = run_concurrent(
+            self.get_series,
+            series_ids,
+            max_workers=max_workers,
+            start_date=start_date,
+            end_date=end_date,
+            frequency=frequency
+        )
+        
+        for series_id, e in errors.items():
+            print(f"Error fetching {series_id}: {e}")
         
+        data = {series_id: results[series_id] for series_id in series_ids if series_id in results}
         return pd.DataFrame(data)
     
+    @coalesce
     def search_series(self, search_text: str, limit: int = 20) -> pd.DataFrame:
         """
         Search for FRED series.
@@ -124,7 +271,7 @@ class FREDFetcher:
         pd.DataFrame
             Search results
         """
-        return self.fred.search(search_text, limit=limit)
+        return self.transport.call('fred', self.fred, 'search', search_text, limit=limit)
 
 
 # Common FRED series IDs
@@ -0,0 +1,223 @@
+"""
+Memory-mapped columnar store for intraday bars.
+
+Bars are kept in one file per symbol-month. Each file holds a small JSON
+header followed by one contiguous array per column: int64 timestamps
+(nanoseconds, naive exchange wall-clock time) and float prices and volume.
+Files are memory-mapped on read, so date-range queries slice the mapped
+arrays directly and years of minute bars can be queried without loading
+them into RAM.
+"""
+
+import json
+import os
+import struct
+import tempfile
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from .store import default_cache_dir
+
+
+BAR_COLUMNS = ('open', 'high', 'low', 'close', 'volume')
+
+_MAGIC = b'MABARS1\n'
+
+# pandas 3 never copies in concat (copy-on-write) and deprecates the keyword;
+# earlier versions copy unless told not to
+_NO_COPY = {} if int(pd.__version__.split('.')[0]) >= 3 else {'copy': False}
+_ALIGN = 64
+
+
+class IntradayBarStore:
+    """Per symbol-month memory-mapped store of intraday OHLCV bars."""
+    
+    def __init__(self, root: Optional[str] = None, price_dtype: str = 'float64'):
+        """
+        Initialize the store.
+        
+        Parameters:
+        -----------
+        root : str, optional
+            Directory holding the bar files. Defaults to <cache dir>/intraday
+        price_dtype : str
+            'float64' or 'float32' for newly written price columns. float32
+            halves the footprint at about 7 significant digits of precision
+        """
+        if price_dtype not in ('float64', 'float32'):
+            raise ValueError(f"price_dtype must be 'float64' or 'float32', got {price_dtype}")
+        
+        self.root = root or os.path.join(default_cache_dir(), 'intraday')
+        self.price_dtype = np.dtype(price_dtype)
+    
+    def path(self, symbol: str, month: str) -> str:
+        return os.path.join(self.root, symbol.upper(), f"{month}.bars")
+    
+    def months(self, symbol: str) -> List[str]:
+        """Return the stored months ('YYYY-MM') for a symbol, oldest first."""
+        directory = os.path.join(self.root, symbol.upper())
+        if not os.path.isdir(directory):
+            return []
+        return sorted(name[:-5] for name in os.listdir(directory) if name.endswith('.bars'))
+    
+    def complete_months(self, symbol: str) -> List[str]:
+        """Return the months marked complete with mark_complete, oldest first."""
+        directory = os.path.join(self.root, symbol.upper())
+        if not os.path.isdir(directory):
+            return []
+        return sorted(name[:-9] for name in os.listdir(directory) if name.endswith('.complete'))
+    
+    def mark_complete(self, symbol: str, month: str):
+        """
+        Record that a month holds every bar of a finished month.
+        
+        Months are also written from compact (latest 100 bars) fetches and
+        while still in progress; only marked months may be served from disk
+        in place of a full-month fetch.
+        """
+        path = self.path(symbol, month)[:-5] + '.complete'
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        open(path, 'w').close()
+    
+    def _read_month(self, symbol: str, month: str) -> Dict[str, np.ndarray]:
+        """Memory-map every column of a month file (read-only)."""
+        path = self.path(symbol, month)
+        with open(path, 'rb') as f:
+            if f.read(len(_MAGIC)) != _MAGIC:
+                raise ValueError(f"{path} is not an intraday bar file")
+            header_length, = struct.unpack('<Q', f.read(8))
+            header = json.loads(f.read(header_length))
+        
+        rows = header['rows']
+        columns = {}
+        for name, dtype, offset in header['columns']:
+            if rows == 0:
+                columns[name] = np.empty(0, dtype=dtype)
+            else:
+                columns[name] = np.memmap(path, dtype=dtype, mode='r', offset=offset, shape=(rows,))
+        return columns
+    
+    def _write_month(self, symbol: str, month: str, columns: Dict[str, np.ndarray]):
+        """Atomically write a month file from in-memory column arrays."""
+        path = self.path(symbol, month)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        
+        rows = len(columns['timestamp'])
+        names = ('timestamp',) + BAR_COLUMNS
+        
+        # Column offsets depend on the header length, which depends on the
+        # offsets; reserve a fixed-size header to break the cycle
+        header_size = 1024
+        offset = _ALIGN * -(-(len(_MAGIC) + 8 + header_size) // _ALIGN)
+        layout = []
+        for name in names:
+            array = columns[name]
+            layout.append([name, array.dtype.str, offset])
+            offset += _ALIGN * -(-array.nbytes // _ALIGN)
+        
+        header = json.dumps({'rows': rows, 'columns': layout}).encode().ljust(header_size)
+        
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(_MAGIC)
+                f.write(struct.pack('<Q', header_size))
+                f.write(header)
+                for (name, _, column_offset) in layout:
+                    f.seek(column_offset)
+                    f.write(np.ascontiguousarray(columns[name]).tobytes())
+            os.replace(tmp_path, path)
+        except Exception:
+            os.remove(tmp_path)
+            raise
+    
+    def write(self, symbol: str, data: pd.DataFrame):
+        """
+        Merge bars into the store.
+        
+        Parameters:
+        -----------
+        symbol : str
+            Stock ticker symbol
+        data : pd.DataFrame
+            Bars indexed by naive timestamps with open, high, low, close and
+            volume columns, in any order. Existing bars with the same
+            timestamp are replaced
+        """
+        if len(data) == 0:
+            return
+        
+        timestamps = pd.DatetimeIndex(data.index).as_unit('ns').asi8
+        months = pd.DatetimeIndex(data.index).strftime('%Y-%m')
+        
+        for month in np.unique(months):
+            in_month = months == month
+            new = {'timestamp': timestamps[in_month]}
+            for name in BAR_COLUMNS:
+                dtype = 'float64' if name == 'volume' else self.price_dtype
+                new[name] = data[name].to_numpy(dtype=dtype)[in_month]
+            
+            if os.path.exists(self.path(symbol, month)):
+                old = self._read_month(symbol, month)
+                new = {name: np.concatenate([old[name], new[name]]) for name in new}
+            
+            # Stable sort keeps the newer duplicate last; keep the last of each run
+            order = np.argsort(new['timestamp'], kind='stable')
+            ts = new['timestamp'][order]
+            keep = np.append(ts[1:] != ts[:-1], True)
+            merged = {name: values[order][keep] for name, values in new.items()}
+            
+            self._write_month(symbol, month, merged)
+    
+    def query(self, symbol: str, start=None, end=None) -> Dict[str, np.ndarray]:
+        """
+        Return bars in [start, end) as column arrays.
+        
+        Ranges within a single month are zero-copy views into the mapped
+        file; ranges spanning months are concatenated.
+        
+        Returns:
+        --------
+        dict
+            'timestamp' (int64 ns) plus one array per OHLCV column
+        """
+        start_ns = pd.Timestamp(start).value if start is not None else None
+        end_ns = pd.Timestamp(end).value if end is not None else None
+        first_month = pd.Timestamp(start).strftime('%Y-%m') if start is not None else None
+        last_month = pd.Timestamp(end).strftime('%Y-%m') if end is not None else None
+        
+        pieces = []
+        for month in self.months(symbol):
+            if (first_month and month < first_month) or (last_month and month > last_month):
+                continue
+            
+            columns = self._read_month(symbol, month)
+            ts = columns['timestamp']
+            lo = np.searchsorted(ts, start_ns, side='left') if start_ns is not None else 0
+            hi = np.searchsorted(ts, end_ns, side='left') if end_ns is not None else len(ts)
+            if hi > lo:
+                pieces.append({name: values[lo:hi] for name, values in columns.items()})
+        
+        if not pieces:
+            empty = {'timestamp': np.empty(0, dtype='int64')}
+            empty.update({name: np.empty(0, dtype='float64') for name in BAR_COLUMNS})
+            return empty
+        if len(pieces) == 1:
+            return pieces[0]
+        return {name: np.concatenate([piece[name] for piece in pieces]) for name in pieces[0]}
+    
+    def query_frame(self, symbol: str, start=None, end=None) -> pd.DataFrame:
+        """
+        Return bars in [start, end) as a DataFrame.
+        
+        Within a single month the columns are views of the mapped file; a
+        range spanning months is concatenated into memory (see query).
+        """
+        columns = self.query(symbol, start, end)
+        index = pd.DatetimeIndex(np.asarray(columns.pop('timestamp')).view('datetime64[ns]'), name='date')
+        # One Series per column so pandas never consolidates the mapped
+        # columns into a new block
+        series = [pd.Series(np.asarray(values), index=index, name=name, copy=False) for name, values in columns.items()]
+        return pd.concat(series, axis=1, **_NO_COPY)
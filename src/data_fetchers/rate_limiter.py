@@ -0,0 +1,185 @@
+"""
+Cross-process rate limiting for upstream APIs.
+
+Calls are logged in a shared SQLite database so every process and thread on
+the machine sees the same budget. Each limit is enforced as a sliding window
+over that log (e.g. 5 calls in any 60 seconds and 500 in any 24 hours), and
+callers wait in a shared priority queue so interactive requests are served
+before background backfills.
+"""
+
+import hashlib
+import os
+import sqlite3
+import time
+from contextlib import closing
+from typing import Iterable, Optional, Tuple
+
+from .store import default_cache_dir
+
+
+INTERACTIVE = 0
+BACKGROUND = 10
+
+# Free tier: 5 API calls per minute, 500 calls per day
+ALPHA_VANTAGE_LIMITS = [(5, 60), (500, 24 * 60 * 60)]
+
+
+class RateLimitExceeded(RuntimeError):
+    """Raised when the next free slot is further away than the caller will wait."""
+
+
+class SharedRateLimiter:
+    """Sliding-window rate limiter shared across processes through SQLite."""
+    
+    def __init__(
+        self,
+        name: str,
+        limits: Iterable[Tuple[int, float]],
+        path: Optional[str] = None,
+        max_wait: Optional[float] = 300,
+        poll_interval: float = 0.25,
+        stale_after: float = 30
+    ):
+        """
+        Initialize the rate limiter.
+        
+        Parameters:
+        -----------
+        name : str
+            Budget name; limiters with the same name and path share a budget
+        limits : iterable of (int, float)
+            (max_calls, window_seconds) pairs that must all hold
+        path : str, optional
+            SQLite database path. Defaults to ratelimit.sqlite in the cache dir
+        max_wait : float, optional
+            Raise RateLimitExceeded instead of waiting longer than this many
+            seconds for a slot (e.g. once the daily budget is spent).
+            None waits indefinitely
+        poll_interval : float
+            Seconds between queue checks while waiting
+        stale_after : float
+            Queue entries whose owner has not checked in for this many seconds
+            are treated as abandoned (e.g. the process was killed)
+        """
+        self.name = name
+        self.limits = sorted(limits, key=lambda limit: limit[1])
+        self.path = path or os.path.join(default_cache_dir(), 'ratelimit.sqlite')
+        self.max_wait = max_wait
+        self.poll_interval = poll_interval
+        self.stale_after = stale_after
+        
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        with closing(self._connect()) as conn:
+            conn.execute("CREATE TABLE IF NOT EXISTS calls (name TEXT NOT NULL, ts REAL NOT NULL)")
+            conn.execute("CREATE INDEX IF NOT EXISTS calls_name_ts ON calls (name, ts)")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS waiters ("
+                "id INTEGER PRIMARY KEY AUTOINCREMENT, name TEXT NOT NULL, "
+                "priority INTEGER NOT NULL, enqueued REAL NOT NULL, heartbeat REAL NOT NULL)"
+            )
+    
+    @classmethod
+    def for_alpha_vantage(cls, api_key: str, **kwargs) -> 'SharedRateLimiter':
+        """Create the limiter for an Alpha Vantage key (limits are per key)."""
+        digest = hashlib.sha256(api_key.encode()).hexdigest()[:12]
+        return cls(f"alpha_vantage:{digest}", ALPHA_VANTAGE_LIMITS, **kwargs)
+    
+    def _connect(self) -> sqlite3.Connection:
+        # A connection per call keeps the limiter safe to share across threads
+        return sqlite3.connect(self.path, timeout=30, isolation_level=None)
+    
+    def _delay(self, conn: sqlite3.Connection, now: float) -> float:
+        """Seconds until a call can be made without breaking any limit."""
+        delay = 0.0
+        for max_calls, window in self.limits:
+            count = conn.execute(
+                "SELECT COUNT(*) FROM calls WHERE name = ? AND ts > ?",
+                (self.name, now - window)
+            ).fetchone()[0]
+            
+            if count >= max_calls:
+                # The slot frees up when the oldest call that puts us over
+                # the limit leaves the window
+                oldest = conn.execute(
+                    "SELECT ts FROM calls WHERE name = ? AND ts > ? ORDER BY ts LIMIT 1 OFFSET ?",
+                    (self.name, now - window, count - max_calls)
+                ).fetchone()[0]
+                delay = max(delay, oldest + window - now)
+        return delay
+    
+    def acquire(self, priority: int = INTERACTIVE):
+        """
+        Block until a call is allowed, then record it.
+        
+        Parameters:
+        -----------
+        priority : int
+            Lower values are served first (INTERACTIVE before BACKGROUND);
+            equal priorities are served in arrival order
+        """
+        conn = self._connect()
+        enqueued = time.time()
+        waiter_id = conn.execute(
+            "INSERT INTO waiters (name, priority, enqueued, heartbeat) VALUES (?, ?, ?, ?)",
+            (self.name, priority, enqueued, enqueued)
+        ).lastrowid
+        
+        try:
+            while True:
+                conn.execute("BEGIN IMMEDIATE")
+                now = time.time()
+                conn.execute(
+                    "DELETE FROM waiters WHERE name = ? AND heartbeat < ? AND id != ?",
+                    (self.name, now - self.stale_after, waiter_id)
+                )
+                if conn.execute("UPDATE waiters SET heartbeat = ? WHERE id = ?", (now, waiter_id)).rowcount == 0:
+                    # Another process dropped our entry as stale while we were
+                    # paused; rejoin at the original place in the queue (ids
+                    # are never reused)
+                    conn.execute(
+                        "INSERT INTO waiters (id, name, priority, enqueued, heartbeat) VALUES (?, ?, ?, ?, ?)",
+                        (waiter_id, self.name, priority, enqueued, now)
+                    )
+                conn.execute(
+                    "DELETE FROM calls WHERE name = ? AND ts <= ?",
+                    (self.name, now - self.limits[-1][1])
+                )
+                
+                head, = conn.execute(
+                    "SELECT id FROM waiters WHERE name = ? ORDER BY priority, enqueued, id LIMIT 1",
+                    (self.name,)
+                ).fetchone()
+                delay = self._delay(conn, now)
+                
+                if head == waiter_id and delay <= 0:
+                    conn.execute("INSERT INTO calls (name, ts) VALUES (?, ?)", (self.name, now))
+                    conn.execute("DELETE FROM waiters WHERE id = ?", (waiter_id,))
+                    conn.execute("COMMIT")
+                    return
+                
+                conn.execute("COMMIT")
+                
+                if self.max_wait is not None and delay > self.max_wait:
+                    raise RateLimitExceeded(
+                        f"Rate limit for {self.name} exhausted; next slot in {delay:.0f}s"
+                    )
+                
+                time.sleep(min(delay, self.poll_interval) if head == waiter_id else self.poll_interval)
+        finally:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            conn.execute("DELETE FROM waiters WHERE id = ?", (waiter_id,))
+            conn.close()
+    
+    def usage(self) -> dict:
+        """Return the number of calls made in each limit window."""
+        now = time.time()
+        with closing(self._connect()) as conn:
+            return {
+                window: conn.execute(
+                    "SELECT COUNT(*) FROM calls WHERE name = ? AND ts > ?",
+                    (self.name, now - window)
+                ).fetchone()[0]
+                for _, window in self.limits
+            }
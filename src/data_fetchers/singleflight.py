@@ -0,0 +1,145 @@
+"""
+Process-wide coalescing of identical concurrent upstream calls.
+
+When several callers (e.g. Streamlit sessions) ask for the same data at the
+same moment, only the first one goes upstream. The others wait for that
+in-flight call and receive a copy of its result, or the same exception.
+"""
+
+import copy
+import functools
+import inspect
+import threading
+from typing import Any, Callable, Hashable, Iterable
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Run at most one call per key at a time and share its outcome."""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+    
+    def do(self, key: Hashable, func: Callable, *args, **kwargs) -> Any:
+        """
+        Call func(*args, **kwargs) unless a call with the same key is running.
+        
+        Callers that join an in-flight call get a copy of the result, so
+        mutating it does not affect the other callers.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+        
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return copy.copy(call.result)
+        
+        try:
+            call.result = func(*args, **kwargs)
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+    
+    def in_flight(self) -> int:
+        """Return the number of calls currently running."""
+        with self._lock:
+            return len(self._calls)
+
+
+# Shared by every fetcher instance in the process
+default_group = SingleFlight()
+
+
+def _freeze(value) -> Hashable:
+    """Turn argument values into a hashable key."""
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple, set)):
+        items = [_freeze(v) for v in value]
+        return tuple(sorted(items, key=repr) if isinstance(value, set) else items)
+    try:
+        hash(value)
+        return value
+    except TypeError:
+        return repr(value)
+
+
+# Fetcher attributes that decide what an upstream call returns
+_CONFIG_ATTRIBUTES = ('api_key', 'transport', 'store', 'intraday_store', 'cache')
+
+
+def _identity(value) -> Hashable:
+    """Identify a fetcher setting; equally configured objects compare equal."""
+    if value is None or isinstance(value, (str, bytes, int, float, bool)):
+        return value
+    # Stores are identified by their directory and recording transports by
+    # theirs, so fetchers created per session still share calls
+    location = getattr(value, 'root', None) or getattr(getattr(value, 'store', None), 'directory', None)
+    if location is not None:
+        return (type(value).__qualname__, location)
+    if not getattr(value, '__dict__', None):
+        # Stateless (e.g. the live transport)
+        return type(value).__qualname__
+    return (type(value).__qualname__, id(value))
+
+
+def _instance_key(instance) -> Hashable:
+    return (type(instance).__qualname__,) + tuple(
+        (attribute, _identity(getattr(instance, attribute)))
+        for attribute in _CONFIG_ATTRIBUTES if hasattr(instance, attribute)
+    )
+
+
+def coalesce(func: Callable = None, *, ignore: Iterable[str] = (), group: SingleFlight = None):
+    """
+    Decorate a fetcher method so identical concurrent calls share one upstream call.
+    
+    Calls are identical when they go to the same method with the same
+    arguments on equally configured fetchers (same class, API key,
+    transport and stores), whichever instance they are made on. Positional
+    and keyword spellings of an argument are treated the same.
+    
+    Parameters:
+    -----------
+    ignore : iterable of str
+        Argument names that do not affect the result (e.g. 'priority')
+    group : SingleFlight, optional
+        Coalescing group. Defaults to the process-wide group
+    """
+    if func is None:
+        return functools.partial(coalesce, ignore=ignore, group=group)
+    
+    signature = inspect.signature(func)
+    ignored = set(ignore) | {'self'}
+    name = f"{func.__module__}.{func.__qualname__}"
+    
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        key = (
+            name,
+            _instance_key(bound.arguments['self']),
+            _freeze({k: v for k, v in bound.arguments.items() if k not in ignored})
+        )
+        return (group or default_group).do(key, func, *args, **kwargs)
+    
+    return wrapper
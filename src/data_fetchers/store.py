@@ -0,0 +1,264 @@
+"""
+Local on-disk storage for fetched market data.
+
+Frames are stored as Parquet files (one file per key) with a small JSON
+metadata block embedded in the file schema, so a frame and the bookkeeping
+that describes it are always written and replaced together.
+"""
+
+import json
+import os
+import tempfile
+from typing import Dict, Optional, Tuple
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+
+_METADATA_KEY = b'marketanalyzer'
+
+
+def default_cache_dir() -> str:
+    """
+    Return the root directory for local caches.
+    
+    Uses the MARKETANALYZER_CACHE_DIR environment variable when set,
+    otherwise ~/.cache/marketanalyzer.
+    """
+    return os.getenv(
+        'MARKETANALYZER_CACHE_DIR',
+        os.path.join(os.path.expanduser('~'), '.cache', 'marketanalyzer')
+    )
+
+
+class FrameStore:
+    """Parquet-backed key/value store for DataFrames with attached metadata."""
+    
+    def __init__(self, root: Optional[str] = None):
+        """
+        Initialize the store.
+        
+        Parameters:
+        -----------
+        root : str, optional
+            Directory holding the Parquet files. Defaults to default_cache_dir()
+        """
+        if pa is None:
+            raise ImportError("pyarrow package not installed. Run: pip install pyarrow")
+        
+        self.root = root or default_cache_dir()
+    
+    def path(self, *parts: str) -> str:
+        """Return the file path for a key made of one or more path parts."""
+        safe = [str(part).replace(os.sep, '_') for part in parts]
+        return os.path.join(self.root, *safe[:-1], f"{safe[-1]}.parquet")
+    
+    def read(self, *parts: str) -> Tuple[Optional[pd.DataFrame], Dict]:
+        """
+        Read a stored frame.
+        
+        Returns:
+        --------
+        tuple
+            (DataFrame, metadata dict), or (None, {}) if nothing is stored
+        """
+        path = self.path(*parts)
+        if not os.path.exists(path):
+            return None, {}
+        
+        table = pq.read_table(path)
+        raw = (table.schema.metadata or {}).get(_METADATA_KEY)
+        meta = json.loads(raw) if raw else {}
+        return table.to_pandas(), meta
+    
+    def write(self, df: pd.DataFrame, meta: Dict, *parts: str):
+        """Atomically write a frame and its metadata under the given key."""
+        path = self.path(*parts)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        
+        table = pa.Table.from_pandas(df, preserve_index=True)
+        metadata = dict(table.schema.metadata or {})
+        metadata[_METADATA_KEY] = json.dumps(meta).encode()
+        table = table.replace_schema_metadata(metadata)
+        
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        os.close(fd)
+        try:
+            pq.write_table(table, tmp_path)
+            os.replace(tmp_path, path)
+        except Exception:
+            os.remove(tmp_path)
+            raise
+
+
+class OHLCVStore(FrameStore):
+    """
+    Columnar store of OHLCV bars partitioned by interval and ticker.
+    
+    Each (ticker, interval) pair lives in its own file together with the
+    contiguous date range it covers. The covered range is tracked separately
+    from the first and last bar so that weekends, holidays and the time of
+    the last refresh are remembered, and the fetcher never asks upstream
+    again for a range it already knows is empty.
+    """
+    
+    def __init__(self, root: Optional[str] = None):
+        super().__init__(os.path.join(root or default_cache_dir(), 'ohlcv'))
+    
+    def load(self, ticker: str, interval: str):
+        """
+        Load stored bars for a ticker.
+        
+        Returns:
+        --------
+        tuple
+            (DataFrame, (coverage_start, coverage_end)) with naive wall-clock
+            timestamps, or (None, None) if nothing is stored
+        """
+        data, meta = self.read(interval, ticker.upper())
+        if data is None or 'start' not in meta:
+            return None, None
+        return data, (pd.Timestamp(meta['start']), pd.Timestamp(meta['end']))
+    
+    def save(self, ticker: str, interval: str, data: pd.DataFrame, coverage):
+        """Replace the stored bars and covered range for a ticker."""
+        start, end = coverage
+        meta = {'start': start.isoformat(), 'end': end.isoformat()}
+        self.write(data, meta, interval, ticker.upper())
+    
+    def merge(self, ticker: str, interval: str, new_data: pd.DataFrame, coverage) -> pd.DataFrame:
+        """
+        Merge freshly downloaded bars into the store.
+        
+        Newer rows win on duplicate timestamps, so a partial bar from an
+        earlier refresh is replaced by its final values.
+        
+        Parameters:
+        -----------
+        ticker : str
+            Stock ticker symbol
+        interval : str
+            Bar interval (e.g. '1d', '1h')
+        new_data : pd.DataFrame
+            Downloaded bars
+        coverage : tuple
+            (start, end) range the download covered
+        
+        Returns:
+        --------
+        pd.DataFrame
+            All stored bars after the merge
+        """
+        stored, stored_coverage = self.load(ticker, interval)
+        
+        if stored is not None:
+            # An up-to-date refresh downloads nothing; concatenating empty
+            # frames is deprecated in pandas
+            frames = [frame for frame in (stored, new_data) if len(frame)]
+            data = pd.concat(frames) if len(frames) > 1 else (frames[0] if frames else stored)
+            data = data[~data.index.duplicated(keep='last')].sort_index()
+            coverage = (
+                min(coverage[0], stored_coverage[0]),
+                max(coverage[1], stored_coverage[1])
+            )
+        else:
+            data = new_data.sort_index()
+        
+        self.save(ticker, interval, data, coverage)
+        return data
+
+
+class CorporateActionsStore(FrameStore):
+    """
+    Local store of dividends and splits per ticker.
+    
+    Each ticker's actions are kept as one frame indexed by ex-date with a
+    'dividend' column (cash amount, 0 when none) and a 'split' column
+    (ratio, 0 when none), matching yfinance's conventions.
+    """
+    
+    def __init__(self, root: Optional[str] = None):
+        super().__init__(os.path.join(root or default_cache_dir(), 'actions'))
+    
+    def load(self, ticker: str) -> pd.DataFrame:
+        """Return the stored actions for a ticker (empty if none are stored)."""
+        data, _ = self.read(ticker.upper())
+        if data is None:
+            return pd.DataFrame({'dividend': [], 'split': []}, index=pd.DatetimeIndex([]))
+        return data
+    
+    def refresh(self, fetcher, tickers, max_workers: int = 8) -> Dict[str, pd.DataFrame]:
+        """
+        Download the latest actions and merge them into the store.
+        
+        Parameters:
+        -----------
+        fetcher : YahooFinanceFetcher
+            Fetcher used for get_dividends/get_splits (fanned out with get_batch)
+        tickers : list of str
+            Tickers to refresh
+        max_workers : int
+            Maximum number of concurrent downloads
+        
+        Returns:
+        --------
+        dict
+            Per ticker, the ex-dates with a new or revised amount. 'dividend'
+            and 'split' hold the latest amount of every cell that changed
+            (0 elsewhere, so an unchanged action on the same date is not
+            applied again) and 'previous_dividend'/'previous_split' the
+            amount already applied to a revised cell (0 for new actions).
+            Pass both to CorporateActionAdjuster.apply_actions, which holds
+            back announced actions dated after its last price row until
+            extend reaches them. Tickers that failed to download are left out
+        """
+        dividends, _ = fetcher.get_batch(tickers, 'get_dividends', max_workers=max_workers)
+        splits, _ = fetcher.get_batch(tickers, 'get_splits', max_workers=max_workers)
+        
+        changes = {}
+        for ticker in tickers:
+            if ticker not in dividends or ticker not in splits:
+                continue
+            
+            columns = [dividends[ticker]['dividend'], splits[ticker]['split']]
+            latest = pd.concat([_by_ex_date(column) for column in columns], axis=1).fillna(0.0)
+            latest = latest.groupby(level=0).sum().sort_index()
+            stored = self.load(ticker)
+            
+            # Compare cell by cell: a new split on the date of a stored
+            # dividend must not bring the dividend back
+            known = stored.reindex(latest.index).fillna(0.0)
+            revised = known != latest
+            changed = revised.any(axis=1)
+            changes[ticker] = pd.concat(
+                [latest.where(revised, 0.0)[changed], known.where(revised, 0.0)[changed].add_prefix('previous_')],
+                axis=1
+            )
+            
+            if changed.any():
+                merged = pd.concat([stored, latest])
+                merged = merged[~merged.index.duplicated(keep='last')].sort_index()
+                self.write(merged, {}, ticker.upper())
+        
+        return changes
+    
+    def panel(self, tickers) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """Return stored (dividends, splits) as wide ex-date x ticker frames."""
+        actions = {ticker: self.load(ticker) for ticker in tickers}
+        dividends = pd.DataFrame({ticker: frame['dividend'] for ticker, frame in actions.items()})
+        splits = pd.DataFrame({ticker: frame['split'] for ticker, frame in actions.items()})
+        return dividends.fillna(0.0), splits.fillna(0.0)
+
+
+def _by_ex_date(series: pd.Series) -> pd.Series:
+    """Index a yfinance action series by naive ex-date."""
+    index = pd.DatetimeIndex(series.index)
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    return pd.Series(series.to_numpy(dtype=float), index=index.normalize(), name=series.name)
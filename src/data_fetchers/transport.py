@@ -0,0 +1,170 @@
+"""
+Pluggable transports for upstream API calls.
+
+Fetchers route every upstream call through a transport:
+
+- LiveTransport calls the client library directly (the default)
+- RecordingTransport calls it and saves each response to disk
+- ReplayTransport serves saved responses back without any network access,
+  optionally with injected latency, so the caching, concurrency and parsing
+  paths can be benchmarked deterministically
+
+The default transport can be chosen with the MARKETANALYZER_TRANSPORT
+environment variable: 'live', 'record:<dir>' or 'replay:<dir>[:<latency>]'.
+"""
+
+import glob
+import hashlib
+import os
+import pickle
+import random
+import re
+import tempfile
+import time
+from typing import Any, Optional
+
+from .singleflight import _freeze
+
+
+class LiveTransport:
+    """Call upstream clients directly."""
+    
+    offline = False
+    
+    def call(self, source: str, client: Any, method: str, *args, **kwargs) -> Any:
+        """
+        Call client.method(*args, **kwargs).
+        
+        Parameters:
+        -----------
+        source : str
+            Upstream name (e.g. 'yahoo', 'fred', 'alpha_vantage')
+        client : object
+            Client object exposing the method
+        method : str
+            Method name, also used as the endpoint name for recordings
+        """
+        return getattr(client, method)(*args, **kwargs)
+
+
+class _RecordingStore:
+    """File layout shared by recording and replay: <dir>/<source>/<method>/<label>-<hash>.pkl"""
+    
+    def __init__(self, directory: str):
+        self.directory = directory
+    
+    def path(self, source, method, args, kwargs) -> str:
+        key = repr((source, method, _freeze(args), _freeze(kwargs)))
+        digest = hashlib.sha256(key.encode()).hexdigest()[:16]
+        return os.path.join(self.directory, source, method, f"{self.label(args, kwargs)}-{digest}.pkl")
+    
+    def label(self, args, kwargs) -> str:
+        # The symbol (first argument) keeps recordings browsable and lets
+        # non-strict replay find a close match
+        first = args[0] if args else kwargs.get('symbol', 'call')
+        return re.sub(r'[^A-Za-z0-9_.^=]+', '_', str(_freeze(first)))[:40]
+
+
+class RecordingTransport(LiveTransport):
+    """Call upstream clients and save every response (or error) to disk."""
+    
+    def __init__(self, directory: str):
+        """
+        Parameters:
+        -----------
+        directory : str
+            Directory the recordings are written to
+        """
+        self.store = _RecordingStore(directory)
+    
+    def call(self, source: str, client: Any, method: str, *args, **kwargs) -> Any:
+        try:
+            outcome = ('result', super().call(source, client, method, *args, **kwargs))
+        except Exception as e:
+            outcome = ('error', e)
+        
+        path = self.store.path(source, method, args, kwargs)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        with os.fdopen(fd, 'wb') as f:
+            pickle.dump(outcome, f)
+        os.replace(tmp_path, path)
+        
+        if outcome[0] == 'error':
+            raise outcome[1]
+        return outcome[1]
+
+
+class ReplayTransport:
+    """Serve recorded responses without touching the network."""
+    
+    offline = True
+    
+    def __init__(
+        self,
+        directory: str,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        strict: bool = False,
+        seed: Optional[int] = None
+    ):
+        """
+        Parameters:
+        -----------
+        directory : str
+            Directory holding recordings made by RecordingTransport
+        latency : float
+            Seconds slept before every response, simulating a round-trip
+        jitter : float
+            Extra uniformly distributed random delay of up to this many seconds
+        strict : bool
+            If False, a call with no exact recording is served the most recent
+            recording for the same source, method and first argument. This
+            covers arguments that vary between runs, such as 'now' timestamps
+        seed : int, optional
+            Seed for the jitter, for reproducible runs
+        """
+        self.store = _RecordingStore(directory)
+        self.latency = latency
+        self.jitter = jitter
+        self.strict = strict
+        self.random = random.Random(seed)
+    
+    def call(self, source: str, client: Any, method: str, *args, **kwargs) -> Any:
+        path = self.store.path(source, method, args, kwargs)
+        
+        if not os.path.exists(path) and not self.strict:
+            pattern = os.path.join(os.path.dirname(path), f"{glob.escape(self.store.label(args, kwargs))}-*.pkl")
+            candidates = glob.glob(pattern)
+            if candidates:
+                path = max(candidates, key=os.path.getmtime)
+        
+        if not os.path.exists(path):
+            raise LookupError(f"No recording for {source}.{method}{args} {kwargs}")
+        
+        with open(path, 'rb') as f:
+            kind, value = pickle.load(f)
+        
+        delay = self.latency + (self.random.uniform(0, self.jitter) if self.jitter else 0.0)
+        if delay > 0:
+            time.sleep(delay)
+        
+        if kind == 'error':
+            raise value
+        return value
+
+
+def get_default_transport():
+    """Build the transport selected by MARKETANALYZER_TRANSPORT (live by default)."""
+    setting = os.getenv('MARKETANALYZER_TRANSPORT', 'live')
+    mode, _, rest = setting.partition(':')
+    
+    if mode == 'live':
+        return LiveTransport()
+    if mode == 'record':
+        return RecordingTransport(rest)
+    if mode == 'replay':
+        directory, _, latency = rest.rpartition(':') if re.search(r':[0-9.]+$', rest) else (rest, '', '0')
+        return ReplayTransport(directory, latency=float(latency))
+    
+    raise ValueError(f"Transport {setting} not supported. Use 'live', 'record:<dir>' or 'replay:<dir>[:<latency>]'")
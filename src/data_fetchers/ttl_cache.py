@@ -0,0 +1,155 @@
+"""
+In-memory TTL cache with stale-while-revalidate refreshes.
+
+Entries are dicts of fields (e.g. yfinance ticker info), and each field can
+have its own time-to-live. Once an entry is stale, the old value is returned
+immediately and a single background refresh is started, so callers only
+block on the upstream call when a key has never been loaded.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Hashable, Iterable, Optional
+
+
+# Fields of yfinance Ticker.info that move during the trading day;
+# everything else (profile, fundamentals) uses the default TTL
+MARKET_FIELD_TTL = 60
+INFO_FIELD_TTLS = {
+    field: MARKET_FIELD_TTL for field in [
+        'currentPrice', 'regularMarketPrice', 'regularMarketOpen', 'regularMarketDayHigh',
+        'regularMarketDayLow', 'regularMarketVolume', 'regularMarketChange',
+        'regularMarketChangePercent', 'regularMarketPreviousClose', 'previousClose',
+        'open', 'dayHigh', 'dayLow', 'volume', 'bid', 'ask', 'bidSize', 'askSize',
+        'marketCap', 'enterpriseValue', 'trailingPE', 'forwardPE', 'priceToBook',
+        'dividendYield', 'preMarketPrice', 'postMarketPrice',
+    ]
+}
+
+
+class TTLCache:
+    """Size-bounded LRU cache with per-field TTLs and background revalidation."""
+    
+    def __init__(
+        self,
+        maxsize: int = 1024,
+        default_ttl: float = 6 * 60 * 60,
+        field_ttls: Optional[Dict[str, float]] = None,
+        max_refresh_workers: int = 4
+    ):
+        """
+        Initialize the cache.
+        
+        Parameters:
+        -----------
+        maxsize : int
+            Maximum number of entries; the least recently used are evicted
+        default_ttl : float
+            Seconds a field stays fresh unless listed in field_ttls
+        field_ttls : dict, optional
+            Per-field TTLs in seconds
+        max_refresh_workers : int
+            Maximum number of background refreshes running at once
+        """
+        self.maxsize = maxsize
+        self.default_ttl = default_ttl
+        self.field_ttls = field_ttls or {}
+        self.max_refresh_workers = max_refresh_workers
+        
+        self._entries = OrderedDict()
+        self._refreshing = set()
+        self._lock = threading.Lock()
+        self._executor = None
+        self.stats = {'hits': 0, 'stale_hits': 0, 'misses': 0, 'refreshes': 0, 'refresh_errors': 0}
+    
+    def ttl(self, value: Any, fields: Optional[Iterable[str]] = None) -> float:
+        """TTL of an entry: the shortest TTL among the fields the caller needs."""
+        if fields is None:
+            fields = value.keys() if isinstance(value, dict) else []
+        return min((self.field_ttls.get(field, self.default_ttl) for field in fields), default=self.default_ttl)
+    
+    def get(self, key: Hashable, loader: Callable[[], Any], fields: Optional[Iterable[str]] = None) -> Any:
+        """
+        Return the cached value for key, loading it if needed.
+        
+        Parameters:
+        -----------
+        key : hashable
+            Cache key
+        loader : callable
+            Called with no arguments to load a fresh value
+        fields : iterable of str, optional
+            Fields the caller needs. Only their TTLs decide whether the entry
+            is stale, so a caller that only needs slow-moving fields never
+            triggers a refresh because of fast-moving ones
+        
+        Returns:
+        --------
+        object
+            The cached value, possibly stale while a refresh runs
+        """
+        fields = list(fields) if fields is not None else None
+        
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                value, loaded_at = entry
+                if time.time() - loaded_at < self.ttl(value, fields):
+                    self.stats['hits'] += 1
+                    return value
+                
+                self.stats['stale_hits'] += 1
+                if key not in self._refreshing:
+                    self._refreshing.add(key)
+                    self._refresh_executor().submit(self._refresh, key, loader)
+                return value
+            
+            self.stats['misses'] += 1
+        
+        value = loader()
+        self._put(key, value)
+        return value
+    
+    def _refresh_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_refresh_workers, thread_name_prefix='ttl-cache-refresh'
+            )
+        return self._executor
+    
+    def _refresh(self, key: Hashable, loader: Callable[[], Any]):
+        try:
+            value = loader()
+        except Exception:
+            # Keep serving the stale value; the next stale read retries
+            with self._lock:
+                self.stats['refresh_errors'] += 1
+                self._refreshing.discard(key)
+            return
+        
+        self._put(key, value)
+        with self._lock:
+            self.stats['refreshes'] += 1
+            self._refreshing.discard(key)
+    
+    def _put(self, key: Hashable, value: Any):
+        with self._lock:
+            self._entries[key] = (value, time.time())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+    
+    def invalidate(self, key: Hashable):
+        """Drop a key so the next read loads it again."""
+        with self._lock:
+            self._entries.pop(key, None)
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# Shared by every YahooFinanceFetcher in the process
+default_info_cache = TTLCache(field_ttls=INFO_FIELD_TTLS)
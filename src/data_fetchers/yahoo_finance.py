@@ -1,37 +1,193 @@
-import yfinance as yf
+import pandas as pd
+
+from .batch import iter_concurrent, run_concurrent
+from .singleflight import _identity, coalesce
+from .transport import get_default_transport
+from .ttl_cache import default_info_cache
+
+# Lookback for each yfinance period string, used to turn a period into an
+# explicit window when reading through the local store
+PERIOD_OFFSETS = {
+    '1d': pd.DateOffset(days=1),
+    '5d': pd.DateOffset(days=5),
+    '1mo': pd.DateOffset(months=1),
+    '3mo': pd.DateOffset(months=3),
+    '6mo': pd.DateOffset(months=6),
+    '1y': pd.DateOffset(years=1),
+    '2y': pd.DateOffset(years=2),
+    '5y': pd.DateOffset(years=5),
+    '10y': pd.DateOffset(years=10),
+}
+
+# How long the tail of a live window may go without a refresh
+MAX_STALENESS = {
+    '1m': pd.Timedelta(minutes=1),
+    '2m': pd.Timedelta(minutes=2),
+    '5m': pd.Timedelta(minutes=5),
+}
+DEFAULT_STALENESS = pd.Timedelta(minutes=15)
+
+# Per-ticker methods that can be fanned out with iter_batch/get_batch
+BATCH_METHODS = ('get_stock_data', 'get_stock_info', 'get_dividends', 'get_splits')
+
+
+class _YahooClient:
+    # Thin adapter so every yfinance call goes through one transport interface.
+    # yfinance is slow to import, so it is only loaded on the first real call.
+    @property
+    def yf(self):
+        import yfinance
+        return yfinance
+    
+    def history(self, ticker, **kwargs):
+        return self.yf.Ticker(ticker).history(**kwargs)
+    
+    def download(self, tickers, **kwargs):
+        return self.yf.download(tickers, **kwargs)
+    
+    def info(self, ticker):
+        return self.yf.Ticker(ticker).info
+    
+    def dividends(self, ticker):
+        return self.yf.Ticker(ticker).dividends
+    
+    def splits(self, ticker):
+        return self.yf.Ticker(ticker).splits
+
 
 class YahooFinanceFetcher:
-    def __init__(self):
-        pass
+    def __init__(self, store=None, transport=None, info_cache=None, use_info_cache=True):
+        # Optional OHLCVStore; when set, get_stock_data reads through it and
+        # only downloads the missing head/tail of the requested window
+        self.store = store
+        # get_stock_info is served from a TTLCache (shared process-wide by
+        # default) that refreshes stale entries in the background
+        self.info_cache = None
+        if use_info_cache:
+            self.info_cache = info_cache if info_cache is not None else default_info_cache
+        self.transport = transport or get_default_transport()
+        self.client = _YahooClient()
     
+    @coalesce
     def get_stock_data(self, ticker, start_date=None, end_date=None, period="1y", interval="1d"):
-        stock = yf.Ticker(ticker)
+        if self.store is None:
+            return self._download_history(ticker, interval, start_date, end_date, period)
         
         if start_date and end_date:
-            data = stock.history(start=start_date, end=end_date, interval=interval)
+            return self._read_through(ticker, interval, pd.Timestamp(start_date), pd.Timestamp(end_date), live=False)
+        if period in PERIOD_OFFSETS or period == 'ytd':
+            return self._read_through(ticker, interval, None, None, live=True, period=period)
+        
+        # 'max' has no fixed start, so it always goes upstream
+        return self._download_history(ticker, interval, start_date, end_date, period)
+    
+    def _download_history(self, ticker, interval, start=None, end=None, period="1y"):
+        if start is not None and end is not None:
+            data = self.transport.call('yahoo', self.client, 'history', ticker, start=start, end=end, interval=interval)
         else:
-            data = stock.history(period=period, interval=interval)
+            data = self.transport.call('yahoo', self.client, 'history', ticker, period=period, interval=interval)
         
         data.columns = [col.lower().replace(' ', '_') for col in data.columns]
         
         return data
     
+    def _read_through(self, ticker, interval, start, end, live, period=None):
+        stored, coverage = self.store.load(ticker, interval)
+        tz = stored.index.tz if stored is not None else None
+        
+        if live:
+            end = _naive(pd.Timestamp.now(tz=tz))
+            if period == 'ytd':
+                start = end.normalize().replace(month=1, day=1)
+            else:
+                start = end.normalize() - PERIOD_OFFSETS[period]
+        
+        if stored is None:
+            data = self._download_history(ticker, interval, start, end)
+            if len(data) > 0:
+                self.store.merge(ticker, interval, data, (start, end))
+            return data
+        
+        cov_start, cov_end = coverage
+        staleness = MAX_STALENESS.get(interval, DEFAULT_STALENESS)
+        downloaded = []
+        
+        # Head gap: everything between the requested start and what we hold
+        if start < cov_start:
+            head = self._download_history(ticker, interval, start, cov_start)
+            downloaded.append((head, (start, cov_start)))
+        
+        # Tail gap: re-download from the last stored bar, which may have been
+        # a partial bar when it was fetched
+        if end > cov_end and (not live or end - cov_end > staleness):
+            tail_start = cov_end
+            if len(stored) > 0:
+                tail_start = min(cov_end, _naive(stored.index[-1]))
+            tail = self._download_history(ticker, interval, tail_start, end)
+            downloaded.append((tail, (tail_start, end)))
+        
+        for new_data, new_coverage in downloaded:
+            stored = self.store.merge(ticker, interval, new_data, new_coverage)
+        
+        index = _naive_index(stored.index)
+        return stored[(index >= start) & (index < end)]
+    
+    @coalesce
     def get_multiple_stocks(self, tickers, start_date=None, end_date=None, period="1y"):
         if start_date and end_date:
-            data = yf.download(tickers, start=start_date, end=end_date, progress=False)
+            data = self.transport.call('yahoo', self.client, 'download', tickers, start=start_date, end=end_date, progress=False)
         else:
-            data = yf.download(tickers, period=period, progress=False)
+            data = self.transport.call('yahoo', self.client, 'download', tickers, period=period, progress=False)
         
         return data
     
-    def get_stock_info(self, ticker):
-        stock = yf.Ticker(ticker)
-        return stock.info
+    @coalesce
+    def get_stock_info(self, ticker, fields=None):
+        # With fields, only those keys are returned and only their TTLs decide
+        # whether the cached entry needs a refresh. The cache may be shared,
+        # so entries are kept apart per transport (live, each recording dir)
+        if self.info_cache is None:
+            info = self._fetch_info(ticker)
+        else:
+            key = (_identity(self.transport), ticker.upper())
+            info = self.info_cache.get(key, lambda: self._fetch_info(ticker), fields)
+        
+        if fields is not None:
+            return {field: info.get(field) for field in fields}
+        return dict(info)
+    
+    def _fetch_info(self, ticker):
+        return self.transport.call('yahoo', self.client, 'info', ticker)
     
+    @coalesce
     def get_dividends(self, ticker):
-        stock = yf.Ticker(ticker)
-        return stock.dividends.to_frame(name='dividend')
+        dividends = self.transport.call('yahoo', self.client, 'dividends', ticker)
+        return dividends.to_frame(name='dividend')
     
+    @coalesce
     def get_splits(self, ticker):
-        stock = yf.Ticker(ticker)
-        return stock.splits.to_frame(name='split')
+        splits = self.transport.call('yahoo', self.client, 'splits', ticker)
+        return splits.to_frame(name='split')
+    
+    def iter_batch(self, tickers, method='get_stock_data', max_workers=8, timeout=None, **kwargs):
+        # Yields BatchResult(ticker, value, error, elapsed) as each call completes
+        if method not in BATCH_METHODS:
+            raise ValueError(f"Method {method} not supported. Available: {list(BATCH_METHODS)}")
+        
+        return iter_concurrent(getattr(self, method), tickers, max_workers=max_workers, timeout=timeout, **kwargs)
+    
+    def get_batch(self, tickers, method='get_stock_data', max_workers=8, timeout=None, **kwargs):
+        # Returns (results, errors) dicts keyed by ticker
+        if method not in BATCH_METHODS:
+            raise ValueError(f"Method {method} not supported. Available: {list(BATCH_METHODS)}")
+        
+        return run_concurrent(getattr(self, method), tickers, max_workers=max_workers, timeout=timeout, **kwargs)
+
+
+def _naive(timestamp):
+    """Drop the timezone from a timestamp, keeping its wall-clock time."""
+    return timestamp.tz_localize(None) if timestamp.tzinfo is not None else timestamp
+
+
+def _naive_index(index):
+    return index.tz_localize(None) if index.tz is not None else index
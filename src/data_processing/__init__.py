@@ -1,9 +1,47 @@
 """
 Data processing and cleaning utilities.
+
+Submodules are imported lazily on first attribute access.
 """
 
-from .cleaners import DataCleaner
-from .calculators import ReturnCalculator, VolatilityCalculator
+import importlib
+
+_EXPORTS = {
+    'DataCleaner': '.cleaners',
+    'ReturnCalculator': '.calculators',
+    'VolatilityCalculator': '.calculators',
+    'CorporateActionAdjuster': '.adjustments',
+    'RiskAccumulator': '.streaming',
+    'TDigest': '.sketches',
+    'RollingEngine': '.rolling',
+    'MonteCarloVaR': '.simulation',
+    'EWMACovariance': '.covariance',
+    'shrunk_covariance': '.covariance',
+    'EfficientFrontier': '.portfolio',
+    'Backtester': '.backtest',
+    'IndicatorEngine': '.indicators',
+    'compute_indicator': '.indicators',
+    'MemoizedCalculator': '.memo',
+    'ResultCache': '.memo',
+    'OutlierDetector': '.outliers',
+    'FrameAligner': '.alignment',
+    'TradingCalendar': '.alignment',
+    'ResamplingPyramid': '.resampling',
+    'resample_ohlcv': '.resampling',
+}
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    
+    value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS))
 
-__all__ = ['DataCleaner', 'ReturnCalculator', 'VolatilityCalculator']
 
+__all__ = list(_EXPORTS)
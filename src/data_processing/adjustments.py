@@ -0,0 +1,151 @@
+import pandas as pd
+import numpy as np
+
+
+def _dates(index):
+    # Actions and prices are matched on naive calendar dates
+    index = pd.DatetimeIndex(index)
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    return index.normalize()
+
+
+def _after(actions, last):
+    # Actions dated after the last price row (all of them without prices)
+    if actions is None or last is None:
+        return actions
+    return actions[_dates(actions.index) > last]
+
+
+class CorporateActionAdjuster:
+    """
+    Split- and dividend-adjusted price panels from raw prices and actions.
+    
+    Every action becomes a per-event factor on its ex-date row: 1 / ratio for
+    a split and 1 - dividend / previous close for a cash dividend. The
+    adjustment factor for a row is the product of all event factors after
+    it, computed for the whole T x N panel with one reverse cumulative
+    product. Adjusted prices are raw prices times that factor.
+    
+    Because the factors multiply, new actions are applied by multiplying the
+    existing factors with the factors of the new events only, without
+    re-downloading or recomputing history. A revised action is applied as
+    the ratio of its new factor to the factor already applied. Actions
+    dated after the last price row are held back until extend adds a row at
+    or after their ex-date.
+    
+    Prices and actions must use the same basis. yfinance's Close is already
+    split-adjusted, so pass splits=None when adjusting it for dividends.
+    """
+    
+    def __init__(self, close, dividends=None, splits=None):
+        """
+        Parameters:
+        -----------
+        close : pd.DataFrame
+            Raw close prices, T dates x N tickers
+        dividends : pd.DataFrame, optional
+            Cash dividends by ex-date x ticker (0 or NaN when none)
+        splits : pd.DataFrame, optional
+            Split ratios by ex-date x ticker (0, 1 or NaN when none)
+        """
+        self.close = close.sort_index()
+        self.factors = pd.DataFrame(1.0, index=self.close.index, columns=self.close.columns)
+        # (dividends, splits, previous_dividends, previous_splits) dated after
+        # the last price row
+        self._pending = []
+        self.apply_actions(dividends, splits)
+    
+    def _event_factors(self, dividends=None, splits=None):
+        """T x N array of per-event factors for the given actions (1 where nothing happens)."""
+        dates = _dates(self.close.index)
+        prices = self.close.to_numpy(dtype=float)
+        events = np.ones(prices.shape)
+        
+        for actions, kind in [(splits, 'split'), (dividends, 'dividend')]:
+            if actions is None or len(actions) == 0:
+                continue
+            
+            actions = actions.reindex(columns=self.close.columns).fillna(0.0)
+            values = actions.to_numpy(dtype=float)
+            
+            # Ex-dates falling on non-trading days apply to the next trading day;
+            # actions outside the price history have no rows to adjust
+            rows = np.searchsorted(dates.to_numpy(), _dates(actions.index).to_numpy(), side='left')
+            row_idx, col_idx = np.nonzero(values)
+            rows = rows[row_idx]
+            in_range = (rows > 0) & (rows < len(dates))
+            rows, col_idx, amounts = rows[in_range], col_idx[in_range], values[row_idx, col_idx][in_range]
+            
+            if kind == 'split':
+                factor = 1.0 / amounts
+            else:
+                factor = 1.0 - amounts / prices[rows - 1, col_idx]
+            # Several actions can land on the same row
+            np.multiply.at(events, (rows, col_idx), factor)
+        
+        return np.where(np.isfinite(events), events, 1.0)
+    
+    @staticmethod
+    def _cumulative(events):
+        # factor[t] = product of event factors at rows t+1 .. T-1
+        reverse = np.cumprod(events[::-1], axis=0)[::-1]
+        cumulative = np.ones_like(events)
+        cumulative[:-1] = reverse[1:]
+        return cumulative
+    
+    def apply_actions(self, dividends=None, splits=None, previous_dividends=None, previous_splits=None):
+        """
+        Fold new or revised actions into the adjustment factors.
+        
+        Only the given actions are processed; previously applied actions
+        must not be passed again or they would be applied twice.
+        
+        Parameters:
+        -----------
+        dividends, splits : pd.DataFrame, optional
+            New amounts by ex-date x ticker
+        previous_dividends, previous_splits : pd.DataFrame, optional
+            For revised actions, the amounts applied before (0 or NaN for
+            new actions); their factors are divided out
+        """
+        last = _dates(self.close.index)[-1] if len(self.close) else None
+        later = tuple(_after(actions, last) for actions in (dividends, splits, previous_dividends, previous_splits))
+        if any(actions is not None and len(actions) for actions in later):
+            self._pending.append(later)
+        
+        if len(self.close) == 0:
+            return self
+        events = self._event_factors(dividends, splits) / self._event_factors(previous_dividends, previous_splits)
+        self.factors = self.factors * self._cumulative(events)
+        return self
+    
+    def extend(self, close):
+        """
+        Append new raw price rows.
+        
+        The new rows start with a factor of 1. Actions held back because
+        they were dated after the last row are applied once the new rows
+        reach their ex-date; later actions are added with apply_actions.
+        """
+        new_rows = close.loc[~close.index.isin(self.close.index)]
+        self.close = pd.concat([self.close, new_rows]).sort_index()
+        self.factors = self.factors.reindex(index=self.close.index, columns=self.close.columns).fillna(1.0)
+        
+        pending, self._pending = self._pending, []
+        for actions in pending:
+            self.apply_actions(*actions)
+        return self
+    
+    def adjusted(self, prices=None):
+        """
+        Return adjusted prices.
+        
+        Parameters:
+        -----------
+        prices : pd.DataFrame, optional
+            Raw prices on the same dates and tickers (e.g. open, high or low).
+            Defaults to the close panel
+        """
+        prices = self.close if prices is None else prices
+        return prices * self.factors.reindex(index=prices.index, columns=prices.columns).fillna(1.0)
@@ -0,0 +1,326 @@
+"""
+Calendar-aware alignment of frames from different sources.
+
+FrameAligner lines up frames (daily equities, FRED series, Alpha Vantage
+data, ...) on one index:
+
+- The sorted indices are merged k-way in a single pass: a stable sort of
+  the concatenated indices merges the already-sorted runs, and run lengths
+  give the union or the intersection.
+- The result can be restricted to the sessions of a TradingCalendar (NYSE by
+  default), or be the full session grid between the frames' first and last
+  dates.
+- Frames marked as-of (e.g. monthly macro data) do not shape the index;
+  each date takes their latest value at or before it.
+
+All numeric frames are written into a single Fortran-ordered panel, so the
+aligned frames are column slices of one contiguous array rather than N
+reindexed copies, and come back as float64 whatever their original dtype.
+Series are aligned like one-column frames and returned as Series.
+"""
+
+from typing import List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+from dateutil.relativedelta import MO
+from pandas.tseries.holiday import (
+    AbstractHolidayCalendar, GoodFriday, Holiday, nearest_workday, sunday_to_monday
+)
+from pandas.tseries.offsets import DateOffset
+
+HOW = ['inner', 'outer', 'left', 'calendar']
+
+_NANOS = {'s': 1_000_000_000, 'ms': 1_000_000, 'us': 1_000, 'ns': 1}
+
+
+class NYSEHolidayCalendar(AbstractHolidayCalendar):
+    """Regular NYSE holidays."""
+    rules = [
+        # A Saturday New Year's Day is not moved to Friday
+        Holiday('New Years Day', month=1, day=1, observance=sunday_to_monday),
+        Holiday('Martin Luther King Jr. Day', month=1, day=1, offset=DateOffset(weekday=0, weeks=2),
+                start_date='1998-01-01'),
+        Holiday('Washingtons Birthday', month=2, day=1, offset=DateOffset(weekday=0, weeks=2)),
+        GoodFriday,
+        # Last Monday of May, counted back from May 31 (which may itself be one)
+        Holiday('Memorial Day', month=5, day=31, offset=DateOffset(weekday=MO(-1))),
+        Holiday('Juneteenth', month=6, day=19, observance=nearest_workday, start_date='2022-01-01'),
+        Holiday('Independence Day', month=7, day=4, observance=nearest_workday),
+        Holiday('Labor Day', month=9, day=1, offset=DateOffset(weekday=0)),
+        Holiday('Thanksgiving', month=11, day=1, offset=DateOffset(weekday=3, weeks=3)),
+        Holiday('Christmas', month=12, day=25, observance=nearest_workday),
+    ]
+
+
+# Unscheduled full-day NYSE closures
+NYSE_CLOSURES = [
+    '1985-09-27', '1994-04-27',
+    '2001-09-11', '2001-09-12', '2001-09-13', '2001-09-14',
+    '2004-06-11', '2007-01-02', '2012-10-29', '2012-10-30',
+    '2018-12-05', '2025-01-09',
+]
+
+
+class TradingCalendar:
+    """Trading sessions of an exchange, computed once per span of years."""
+    
+    def __init__(self, holidays: Optional[AbstractHolidayCalendar] = None, closures: Sequence[str] = NYSE_CLOSURES):
+        """
+        Initialize the calendar.
+        
+        Parameters:
+        -----------
+        holidays : AbstractHolidayCalendar, optional
+            Holiday rules (NYSE by default)
+        closures : list of str
+            Additional one-off closure dates
+        """
+        self.holidays = holidays if holidays is not None else NYSEHolidayCalendar()
+        self.closures = pd.DatetimeIndex(closures)
+        self._sessions = pd.DatetimeIndex([])
+    
+    def _extend(self, start: pd.Timestamp, end: pd.Timestamp):
+        # Sessions are computed for whole years and kept, so later requests
+        # inside the same span are a binary search
+        if len(self._sessions) and self._first <= start and end <= self._last:
+            return
+        if len(self._sessions):
+            start, end = min(start, self._first), max(end, self._last)
+        self._first = pd.Timestamp(year=start.year, month=1, day=1)
+        self._last = pd.Timestamp(year=end.year, month=12, day=31)
+        
+        days = pd.bdate_range(self._first, self._last)
+        closed = self.holidays.holidays(self._first, self._last).union(self.closures)
+        self._sessions = days[~days.isin(closed)].as_unit('ns')
+    
+    def sessions(self, start, end) -> pd.DatetimeIndex:
+        """Session dates from start to end, inclusive."""
+        start, end = pd.Timestamp(start).normalize(), pd.Timestamp(end).normalize()
+        self._extend(start, end)
+        first, last = self._sessions.searchsorted([start, end + pd.Timedelta(days=1)])
+        return self._sessions[first:last]
+    
+    def is_session(self, dates) -> np.ndarray:
+        """True for timestamps that fall on a session date."""
+        dates = pd.DatetimeIndex(dates)
+        if len(dates) == 0:
+            return np.zeros(0, dtype=bool)
+        sessions = self.sessions(dates.min(), dates.max())
+        return dates.normalize().isin(sessions)
+
+
+def _keys(index: pd.Index) -> np.ndarray:
+    # Sortable values of an index; timestamps become wall-clock nanoseconds
+    # so tz-aware exchange data lines up with naive dates from other sources
+    if isinstance(index, pd.DatetimeIndex):
+        if index.tz is not None:
+            index = index.tz_localize(None)
+        # Scaling the integers is cheaper than converting the index's unit
+        return index.asi8 * _NANOS[index.unit]
+    return np.asarray(index)
+
+
+def _merge_keys(keys: Sequence[np.ndarray], how: str) -> np.ndarray:
+    if how == 'left':
+        return keys[0]
+    
+    # The stable sort (timsort) finds the k sorted runs and merges them
+    merged = np.sort(np.concatenate(keys), kind='stable')
+    if len(merged) == 0:
+        return merged
+    starts = np.flatnonzero(np.r_[True, merged[1:] != merged[:-1]])
+    if how == 'outer':
+        return merged[starts]
+    counts = np.diff(np.r_[starts, len(merged)])
+    return merged[starts[counts == len(keys)]]
+
+
+def merge_indices(indices: Sequence[pd.Index], how: str = 'inner') -> np.ndarray:
+    """
+    Merge sorted, duplicate-free indices in one pass.
+    
+    Parameters:
+    -----------
+    indices : list of pd.Index
+        Indices to merge
+    how : str
+        'inner' (labels in every index), 'outer' (labels in any index) or
+        'left' (the first index)
+    
+    Returns:
+    --------
+    np.ndarray
+        Sorted merged keys (nanoseconds for datetime indices)
+    """
+    return _merge_keys([_keys(index) for index in indices], how)
+
+
+def _as_frame(frame) -> pd.DataFrame:
+    return frame.to_frame() if isinstance(frame, pd.Series) else frame
+
+
+def _is_numeric(frame: pd.DataFrame) -> bool:
+    if frame.shape[1] == 1:
+        # Skips building the dtypes Series for the common single-column case
+        return pd.api.types.is_numeric_dtype(frame.iloc[:, 0].dtype)
+    return all(pd.api.types.is_numeric_dtype(dtype) for dtype in frame.dtypes)
+
+
+class FrameAligner:
+    """Align frames on a merged, calendar-aware index."""
+    
+    def __init__(
+        self,
+        how: str = 'inner',
+        calendar: Optional[TradingCalendar] = None,
+        tolerance=None
+    ):
+        """
+        Configure the alignment.
+        
+        Parameters:
+        -----------
+        how : str
+            'inner', 'outer' or 'left' merge of the indices, or 'calendar' for
+            every session between the frames' first and last dates
+        calendar : TradingCalendar, optional
+            Keep only dates that are sessions of this calendar; 'calendar'
+            uses the NYSE calendar when none is given
+        tolerance : str or pd.Timedelta, optional
+            Oldest value an as-of frame may carry forward (e.g. '45D')
+        """
+        if how not in HOW:
+            raise ValueError(f"Method {how} not supported. Available: {HOW}")
+        if how == 'calendar' and calendar is None:
+            calendar = TradingCalendar()
+        
+        self.how = how
+        self.calendar = calendar
+        self.tolerance = pd.Timedelta(tolerance) if tolerance is not None else None
+    
+    def target_index(self, frames: Sequence[pd.DataFrame], asof: Optional[Sequence[bool]] = None) -> pd.Index:
+        """The index frames are aligned on (as-of frames do not shape it)."""
+        asof = list(asof) if asof is not None else [False] * len(frames)
+        indices = [self._sorted(frame).index for frame in frames]
+        return self._target(indices, [_keys(index) for index in indices], asof)
+    
+    def _target(self, indices: List[pd.Index], keys: List[np.ndarray], asof: List[bool]) -> pd.Index:
+        exact = [i for i, late in enumerate(asof) if not late]
+        if not exact:
+            raise ValueError("At least one frame must be aligned exactly (not as-of)")
+        indices = [indices[i] for i in exact]
+        keys = [keys[i] for i in exact]
+        
+        datetime = all(isinstance(index, pd.DatetimeIndex) for index in indices)
+        if self.how == 'calendar':
+            first = min(values[0] for values in keys if len(values))
+            last = max(values[-1] for values in keys if len(values))
+            merged = _keys(self.calendar.sessions(pd.Timestamp(first), pd.Timestamp(last)))
+        else:
+            merged = _merge_keys(keys, self.how)
+            if self.calendar is not None and datetime and len(merged):
+                merged = merged[self.calendar.is_session(pd.DatetimeIndex(merged))]
+        
+        if not datetime:
+            return pd.Index(merged, name=indices[0].name)
+        target = pd.DatetimeIndex(merged.view('datetime64[ns]'), name=indices[0].name)
+        zones = {index.tz for index in indices}
+        if len(zones) == 1 and None not in zones:
+            # Every exact frame shares a time zone; keep it
+            target = target.tz_localize(zones.pop())
+        return target
+    
+    @staticmethod
+    def _sorted(frame: pd.DataFrame) -> pd.DataFrame:
+        return frame if frame.index.is_monotonic_increasing else frame.sort_index()
+    
+    def _rows(self, keys: np.ndarray, target_keys: np.ndarray, asof: bool) -> np.ndarray:
+        # Row of the frame with these keys for every target label, -1 where there is none
+        if len(keys) == 0:
+            return np.full(len(target_keys), -1)
+        if asof:
+            rows = np.searchsorted(keys, target_keys, side='right') - 1
+            if self.tolerance is not None:
+                stale = target_keys - keys[np.maximum(rows, 0)] > self.tolerance.value
+                rows = np.where(stale, -1, rows)
+            return rows
+        rows = np.minimum(np.searchsorted(keys, target_keys), len(keys) - 1)
+        return np.where(keys[rows] == target_keys, rows, -1)
+    
+    def _align(self, frames: Sequence[pd.DataFrame], asof: Optional[Sequence[bool]]):
+        asof = list(asof) if asof is not None else [False] * len(frames)
+        frames = [self._sorted(_as_frame(frame)) for frame in frames]
+        keys = [_keys(frame.index) for frame in frames]
+        target = self._target([frame.index for frame in frames], keys, asof)
+        target_keys = _keys(target)
+        
+        numeric = [_is_numeric(frame) for frame in frames]
+        widths = [frame.shape[1] if is_numeric else 0 for frame, is_numeric in zip(frames, numeric)]
+        offsets = np.r_[0, np.cumsum(widths)]
+        panel = np.empty((len(target), offsets[-1]), order='F')
+        
+        aligned = []
+        for i, frame in enumerate(frames):
+            rows = self._rows(keys[i], target_keys, asof[i])
+            missing = rows < 0
+            if not numeric[i]:
+                # Non-numeric frames cannot live in the float panel
+                taken = frame.iloc[np.maximum(rows, 0)].set_axis(target)
+                aligned.append(taken.mask(pd.Series(missing, index=target), axis=0) if missing.any() else taken)
+                continue
+            
+            columns = slice(offsets[i], offsets[i + 1])
+            panel[:, columns] = frame.to_numpy(dtype=float)[np.maximum(rows, 0)] if len(frame) else np.nan
+            panel[missing, columns] = np.nan
+            aligned.append(pd.DataFrame(panel[:, columns], index=target, columns=frame.columns, copy=False))
+        return aligned, panel, all(numeric)
+    
+    def align(self, frames: Sequence[pd.DataFrame], asof: Optional[Sequence[bool]] = None) -> List[pd.DataFrame]:
+        """
+        Align frames on one index.
+        
+        Parameters:
+        -----------
+        frames : list of pd.DataFrame or pd.Series
+            Frames to align; each index must be sortable
+        asof : list of bool, optional
+            Per frame, True to sample it as-of (latest value at or before
+            each date) instead of matching dates exactly
+        
+        Returns:
+        --------
+        list of pd.DataFrame or pd.Series
+            Aligned frames sharing one index, Series for Series inputs.
+            Numeric frames are float64 column slices of a single panel (see
+            panel())
+        """
+        aligned = self._align(frames, asof)[0]
+        return [
+            result.iloc[:, 0].rename(frame.name) if isinstance(frame, pd.Series) else result
+            for frame, result in zip(frames, aligned)
+        ]
+    
+    def panel(
+        self,
+        frames: Sequence[pd.DataFrame],
+        keys: Optional[Sequence[str]] = None,
+        asof: Optional[Sequence[bool]] = None
+    ) -> pd.DataFrame:
+        """
+        Align numeric frames into one contiguous panel.
+        
+        Returns:
+        --------
+        pd.DataFrame
+            Columns are (key, column) pairs; keys default to 0..k-1
+        """
+        aligned, values, numeric = self._align(frames, asof)
+        if not numeric:
+            raise ValueError("panel() needs numeric frames; use align() for other data")
+        
+        keys = list(keys) if keys is not None else list(range(len(frames)))
+        columns = pd.MultiIndex.from_tuples(
+            [(key, column) for key, frame in zip(keys, aligned) for column in frame.columns]
+        )
+        return pd.DataFrame(values, index=aligned[0].index, columns=columns, copy=False)
@@ -0,0 +1,238 @@
+"""
+Vectorized backtests over a ticker panel and a grid of strategy parameters.
+
+A signal function maps a T x N price matrix and one array per parameter to
+positions. Parameters arrive with shape (P, 1, 1), one entry per parameter
+set, so plain NumPy broadcasting evaluates P parameter sets over every
+ticker at once and returns P x T x N positions:
+
+    def momentum(prices, lookback):
+        past = prices[np.maximum(np.arange(len(prices)) - lookback[:, 0], 0)]
+        return np.sign(prices - past)
+
+The position held at the close of bar t earns the return of bar t + 1.
+Grids are cut into shards that bound memory, and shards run on a process
+pool. Every (parameter set, ticker) cell gets the VolatilityCalculator
+metrics: Return, Volatility, Sharpe and MaxDD.
+"""
+
+import itertools
+import os
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from . import kernels
+
+METRICS = ['Return', 'Volatility', 'Sharpe', 'MaxDD']
+
+# Price matrix of a worker process, sent once when the worker starts
+_worker_prices = None
+
+
+def _init_worker(prices: np.ndarray):
+    global _worker_prices
+    _worker_prices = prices
+
+
+def _rolling_mean(prices: np.ndarray, windows) -> np.ndarray:
+    # P x T x N simple moving averages, one window per parameter set. Each
+    # distinct window is one difference of a cumulative sum; a window with a
+    # missing price is NaN
+    windows = np.asarray(windows).reshape(-1).astype(int)
+    unique, inverse = np.unique(windows, return_inverse=True)
+    bars = len(prices)
+    
+    missing = np.isnan(prices)
+    totals = np.vstack([np.zeros((1, prices.shape[1])), np.cumsum(np.where(missing, 0.0, prices), axis=0)])
+    gaps = np.vstack([np.zeros((1, prices.shape[1])), np.cumsum(missing, axis=0)]) if missing.any() else None
+    
+    table = np.full((len(unique),) + prices.shape, np.nan)
+    for k, window in enumerate(unique):
+        if window > bars:
+            continue
+        table[k, window - 1:] = (totals[window:] - totals[:-window]) / window
+        if gaps is not None:
+            table[k, window - 1:][gaps[window:] > gaps[:-window]] = np.nan
+    return table[inverse]
+
+
+def moving_average_crossover(prices: np.ndarray, fast, slow, long_only=False) -> np.ndarray:
+    """
+    Long when the fast moving average is above the slow one, short (or flat
+    with long_only) when below.
+    
+    Parameters:
+    -----------
+    prices : np.ndarray
+        T x N prices
+    fast, slow : array of int
+        Window lengths, shape (P, 1, 1)
+    long_only : bool or array of bool
+        Stay flat instead of short; may vary across the grid
+    
+    Returns:
+    --------
+    np.ndarray
+        P x T x N positions; NaN before both averages exist
+    """
+    position = np.sign(_rolling_mean(prices, fast) - _rolling_mean(prices, slow))
+    if np.any(long_only):
+        position = np.where(long_only, np.maximum(position, 0), position)
+    return position
+
+
+def _evaluate(
+    prices: np.ndarray,
+    signal: Callable,
+    params: Dict[str, np.ndarray],
+    transaction_cost: float,
+    risk_free_rate: float,
+    periods_per_year: int
+) -> np.ndarray:
+    # Metrics for one shard of parameter sets, as a 4 x P x N array
+    n_sets = len(next(iter(params.values())))
+    positions = signal(prices, **{name: values[:, None, None] for name, values in params.items()})
+    # Missing positions (e.g. before an indicator warms up) are flat
+    positions = np.broadcast_to(positions, (n_sets,) + prices.shape)[:, :-1]
+    positions = np.where(np.isnan(positions), 0.0, positions)
+    
+    with np.errstate(invalid='ignore', divide='ignore'):
+        returns = prices[1:] / prices[:-1] - 1
+    # Bars without a return are left out of every metric; they are zero
+    # here so the sums below need no NaN handling
+    valid = ~np.isnan(returns)
+    strategy = positions * np.where(valid, returns, 0.0)
+    if transaction_cost:
+        trades = np.abs(np.diff(positions, axis=1, prepend=0.0))
+        strategy -= transaction_cost * trades * valid
+    
+    with warnings.catch_warnings():
+        # Tickers without enough data get NaN metrics
+        warnings.simplefilter('ignore', RuntimeWarning)
+        count = valid.sum(axis=0)
+        mean = strategy.sum(axis=1) / count
+        deviation = strategy - mean[:, None, :]
+        deviation *= valid
+        std = np.sqrt(np.einsum('ptn,ptn->pn', deviation, deviation) / (count - 1))
+        
+        if not valid.all():
+            strategy[:, ~valid] = np.nan
+        bars = strategy.shape[1]
+        max_drawdown = kernels.max_drawdown(strategy.transpose(1, 0, 2).reshape(bars, -1)).reshape(mean.shape)
+        
+        return np.stack([
+            (1 + mean) ** periods_per_year - 1,
+            std * np.sqrt(periods_per_year),
+            np.sqrt(periods_per_year) * (mean - risk_free_rate / periods_per_year) / std,
+            max_drawdown,
+        ])
+
+
+def _evaluate_shard(signal: Callable, params: Dict[str, np.ndarray], *settings) -> np.ndarray:
+    # Worker entry point; the prices were sent by _init_worker
+    return _evaluate(_worker_prices, signal, params, *settings)
+
+
+def parameter_grid(**values) -> pd.DataFrame:
+    """Every combination of the given parameter values, one row per set."""
+    names = list(values)
+    return pd.DataFrame(list(itertools.product(*values.values())), columns=names)
+
+
+class Backtester:
+    """Evaluate signal functions over a price panel and parameter grids."""
+    
+    def __init__(
+        self,
+        prices,
+        transaction_cost: float = 0.0,
+        risk_free_rate: float = 0.0,
+        periods_per_year: int = 252
+    ):
+        """
+        Prepare the panel.
+        
+        Parameters:
+        -----------
+        prices : pd.DataFrame or pd.Series
+            Close prices, one column per ticker (NaN where a ticker has no data)
+        transaction_cost : float
+            Cost per unit of position traded, as a fraction of the position
+            (0.001 for 10 bps)
+        risk_free_rate : float
+            Annual risk-free rate used for the Sharpe ratio
+        periods_per_year : int
+            Bars per year
+        """
+        if isinstance(prices, pd.Series):
+            prices = prices.to_frame()
+        self.tickers = prices.columns
+        self.prices = prices.to_numpy(dtype=float)
+        self.transaction_cost = transaction_cost
+        self.risk_free_rate = risk_free_rate
+        self.periods_per_year = periods_per_year
+    
+    def run(
+        self,
+        signal: Callable = moving_average_crossover,
+        grid=None,
+        shard_size: Optional[int] = None,
+        max_workers: Optional[int] = None
+    ) -> pd.DataFrame:
+        """
+        Backtest every parameter set on every ticker.
+        
+        Parameters:
+        -----------
+        signal : callable
+            signal(prices, **params) -> positions broadcastable to P x T x N.
+            It must be a module-level function to run on a process pool
+        grid : dict or pd.DataFrame
+            Parameter name -> values (every combination is tested), or one
+            row per parameter set
+        shard_size : int, optional
+            Parameter sets per shard; by default each shard's position
+            array takes about 64 MB
+        max_workers : int, optional
+            Worker processes (defaults to the CPU count); 1 runs in-process
+        
+        Returns:
+        --------
+        pd.DataFrame
+            Return, Volatility, Sharpe and MaxDD indexed by the parameters
+            and the ticker
+        """
+        if grid is None:
+            grid = parameter_grid(fast=[10, 20, 50], slow=[50, 100, 200])
+        elif isinstance(grid, dict):
+            grid = parameter_grid(**grid)
+        grid = grid.reset_index(drop=True)
+        
+        if shard_size is None:
+            shard_size = max(1, int(64e6 // (8 * self.prices.size or 1)))
+        shards = [
+            {name: grid[name].to_numpy()[start:start + shard_size] for name in grid.columns}
+            for start in range(0, len(grid), shard_size)
+        ]
+        settings = (self.transaction_cost, self.risk_free_rate, self.periods_per_year)
+        
+        max_workers = min(max_workers or os.cpu_count() or 1, len(shards))
+        if max_workers > 1:
+            with ProcessPoolExecutor(max_workers, initializer=_init_worker, initargs=(self.prices,)) as executor:
+                futures = [executor.submit(_evaluate_shard, signal, params, *settings) for params in shards]
+                results = [future.result() for future in futures]
+        else:
+            results = [_evaluate(self.prices, signal, params, *settings) for params in shards]
+        
+        metrics = np.concatenate(results, axis=1).reshape(len(METRICS), -1).T
+        n_tickers = len(self.tickers)
+        index = pd.MultiIndex.from_arrays(
+            [np.repeat(grid[name].to_numpy(), n_tickers) for name in grid.columns]
+            + [np.tile(np.asarray(self.tickers), len(grid))],
+            names=list(grid.columns) + ['Ticker']
+        )
+        return pd.DataFrame(metrics, index=index, columns=METRICS)
@@ -1,6 +1,26 @@
+import warnings
+
 import pandas as pd
 import numpy as np
 
+from . import kernels
+from .rolling import RollingEngine
+from .simulation import METHODS as SIMULATION_METHODS, MonteCarloVaR
+from .sketches import TDigest
+
+
+def _as_matrix(prices):
+    # T x N float matrix plus the labels to put back on the results
+    if isinstance(prices, pd.Series):
+        prices = prices.to_frame()
+    if isinstance(prices, pd.DataFrame):
+        return prices.to_numpy(dtype=float), prices.index, prices.columns
+    values = np.asarray(prices, dtype=float)
+    if values.ndim == 1:
+        values = values[:, None]
+    return values, pd.RangeIndex(values.shape[0]), pd.RangeIndex(values.shape[1])
+
+
 class ReturnCalculator:
     @staticmethod
     def simple_returns(prices):
@@ -17,6 +37,41 @@ class ReturnCalculator:
     @staticmethod
     def annualized_return(returns, periods_per_year=252):
         return (1 + returns.mean()) ** periods_per_year - 1
+    
+    @staticmethod
+    def iter_simple_returns(price_chunks):
+        # Returns for prices arriving in consecutive chunks (e.g. monthly
+        # slices); the last price of each chunk seeds the next chunk's first return
+        previous = None
+        for prices in price_chunks:
+            if len(prices) == 0:
+                continue
+            if previous is not None:
+                prices = pd.concat([previous, prices])
+            yield prices.pct_change().dropna()
+            previous = prices.iloc[-1:]
+    
+    @staticmethod
+    def batch_simple_returns(prices):
+        # T x N prices -> (T-1) x N returns in one pass. Each return is taken
+        # against the ticker's last valid price, so on an outer-aligned panel
+        # every ticker gets the same returns as its own series; rows where
+        # its price is missing are NaN
+        values, index, columns = _as_matrix(prices)
+        rows = np.arange(len(values))[:, None]
+        last_valid = np.maximum.accumulate(np.where(np.isnan(values), 0, rows), axis=0)
+        previous = np.take_along_axis(values, last_valid, axis=0)
+        returns = values[1:] / previous[:-1] - 1
+        return pd.DataFrame(returns, index=index[1:], columns=columns)
+    
+    @staticmethod
+    def batch_cumulative_returns(returns):
+        # NaN-aware cumulative returns; NaN before each ticker's first return
+        values, index, columns = _as_matrix(returns)
+        started = np.logical_or.accumulate(~np.isnan(values), axis=0)
+        cumulative = np.nancumprod(1 + values, axis=0) - 1
+        cumulative[~started] = np.nan
+        return pd.DataFrame(cumulative, index=index, columns=columns)
 
 
 class VolatilityCalculator:
@@ -28,6 +83,13 @@ class VolatilityCalculator:
     def rolling_volatility(returns, window=30, periods_per_year=252):
         return returns.rolling(window=window).std() * np.sqrt(periods_per_year)
     
+    @staticmethod
+    def rolling_metrics(returns, windows=(20, 60, 120, 252), metrics=None, risk_free_rate=0.0,
+                        periods_per_year=252, confidence_level=0.05):
+        # Several windows and metrics in one pass, as (metric, window, ticker) columns
+        engine = RollingEngine(returns, windows, risk_free_rate, periods_per_year, confidence_level)
+        return engine.compute(metrics)
+    
     @staticmethod
     def sharpe_ratio(returns, risk_free_rate=0.0, periods_per_year=252):
         excess_returns = returns - (risk_free_rate / periods_per_year)
@@ -35,16 +97,92 @@ class VolatilityCalculator:
     
     @staticmethod
     def max_drawdown(returns):
-        cumulative = (1 + returns).cumprod()
-        running_max = cumulative.expanding().max()
-        drawdown = (cumulative - running_max) / running_max
-        return drawdown.min()
+        # Single pass over the returns in kernels (numba when available)
+        if isinstance(returns, pd.DataFrame):
+            return pd.Series(kernels.max_drawdown(returns.to_numpy(dtype=float)), index=returns.columns)
+        return kernels.max_drawdown(np.asarray(returns, dtype=float))[0]
+    
+    @staticmethod
+    def drawdown(returns):
+        # Decline of (1 + returns).cumprod() from its running peak at each date
+        growth = (1 + returns).cumprod()
+        peak = growth.cummax()
+        return (growth - peak) / peak
     
     @staticmethod
-    def var(returns, confidence_level=0.05):
+    def var(returns, confidence_level=0.05, method='exact'):
+        # method='sketch' (or passing a TDigest) estimates the quantile from a
+        # bounded-size t-digest instead of sorting the full history;
+        # 'parametric', 'filtered' and 'bootstrap' simulate one-bar returns
+        # with MonteCarloVaR (use it directly for portfolios and horizons)
+        if isinstance(returns, TDigest):
+            return returns.quantile(confidence_level)
+        if method == 'sketch':
+            return _per_column(returns, lambda digest: digest.quantile(confidence_level))
+        if method in SIMULATION_METHODS:
+            return _simulated(returns, confidence_level, method, 'var')
         return returns.quantile(confidence_level)
     
     @staticmethod
-    def cvar(returns, confidence_level=0.05):
+    def cvar(returns, confidence_level=0.05, method='exact'):
+        if isinstance(returns, TDigest):
+            return returns.tail_mean(confidence_level)
+        if method == 'sketch':
+            return _per_column(returns, lambda digest: digest.tail_mean(confidence_level))
+        if method in SIMULATION_METHODS:
+            return _simulated(returns, confidence_level, method, 'cvar')
         var_value = VolatilityCalculator.var(returns, confidence_level)
-        return returns[returns <= var_value].mean()
+        if isinstance(returns, pd.DataFrame):
+            tail = kernels.tail_mean(returns.to_numpy(dtype=float), var_value.to_numpy(dtype=float))
+            return pd.Series(tail, index=returns.columns)
+        return kernels.tail_mean(np.asarray(returns, dtype=float), var_value)[0]
+    
+    @staticmethod
+    def batch_metrics(prices, risk_free_rate=0.0, periods_per_year=252, cumulative=False):
+        # Return, Volatility, Sharpe and MaxDD for every column of a T x N price
+        # matrix, vectorized across tickers and matching the per-ticker methods
+        # on each column's own (non-missing) returns. With cumulative=True the
+        # cumulative returns used for MaxDD are returned as well.
+        returns = ReturnCalculator.batch_simple_returns(prices)
+        cum_returns = ReturnCalculator.batch_cumulative_returns(returns)
+        values = returns.to_numpy()
+        
+        with warnings.catch_warnings():
+            # Tickers without enough data get NaN metrics
+            warnings.simplefilter('ignore', RuntimeWarning)
+            mean = np.nanmean(values, axis=0)
+            std = np.nanstd(values, axis=0, ddof=1)
+            
+            growth = cum_returns.to_numpy() + 1
+            running_max = np.fmax.accumulate(growth, axis=0)
+            max_drawdown = np.nanmin((growth - running_max) / running_max, axis=0)
+        
+        metrics = pd.DataFrame({
+            'Return': (1 + mean) ** periods_per_year - 1,
+            'Volatility': std * np.sqrt(periods_per_year),
+            'Sharpe': np.sqrt(periods_per_year) * (mean - risk_free_rate / periods_per_year) / std,
+            'MaxDD': max_drawdown,
+        }, index=returns.columns)
+        
+        if cumulative:
+            return metrics, cum_returns
+        return metrics
+
+
+def _per_column(returns, estimate):
+    # Sketch-based estimate for a Series, or for each column of a DataFrame
+    if isinstance(returns, pd.DataFrame):
+        return pd.Series({column: estimate(TDigest().update(returns[column])) for column in returns.columns})
+    return estimate(TDigest().update(returns))
+
+
+def _simulated(returns, confidence_level, method, statistic):
+    # Simulated VaR/CVaR per column; the fixed seed makes var and cvar
+    # calls on the same data see the same paths
+    def estimate(column):
+        model = MonteCarloVaR(column, method=method, confidence_level=confidence_level)
+        return getattr(model.simulate(n_paths=100_000, max_workers=1, seed=0), statistic)
+    
+    if isinstance(returns, pd.DataFrame):
+        return pd.Series({column: estimate(returns[column]) for column in returns.columns})
+    return estimate(returns)
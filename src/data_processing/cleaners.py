@@ -1,5 +1,6 @@
-import pandas as pd
-import numpy as np
+from .alignment import FrameAligner
+from .outliers import OutlierDetector
+from .resampling import resample_ohlcv
 
 class DataCleaner:
     @staticmethod
@@ -23,52 +24,26 @@ class DataCleaner:
         return df
     
     @staticmethod
-    def remove_outliers(df, method='iqr', threshold=3.0, columns=None):
-        df = df.copy()
-        
-        if columns is None:
-            columns = df.select_dtypes(include=[np.number]).columns.tolist()
-        
-        mask = pd.Series([True] * len(df))
-        
-        for col in columns:
-            if method == 'iqr':
-                Q1 = df[col].quantile(0.25)
-                Q3 = df[col].quantile(0.75)
-                IQR = Q3 - Q1
-                lower = Q1 - threshold * IQR
-                upper = Q3 + threshold * IQR
-                col_mask = (df[col] >= lower) & (df[col] <= upper)
-            elif method == 'zscore':
-                z_scores = np.abs((df[col] - df[col].mean()) / df[col].std())
-                col_mask = z_scores < threshold
-            else:
-                col_mask = pd.Series([True] * len(df))
-            
-            mask = mask & col_mask
-        
-        return df[mask]
+    def remove_outliers(df, method='iqr', threshold=3.0, columns=None, action='drop', window=21):
+        # All columns in one pass via OutlierDetector; method can also be
+        # 'mad', 'rolling_mad' or 'hampel', and action 'flag' or 'clip'.
+        # Missing values are left for remove_missing_values
+        return OutlierDetector(method, threshold, window).clean(df, action, columns)
     
     @staticmethod
-    def align_dataframes(dfs, method='inner'):
+    def align_dataframes(dfs, method='inner', calendar=None, asof=None):
+        # One k-way merge of the indices; numeric frames come back as column
+        # slices of one panel instead of reindexed copies. method can also be
+        # 'calendar' (every trading session in range), calendar restricts the
+        # index to trading sessions, and asof flags lower-frequency frames
+        # that are carried forward instead of matched exactly. Numeric frames
+        # come back as float64 (integer columns included, so missing rows
+        # can be NaN); Series come back as Series
         if len(dfs) < 2:
             return dfs
         
-        indices = [df.index for df in dfs]
-        
-        if method == 'inner':
-            common_index = indices[0]
-            for idx in indices[1:]:
-                common_index = common_index.intersection(idx)
-        elif method == 'outer':
-            common_index = indices[0]
-            for idx in indices[1:]:
-                common_index = common_index.union(idx)
-        else:
-            common_index = indices[0]
-        
-        aligned = [df.reindex(common_index) for df in dfs]
-        return aligned
+        how = method if method in ('inner', 'outer', 'calendar') else 'left'
+        return FrameAligner(how, calendar).align(dfs, asof)
     
     @staticmethod
     def resample_data(df, freq, method='last'):
@@ -80,5 +55,10 @@ class DataCleaner:
             return df.resample(freq).mean()
         elif method == 'sum':
             return df.resample(freq).sum()
+        elif method == 'ohlcv':
+            # open=first, high=max, low=min, close=last, volume=sum in one
+            # pass; bars are labeled with their period start and periods
+            # without bars are left out
+            return resample_ohlcv(df, freq)
         else:
             return df
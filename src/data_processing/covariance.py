@@ -0,0 +1,202 @@
+"""
+Covariance and correlation estimates for large universes.
+
+EWMACovariance keeps an exponentially weighted covariance matrix that is
+updated per bar (or per batch of bars) in place, one block of rows at a time,
+so refreshing a 5,000 x 5,000 matrix never allocates a second N x N array.
+In float32 mode such a matrix takes 100 MB instead of 200 MB. Missing
+returns are skipped pair by pair: each entry is normalized by the weights of
+the bars on which both assets have a return, which takes a second N x N
+matrix once the first missing return arrives.
+
+shrunk_covariance wraps scikit-learn's Ledoit-Wolf and OAS estimators for
+well-conditioned sample covariances when N is large relative to T.
+"""
+
+from typing import Iterable, Union
+
+import numpy as np
+import pandas as pd
+
+SHRINKAGE_METHODS = ['ledoit_wolf', 'oas']
+
+
+class EWMACovariance:
+    """Incrementally updated EWMA covariance (zero-mean, RiskMetrics style)."""
+    
+    def __init__(
+        self,
+        symbols: Union[int, Iterable[str]],
+        decay: float = 0.94,
+        dtype: str = 'float64',
+        block_size: int = 512
+    ):
+        """
+        Initialize an empty estimate.
+        
+        Parameters:
+        -----------
+        symbols : int or list of str
+            Number of assets, or their names
+        decay : float
+            Weight kept by the old estimate on each bar (0.94 for daily data)
+        dtype : str
+            'float64' or 'float32'; float32 halves memory for large universes
+        block_size : int
+            Rows of the matrix updated at a time; bounds temporary memory to
+            block_size x N
+        """
+        self.symbols = list(range(symbols)) if isinstance(symbols, int) else list(symbols)
+        self.decay = decay
+        self.dtype = np.dtype(dtype)
+        self.block_size = block_size
+        
+        n = len(self.symbols)
+        self.matrix = np.zeros((n, n), dtype=self.dtype)
+        # Total weight of the bars behind each entry; until a return is
+        # missing every entry has 1 - decay^count and this stays None
+        self.pair_weights = None
+        self.count = 0
+    
+    def _as_matrix(self, returns) -> np.ndarray:
+        if isinstance(returns, pd.Series):
+            returns = returns.reindex(self.symbols).to_frame().T
+        elif isinstance(returns, pd.DataFrame):
+            returns = returns.reindex(columns=self.symbols)
+        values = np.asarray(returns, dtype=self.dtype)
+        if values.ndim == 1:
+            values = values[None, :]
+        return values
+    
+    def update(self, returns) -> 'EWMACovariance':
+        """
+        Fold in one bar (a vector of N returns) or a T x N batch of bars.
+        
+        A batch is folded in with one weighted matrix product per block of
+        rows, equivalent to updating bar by bar. A missing return (NaN)
+        leaves every pair involving that asset out of the bar.
+        """
+        values = self._as_matrix(returns)
+        bars = len(values)
+        if bars == 0:
+            return self
+        
+        valid = ~np.isnan(values)
+        if not valid.all():
+            values = np.where(valid, values, 0)
+            if self.pair_weights is None:
+                self.pair_weights = np.full(self.matrix.shape, 1 - self.decay ** self.count, dtype=self.dtype)
+        
+        # Bar t of the batch ends up with weight (1 - decay) * decay^(bars - 1 - t)
+        weights = ((1 - self.decay) * self.decay ** np.arange(bars - 1, -1, -1)).astype(self.dtype)[:, None]
+        weighted = values * weights
+        
+        self.matrix *= self.dtype.type(self.decay ** bars)
+        if self.pair_weights is not None:
+            self.pair_weights *= self.dtype.type(self.decay ** bars)
+        for start in range(0, len(self.symbols), self.block_size):
+            rows = slice(start, start + self.block_size)
+            self.matrix[rows] += weighted[:, rows].T @ values
+            if self.pair_weights is not None:
+                self.pair_weights[rows] += (valid[:, rows] * weights).T @ valid.astype(self.dtype)
+        self.count += bars
+        return self
+    
+    def _block(self, rows: slice) -> np.ndarray:
+        # Covariance rows up to a common factor, which correlation cancels
+        if self.pair_weights is None:
+            return self.matrix[rows]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return self.matrix[rows] / self.pair_weights[rows]
+    
+    def covariance(self, as_frame: bool = True):
+        """
+        Current covariance estimate.
+        
+        Early on the weights sum to less than one; the estimate is divided by
+        1 - decay^count (or, with missing returns, by the weights of the bars
+        each pair was observed on) so it is not biased towards zero. Pairs
+        never observed together are NaN.
+        """
+        if self.count == 0:
+            matrix = np.full(self.matrix.shape, np.nan, dtype=self.dtype)
+        elif self.pair_weights is None:
+            matrix = self.matrix / self.dtype.type(1 - self.decay ** self.count)
+        else:
+            matrix = self._block(slice(None))
+        if as_frame:
+            return pd.DataFrame(matrix, index=self.symbols, columns=self.symbols)
+        return matrix
+    
+    def correlation(self, as_frame: bool = True):
+        """Current correlation estimate, computed block-wise from the covariance."""
+        with np.errstate(invalid='ignore', divide='ignore'):
+            variance = np.diag(self.matrix)
+            if self.pair_weights is not None:
+                variance = variance / np.diag(self.pair_weights)
+            scale = 1 / np.sqrt(variance)
+        matrix = np.empty_like(self.matrix)
+        for start in range(0, len(self.symbols), self.block_size):
+            rows = slice(start, start + self.block_size)
+            np.multiply(self._block(rows), scale[rows, None] * scale[None, :], out=matrix[rows])
+        np.fill_diagonal(matrix, np.where(np.isfinite(scale), 1.0, np.nan))
+        if as_frame:
+            return pd.DataFrame(matrix, index=self.symbols, columns=self.symbols)
+        return matrix
+    
+    def volatility(self, periods_per_year: int = 252) -> pd.Series:
+        """Annualized EWMA volatility per asset."""
+        variance = np.diag(self.covariance(as_frame=False))
+        return pd.Series(np.sqrt(variance * periods_per_year), index=self.symbols)
+
+
+def ewma_covariance(returns: pd.DataFrame, decay: float = 0.94, dtype: str = 'float64') -> pd.DataFrame:
+    """EWMA covariance of a T x N return frame."""
+    return EWMACovariance(returns.columns, decay=decay, dtype=dtype).update(returns).covariance()
+
+
+def shrunk_covariance(
+    returns: pd.DataFrame,
+    method: str = 'ledoit_wolf',
+    dtype: str = 'float64',
+    block_size: int = 1000
+) -> pd.DataFrame:
+    """
+    Shrinkage covariance estimate of a T x N return frame.
+    
+    Parameters:
+    -----------
+    returns : pd.DataFrame
+        Returns; dates with any missing value are dropped
+    method : str
+        'ledoit_wolf' or 'oas'
+    dtype : str
+        'float64' or 'float32'
+    block_size : int
+        Block size for Ledoit-Wolf, which bounds its memory use
+    
+    Returns:
+    --------
+    pd.DataFrame
+        N x N covariance matrix
+    """
+    # Imported here so loading this module stays cheap
+    try:
+        from sklearn import covariance as sk_covariance
+    except ImportError:
+        raise ImportError("scikit-learn is required for shrinkage estimators. Run: pip install scikit-learn")
+    if method not in SHRINKAGE_METHODS:
+        raise ValueError(f"Method {method} not supported. Available: {SHRINKAGE_METHODS}")
+    
+    values = returns.dropna().to_numpy(dtype=dtype)
+    if method == 'ledoit_wolf':
+        matrix, _ = sk_covariance.ledoit_wolf(values, block_size=block_size)
+    else:
+        matrix = sk_covariance.OAS().fit(values).covariance_
+    return pd.DataFrame(matrix.astype(dtype, copy=False), index=returns.columns, columns=returns.columns)
+
+
+def correlation_from_covariance(covariance: pd.DataFrame) -> pd.DataFrame:
+    """Convert a covariance matrix to a correlation matrix."""
+    scale = 1 / np.sqrt(np.diag(covariance.to_numpy()))
+    return covariance * np.outer(scale, scale)
@@ -0,0 +1,346 @@
+"""
+Technical indicators computed locally from OHLCV bars.
+
+IndicatorEngine computes one indicator for every symbol of a T x N panel at
+once and keeps the state needed to extend it: the last few bars for windowed
+statistics and the last value of every exponential average. Passing only the
+new bars to update() continues the series exactly where it stopped:
+
+    engine = IndicatorEngine('RSI', time_period=14)
+    history = engine.update(bars)        # full history
+    latest = engine.update(new_bars)     # only the new rows
+
+Definitions follow TA-Lib, which Alpha Vantage uses, and outputs keep Alpha
+Vantage's column names. Exponential averages are seeded with the simple
+average of their first `period` values, RSI and ATR use Wilder smoothing,
+and Bollinger bands use the population standard deviation. A missing bar
+after a symbol's first price carries the previous price forward.
+"""
+
+from typing import Callable, Dict
+
+import numpy as np
+import pandas as pd
+from scipy.signal import lfilter
+
+FIELDS = ['open', 'high', 'low', 'close', 'volume']
+
+
+# --- Stateful building blocks ------------------------------------------------
+# Each takes a T x N array and returns a T x N array, carrying over whatever
+# the next batch needs. NaN marks values that do not exist yet.
+
+class _Window:
+    # Rolling mean/std/min/max; keeps the last window - 1 rows
+    def __init__(self, window: int, statistic: str):
+        self.window = window
+        self.statistic = statistic
+        self.tail = None
+    
+    def __call__(self, values: np.ndarray) -> np.ndarray:
+        data = values if self.tail is None else np.vstack([self.tail, values])
+        rolling = pd.DataFrame(data).rolling(self.window)
+        if self.statistic == 'std':
+            result = rolling.std(ddof=0)
+        else:
+            result = getattr(rolling, self.statistic)()
+        self.tail = data[max(len(data) - self.window + 1, 0):]
+        return result.to_numpy()[len(data) - len(values):]
+
+
+class _Ema:
+    # Exponential average seeded with the mean of the first `period` values
+    def __init__(self, period: int, alpha: float = None):
+        self.period = period
+        self.alpha = alpha if alpha is not None else 2.0 / (period + 1)
+        self.value = None
+        self.seed_total = None
+        self.seed_count = None
+    
+    def __call__(self, values: np.ndarray) -> np.ndarray:
+        bars, n = values.shape
+        if self.value is None:
+            self.value = np.full(n, np.nan)
+            self.seed_total = np.zeros(n)
+            self.seed_count = np.zeros(n, dtype=np.int64)
+        if bars == 0:
+            return values.copy()
+        
+        valid = ~np.isnan(values)
+        count = self.seed_count + np.cumsum(valid, axis=0)
+        total = self.seed_total + np.nancumsum(values, axis=0)
+        seeded = ~np.isnan(self.value)
+        
+        # Row where each unseeded column collects its period-th value
+        reached = (count >= self.period) & ~seeded
+        seeds = reached.any(axis=0)
+        seed_row = np.where(seeds, reached.argmax(axis=0), bars)
+        rows = np.arange(bars)[:, None]
+        started = seeded | (rows >= seed_row)
+        
+        # Zero input before the seed, and an input at the seed row that makes
+        # the recursion output the seed; seeded columns continue from their
+        # last value through the filter's initial state
+        drive = np.where(started, values, 0.0)
+        columns = np.nonzero(seeds)[0]
+        drive[seed_row[columns], columns] = total[seed_row[columns], columns] / self.period / self.alpha
+        initial = (1 - self.alpha) * np.where(seeded, self.value, 0.0)
+        result, _ = lfilter([self.alpha], [1.0, self.alpha - 1.0], drive, axis=0, zi=initial[None, :])
+        result[~started] = np.nan
+        
+        self.value = result[-1]
+        self.seed_total = np.where(started[-1], 0.0, total[-1])
+        self.seed_count = np.where(started[-1], 0, count[-1])
+        return result
+
+
+class _Lag:
+    # Previous row's values
+    def __init__(self):
+        self.last = None
+    
+    def __call__(self, values: np.ndarray) -> np.ndarray:
+        first = np.full((1, values.shape[1]), np.nan) if self.last is None else self.last
+        data = np.vstack([first, values])
+        self.last = data[-1:]
+        return data[:-1]
+
+
+class _Sum:
+    # Running sum that ignores NaN
+    def __init__(self):
+        self.total = None
+    
+    def __call__(self, values: np.ndarray) -> np.ndarray:
+        if self.total is None:
+            self.total = np.zeros(values.shape[1])
+        result = self.total + np.nancumsum(values, axis=0)
+        if len(result):
+            self.total = result[-1]
+        return result
+
+
+# --- Indicators ----------------------------------------------------------------
+# Each builder takes Alpha Vantage's parameter names and returns a step
+# function mapping a dict of fields to a dict of named outputs
+
+def _check_matype(matype):
+    if matype not in (None, 0):
+        raise ValueError("Only simple moving averages (matype=0) are computed locally; use source='api'")
+
+
+def _sma(time_period: int = 20, series_type: str = 'close'):
+    mean = _Window(time_period, 'mean')
+    return lambda fields: {'SMA': mean(fields[series_type])}
+
+
+def _ema(time_period: int = 20, series_type: str = 'close'):
+    average = _Ema(time_period)
+    return lambda fields: {'EMA': average(fields[series_type])}
+
+
+def _rsi(time_period: int = 20, series_type: str = 'close'):
+    previous = _Lag()
+    gains = _Ema(time_period, alpha=1.0 / time_period)
+    losses = _Ema(time_period, alpha=1.0 / time_period)
+    
+    def step(fields):
+        change = fields[series_type] - previous(fields[series_type])
+        up = gains(np.maximum(change, 0.0))
+        down = losses(np.maximum(-change, 0.0))
+        with np.errstate(invalid='ignore', divide='ignore'):
+            rsi = np.where(up + down > 0, 100 * up / (up + down), np.where(np.isnan(up + down), np.nan, 0.0))
+        return {'RSI': rsi}
+    return step
+
+
+def _macd(series_type: str = 'close', fastperiod: int = None, slowperiod: int = None, signalperiod: int = None):
+    fast = _Ema(fastperiod or 12)
+    slow = _Ema(slowperiod or 26)
+    signal = _Ema(signalperiod or 9)
+    
+    def step(fields):
+        line = fast(fields[series_type]) - slow(fields[series_type])
+        average = signal(line)
+        return {'MACD': line, 'MACD_Hist': line - average, 'MACD_Signal': average}
+    return step
+
+
+def _bbands(time_period: int = 20, series_type: str = 'close', nbdevup: float = None, nbdevdn: float = None,
+            matype: int = None):
+    _check_matype(matype)
+    mean = _Window(time_period, 'mean')
+    std = _Window(time_period, 'std')
+    
+    def step(fields):
+        middle = mean(fields[series_type])
+        spread = std(fields[series_type])
+        return {
+            'Real Upper Band': middle + (2 if nbdevup is None else nbdevup) * spread,
+            'Real Middle Band': middle,
+            'Real Lower Band': middle - (2 if nbdevdn is None else nbdevdn) * spread,
+        }
+    return step
+
+
+def _stoch(fastkperiod: int = None, slowkperiod: int = None, slowdperiod: int = None,
+           slowkmatype: int = None, slowdmatype: int = None):
+    _check_matype(slowkmatype)
+    _check_matype(slowdmatype)
+    lowest = _Window(fastkperiod or 5, 'min')
+    highest = _Window(fastkperiod or 5, 'max')
+    slow_k = _Window(slowkperiod or 3, 'mean')
+    slow_d = _Window(slowdperiod or 3, 'mean')
+    
+    def step(fields):
+        low = lowest(fields['low'])
+        span = highest(fields['high']) - low
+        with np.errstate(invalid='ignore', divide='ignore'):
+            fast_k = np.where(span > 0, 100 * (fields['close'] - low) / span, np.where(np.isnan(span), np.nan, 0.0))
+        k = slow_k(fast_k)
+        return {'SlowK': k, 'SlowD': slow_d(k)}
+    return step
+
+
+def _atr(time_period: int = 20):
+    previous = _Lag()
+    average = _Ema(time_period, alpha=1.0 / time_period)
+    
+    def step(fields):
+        close = previous(fields['close'])
+        true_range = np.maximum(
+            fields['high'] - fields['low'],
+            np.maximum(np.abs(fields['high'] - close), np.abs(fields['low'] - close))
+        )
+        return {'ATR': average(true_range)}
+    return step
+
+
+def _obv():
+    previous = _Lag()
+    running = _Sum()
+    
+    def step(fields):
+        close = fields['close']
+        before = previous(close)
+        # A symbol's first bar adds its whole volume
+        flow = np.where(np.isnan(before), 1.0, np.sign(close - before)) * fields['volume']
+        result = running(flow)
+        result[np.isnan(close)] = np.nan
+        return {'OBV': result}
+    return step
+
+
+_BUILDERS: Dict[str, Callable] = {
+    'SMA': _sma,
+    'EMA': _ema,
+    'RSI': _rsi,
+    'MACD': _macd,
+    'BBANDS': _bbands,
+    'STOCH': _stoch,
+    'ATR': _atr,
+    'OBV': _obv,
+}
+INDICATORS = list(_BUILDERS)
+
+
+class _Fields(dict):
+    def __init__(self, indicator, fields):
+        super().__init__(fields)
+        self.indicator = indicator
+    
+    def __missing__(self, field):
+        raise ValueError(f"{self.indicator} needs '{field}' prices, which the bars do not have")
+
+
+def _split(bars):
+    # (field -> T x N array, index, symbols, single symbol?) for a close
+    # Series, a single-symbol OHLCV frame, a T x N close panel, or a frame
+    # with (field, symbol) columns
+    if isinstance(bars, pd.Series):
+        return {'close': bars.to_numpy(dtype=float)[:, None]}, bars.index, [bars.name], True
+    
+    if isinstance(bars.columns, pd.MultiIndex):
+        symbols = list(bars.columns.get_level_values(1).unique())
+        fields = {
+            str(field).lower(): bars[field].reindex(columns=symbols).to_numpy(dtype=float)
+            for field in bars.columns.get_level_values(0).unique()
+        }
+        return fields, bars.index, symbols, False
+    
+    names = {str(column).lower(): column for column in bars.columns}
+    if set(names) & set(FIELDS):
+        fields = {field: bars[names[field]].to_numpy(dtype=float)[:, None] for field in FIELDS if field in names}
+        return fields, bars.index, [None], True
+    return {'close': bars.to_numpy(dtype=float)}, bars.index, list(bars.columns), False
+
+
+class IndicatorEngine:
+    """One technical indicator over N symbols, extended as new bars arrive."""
+    
+    def __init__(self, indicator: str, **params):
+        """
+        Prepare an indicator.
+        
+        Parameters:
+        -----------
+        indicator : str
+            'SMA', 'EMA', 'RSI', 'MACD', 'BBANDS', 'STOCH', 'ATR' or 'OBV'
+        **params
+            Alpha Vantage parameter names, e.g. time_period, series_type,
+            fastperiod/slowperiod/signalperiod, nbdevup/nbdevdn or
+            fastkperiod/slowkperiod/slowdperiod
+        """
+        if indicator not in _BUILDERS:
+            raise ValueError(f"Indicator {indicator} not supported. Available: {INDICATORS}")
+        
+        self.indicator = indicator
+        self.params = params
+        self.symbols = None
+        self._step = _BUILDERS[indicator](**params)
+        self._last = {}
+    
+    def update(self, bars) -> pd.DataFrame:
+        """
+        Compute the indicator for new bars, continuing from earlier updates.
+        
+        Parameters:
+        -----------
+        bars : pd.Series or pd.DataFrame
+            Close prices (Series, or a T x N frame of symbols), OHLCV columns
+            for one symbol, or a frame with (field, symbol) columns. Every
+            update must cover the same symbols
+        
+        Returns:
+        --------
+        pd.DataFrame
+            Indicator values for the new bars; columns are the Alpha Vantage
+            names, or (name, symbol) pairs for several symbols
+        """
+        fields, index, symbols, single = _split(bars)
+        if self.symbols is None:
+            self.symbols = symbols
+        elif symbols != self.symbols:
+            raise ValueError(f"Bars cover {symbols}, but this engine was started with {self.symbols}")
+        
+        for field, values in fields.items():
+            # Carry each symbol's last known price across missing bars
+            last = self._last.get(field)
+            data = values if last is None else np.vstack([last, values])
+            data = pd.DataFrame(data).ffill().to_numpy()
+            if len(data):
+                self._last[field] = data[-1:]
+            fields[field] = data[len(data) - len(values):]
+        
+        outputs = self._step(_Fields(self.indicator, fields))
+        if single:
+            return pd.DataFrame({name: values[:, 0] for name, values in outputs.items()}, index=index)
+        return pd.concat(
+            {name: pd.DataFrame(values, index=index, columns=symbols) for name, values in outputs.items()},
+            axis=1
+        )
+
+
+def compute_indicator(bars, indicator: str, **params) -> pd.DataFrame:
+    """Compute an indicator over the full history of `bars` (see IndicatorEngine.update)."""
+    return IndicatorEngine(indicator, **params).update(bars)
@@ -0,0 +1,188 @@
+"""
+Numerical kernels behind the calculators.
+
+Each kernel has a pure-NumPy implementation and, when numba is installed, a
+compiled single-pass loop with the same semantics. The backend is chosen at
+runtime:
+
+    from src.data_processing import kernels
+    kernels.set_backend('numba')   # or 'numpy', or 'auto' (default)
+
+The MARKETANALYZER_KERNELS environment variable sets the initial backend.
+Kernels take T x N float arrays, skip NaN the way the pandas code they
+replace does, and return one value per column.
+"""
+
+import os
+from typing import Dict
+
+import numpy as np
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+BACKENDS = ['numpy', 'numba']
+
+
+# --- NumPy implementations ---------------------------------------------------
+
+def _max_drawdown_numpy(returns):
+    valid = ~np.isnan(returns)
+    growth = np.cumprod(np.where(valid, 1 + returns, 1.0), axis=0)
+    # Peaks only count from each column's first valid return
+    started = np.logical_or.accumulate(valid, axis=0)
+    peak = np.maximum.accumulate(np.where(started, growth, -np.inf), axis=0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        drawdown = np.where(valid, (growth - peak) / peak, np.inf)
+    result = drawdown.min(axis=0) if len(returns) else np.full(returns.shape[1], np.inf)
+    return np.where(np.isinf(result), np.nan, result)
+
+
+def _tail_mean_numpy(values, thresholds):
+    inside = values <= thresholds
+    count = inside.sum(axis=0)
+    total = np.where(inside, values, 0.0).sum(axis=0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(count > 0, total / count, np.nan)
+
+
+# --- numba implementations ---------------------------------------------------
+# Plain loops, compiled on first use; every kernel is one pass over the data
+
+def _max_drawdown_loop(returns):
+    rows, columns = returns.shape
+    result = np.full(columns, np.nan)
+    for j in range(columns):
+        growth = 1.0
+        peak = -np.inf
+        worst = np.inf
+        for i in range(rows):
+            r = returns[i, j]
+            if np.isnan(r):
+                continue
+            growth *= 1 + r
+            if growth > peak:
+                peak = growth
+            drawdown = (growth - peak) / peak
+            if drawdown < worst:
+                worst = drawdown
+        if worst != np.inf:
+            result[j] = worst
+    return result
+
+
+def _tail_mean_loop(values, thresholds):
+    rows, columns = values.shape
+    result = np.full(columns, np.nan)
+    for j in range(columns):
+        total = 0.0
+        count = 0
+        for i in range(rows):
+            if values[i, j] <= thresholds[j]:
+                total += values[i, j]
+                count += 1
+        if count > 0:
+            result[j] = total / count
+    return result
+
+
+_NUMPY = {
+    'max_drawdown': _max_drawdown_numpy,
+    'tail_mean': _tail_mean_numpy,
+}
+_LOOPS = {
+    'max_drawdown': _max_drawdown_loop,
+    'tail_mean': _tail_mean_loop,
+}
+_compiled = {}
+_backend = None
+
+
+def _kernel(name):
+    if get_backend() == 'numpy':
+        return _NUMPY[name]
+    if name not in _compiled:
+        _compiled[name] = numba.njit(cache=True, nogil=True)(_LOOPS[name])
+    return _compiled[name]
+
+
+def set_backend(backend: str = 'auto'):
+    """
+    Select the kernel backend.
+    
+    Parameters:
+    -----------
+    backend : str
+        'numpy', 'numba', or 'auto' (numba when installed, NumPy otherwise)
+    """
+    global _backend
+    if backend == 'auto':
+        backend = 'numba' if numba is not None else 'numpy'
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown backend {backend}. Available: {BACKENDS + ['auto']}")
+    if backend == 'numba' and numba is None:
+        raise ImportError("numba is required for the numba backend. Run: pip install numba")
+    _backend = backend
+
+
+def get_backend() -> str:
+    """Return the active backend name."""
+    if _backend is None:
+        set_backend(os.environ.get('MARKETANALYZER_KERNELS', 'auto'))
+    return _backend
+
+
+def _as_2d(values) -> np.ndarray:
+    values = np.ascontiguousarray(values, dtype=np.float64)
+    return values[:, None] if values.ndim == 1 else values
+
+
+def max_drawdown(returns) -> np.ndarray:
+    """Worst peak-to-trough decline of (1 + returns).cumprod() per column; NaN returns are skipped."""
+    return _kernel('max_drawdown')(_as_2d(returns))
+
+
+def tail_mean(values, thresholds) -> np.ndarray:
+    """Mean of each column's values <= its threshold (NaN never counts)."""
+    values = _as_2d(values)
+    thresholds = np.broadcast_to(np.asarray(thresholds, dtype=np.float64), (values.shape[1],)).copy()
+    return _kernel('tail_mean')(values, thresholds)
+
+
+def check_parity(size: int = 100_000, columns: int = 4, seed: int = 0) -> Dict[str, bool]:
+    """
+    Run every kernel on both backends with random data and compare results.
+    
+    Returns:
+    --------
+    dict
+        Kernel name -> True when both backends agree (NaN positions included).
+        Empty when numba is not installed
+    """
+    if numba is None:
+        return {}
+    
+    rng = np.random.default_rng(seed)
+    values = rng.normal(0, 0.02, (size, columns))
+    values[rng.random(values.shape) < 0.01] = np.nan
+    thresholds = np.nanquantile(values, 0.05, axis=0)
+    cases = {
+        'max_drawdown': (values,),
+        'tail_mean': (values, thresholds),
+    }
+    
+    previous = get_backend()
+    results = {}
+    try:
+        outputs = {}
+        for backend in BACKENDS:
+            set_backend(backend)
+            outputs[backend] = {name: _kernel(name)(*args) for name, args in cases.items()}
+        for name in cases:
+            expected, actual = outputs['numpy'][name], outputs['numba'][name]
+            results[name] = bool(np.allclose(expected, actual, rtol=1e-12, atol=0, equal_nan=True))
+    finally:
+        set_backend(previous)
+    return results
@@ -0,0 +1,210 @@
+"""
+Memoization of calculator results keyed on the content of their inputs.
+
+MemoizedCalculator wraps a calculator (ReturnCalculator, VolatilityCalculator)
+and serves repeated calls from a ResultCache:
+
+    calc = MemoizedCalculator(VolatilityCalculator())
+    calc.sharpe_ratio(returns, 0.02)    # computed
+    calc.sharpe_ratio(returns, 0.02)    # served from the cache
+
+The key is the method name plus a fingerprint of every argument, bound to
+the method's signature with defaults filled in, so positional, keyword and
+omitted default spellings of a call share one entry. Arrays, Series and
+DataFrames are fingerprinted by hashing their data buffer (blake2b)
+together with their dtype, shape, labels and index bounds, so an equal copy
+of the same data hits the cache while a changed price or a new bar misses
+it. The cache evicts least recently used results once their total
+size passes a byte budget.
+
+Callers get their own copy of DataFrame, Series and array results (cheap
+under pandas copy-on-write), so modifying one leaves the cache intact.
+"""
+
+import hashlib
+import inspect
+import sys
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+import numpy as np
+import pandas as pd
+
+
+def _update_array(digest, values):
+    values = np.asarray(values)
+    if values.dtype == object:
+        # Object arrays hold pointers; hash the values instead
+        values = pd.util.hash_array(values.ravel())
+    digest.update(f"{values.dtype.str}{values.shape}".encode())
+    digest.update(np.ascontiguousarray(values).data)
+
+
+def _update_index(digest, index: pd.Index):
+    # Length and first/last labels; cheaper than hashing every label
+    bounds = (len(index), index[0], index[-1]) if len(index) else (0,)
+    digest.update(repr(bounds).encode())
+
+
+def fingerprint(value: Any) -> str:
+    """
+    Content fingerprint of a calculator argument.
+    
+    Arrays, Series and DataFrames hash their data buffer, dtype, shape,
+    name/columns and index bounds; lists, tuples and dicts are fingerprinted
+    element-wise; anything else by repr.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    _update(digest, value)
+    return digest.hexdigest()
+
+
+def _update(digest, value: Any):
+    digest.update(type(value).__name__.encode())
+    if isinstance(value, pd.DataFrame):
+        digest.update(repr(list(value.columns)).encode())
+        _update_index(digest, value.index)
+        for column in range(value.shape[1]):
+            _update_array(digest, value.iloc[:, column].to_numpy())
+    elif isinstance(value, pd.Series):
+        digest.update(repr(value.name).encode())
+        _update_index(digest, value.index)
+        _update_array(digest, value.to_numpy())
+    elif isinstance(value, np.ndarray):
+        _update_array(digest, value)
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            _update(digest, item)
+    elif isinstance(value, dict):
+        for key in sorted(value, key=repr):
+            digest.update(repr(key).encode())
+            _update(digest, value[key])
+    else:
+        digest.update(repr(value).encode())
+
+
+def _nbytes(value: Any) -> int:
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        usage = value.memory_usage(deep=True)
+        return int(usage.sum() if isinstance(usage, pd.Series) else usage)
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, (list, tuple)):
+        return sum(_nbytes(item) for item in value)
+    return sys.getsizeof(value)
+
+
+class ResultCache:
+    """Thread-safe LRU cache bounded by the total size of its results."""
+    
+    def __init__(self, max_bytes: int = 256 * 1024 * 1024):
+        """
+        Initialize the cache.
+        
+        Parameters:
+        -----------
+        max_bytes : int
+            Total size of cached results above which the least recently used
+            are evicted; a single result larger than this is not cached
+        """
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'misses': 0, 'evictions': 0}
+    
+    def get(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """Return the cached result for key, computing and storing it if needed."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.stats['hits'] += 1
+                return entry[0]
+            self.stats['misses'] += 1
+        
+        value = compute()
+        self._put(key, value, _nbytes(value))
+        return value
+    
+    def _put(self, key: Hashable, value: Any, size: int):
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.nbytes -= previous[1]
+            self._entries[key] = (value, size)
+            self.nbytes += size
+            while self.nbytes > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self.nbytes -= evicted
+                self.stats['evictions'] += 1
+    
+    def hit_rate(self) -> float:
+        """Share of lookups served from the cache."""
+        lookups = self.stats['hits'] + self.stats['misses']
+        return self.stats['hits'] / lookups if lookups else 0.0
+    
+    def clear(self):
+        """Drop every cached result (statistics are kept)."""
+        with self._lock:
+            self._entries.clear()
+            self.nbytes = 0
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# Shared by every MemoizedCalculator in the process, so Streamlit reruns and
+# sessions reuse each other's results
+default_cache = ResultCache()
+
+
+class MemoizedCalculator:
+    """Proxy that memoizes a calculator's methods by the content of their arguments."""
+    
+    def __init__(self, calculator, cache: Optional[ResultCache] = None):
+        """
+        Wrap a calculator.
+        
+        Parameters:
+        -----------
+        calculator : object
+            Calculator instance or class, e.g. VolatilityCalculator()
+        cache : ResultCache, optional
+            Cache to use; defaults to the process-wide default_cache
+        """
+        self.calculator = calculator
+        self.cache = cache if cache is not None else default_cache
+        self._prefix = type(calculator).__name__ if not inspect.isclass(calculator) else calculator.__name__
+    
+    def __getattr__(self, name: str):
+        attribute = getattr(self.calculator, name)
+        # Generators are consumed by the caller and cannot be replayed
+        if not callable(attribute) or inspect.isgeneratorfunction(attribute):
+            return attribute
+        
+        try:
+            signature = inspect.signature(attribute)
+        except (TypeError, ValueError):
+            signature = None
+        
+        def memoized(*args, **kwargs):
+            try:
+                bound = signature.bind(*args, **kwargs)
+            except (AttributeError, TypeError):
+                # No signature, or a bad call that the method itself reports
+                key = (self._prefix, name, fingerprint(args), fingerprint(kwargs))
+            else:
+                bound.apply_defaults()
+                key = (self._prefix, name, fingerprint(dict(bound.arguments)))
+            result = self.cache.get(key, lambda: attribute(*args, **kwargs))
+            if isinstance(result, (pd.DataFrame, pd.Series, np.ndarray)):
+                return result.copy()
+            return result
+        
+        memoized.__name__ = name
+        memoized.__doc__ = attribute.__doc__
+        return memoized
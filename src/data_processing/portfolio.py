@@ -0,0 +1,264 @@
+"""
+Mean-variance efficient frontiers.
+
+EfficientFrontier traces the frontier for a vector of expected returns and a
+covariance matrix:
+
+- Without bounds (short sales allowed, weights sum to one) every frontier
+  point is a combination of two solves against one Cholesky factorization,
+  so the whole frontier costs a single factorization.
+- With bounds (e.g. long-only), each point minimizes
+  1/2 w'Sw - tau * mu'w over the capped simplex. All points are solved
+  together with accelerated projected gradient (FISTA), one covariance
+  product per iteration for the whole batch; converged points drop out of
+  the batch. A coarse subset of points is solved first and the remaining
+  points start from the interpolation of their converged neighbours. A
+  later trace on the same inputs warm-starts from the previous solution.
+"""
+
+from collections import namedtuple
+from typing import Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+FrontierResult = namedtuple('FrontierResult', ['points', 'weights'])
+
+
+def project_capped_simplex(values: np.ndarray, lower: np.ndarray, upper: np.ndarray, theta=None, tol: float = 1e-12):
+    """
+    Euclidean projection of each column onto {w : sum(w) = 1, lower <= w <= upper}.
+    
+    The projection is clip(values - theta, lower, upper) for the shift theta
+    that makes the column sum to one. The sum is piecewise linear in theta,
+    so a Newton step lands on theta exactly once it is in the right linear
+    piece; steps that leave the bracket fall back to bisection. Passing the
+    previous theta (as consecutive gradient steps do) usually needs a single
+    step.
+    
+    Returns:
+    --------
+    tuple
+        (projected values, theta per column)
+    """
+    lower = lower[:, None]
+    upper = upper[:, None]
+    # The clipped sum is sum(upper) at low and sum(lower) at high
+    low = (values - upper).min(axis=0)
+    high = (values - lower).max(axis=0)
+    if theta is None:
+        theta = (values.sum(axis=0) - 1) / len(values)
+    theta = np.clip(theta, low, high)
+    
+    for _ in range(100):
+        shifted = values - theta
+        excess = np.clip(shifted, lower, upper).sum(axis=0) - 1
+        if np.abs(excess).max() <= tol:
+            break
+        low = np.where(excess > 0, theta, low)
+        high = np.where(excess < 0, theta, high)
+        
+        free = ((shifted > lower) & (shifted < upper)).sum(axis=0)
+        newton = theta + excess / np.maximum(free, 1)
+        inside = (free > 0) & (newton > low) & (newton < high)
+        theta = np.where(inside, newton, (low + high) / 2)
+    
+    return np.clip(values - theta, lower, upper), theta
+
+
+class EfficientFrontier:
+    """Mean-variance frontier over N assets."""
+    
+    def __init__(
+        self,
+        expected_returns,
+        covariance,
+        bounds: Optional[Tuple[float, float]] = (0.0, 1.0),
+        periods_per_year: int = 252
+    ):
+        """
+        Prepare the optimizer.
+        
+        Parameters:
+        -----------
+        expected_returns : pd.Series or array
+            Expected per-period return of each asset
+        covariance : pd.DataFrame or array
+            N x N per-period covariance matrix
+        bounds : tuple, optional
+            (lower, upper) bound on each weight, e.g. (0, 1) for long-only or
+            (0, 0.1) to cap positions; None allows any weights summing to one
+        periods_per_year : int
+            Periods used to annualize the reported return, volatility and Sharpe
+        """
+        self.assets = (
+            list(expected_returns.index) if isinstance(expected_returns, pd.Series)
+            else list(range(len(expected_returns)))
+        )
+        self.mu = np.asarray(expected_returns, dtype=float)
+        self.sigma = np.asarray(covariance, dtype=float)
+        self.bounds = bounds
+        self.periods_per_year = periods_per_year
+        
+        n = len(self.mu)
+        if bounds is not None:
+            self.lower = np.full(n, float(bounds[0]))
+            self.upper = np.full(n, float(bounds[1]))
+            if self.lower.sum() > 1 or self.upper.sum() < 1:
+                raise ValueError(f"No portfolio of {n} assets satisfies bounds {bounds} and sums to one")
+        
+        self._factor = None
+        self._lipschitz = None
+        self._previous = None
+    
+    @classmethod
+    def from_returns(cls, returns: pd.DataFrame, method: str = 'sample', **kwargs) -> 'EfficientFrontier':
+        """
+        Build a frontier from historical returns.
+        
+        Parameters:
+        -----------
+        returns : pd.DataFrame
+            T x N returns; dates with any missing value are dropped
+        method : str
+            Covariance estimator: 'sample', 'ewma', 'ledoit_wolf' or 'oas'
+        """
+        from .covariance import ewma_covariance, shrunk_covariance
+        
+        returns = returns.dropna()
+        if method == 'sample':
+            covariance = returns.cov()
+        elif method == 'ewma':
+            covariance = ewma_covariance(returns)
+        else:
+            covariance = shrunk_covariance(returns, method)
+        return cls(returns.mean(), covariance, **kwargs)
+    
+    @property
+    def factor(self):
+        # Cholesky factor of the covariance, computed once and reused
+        if self._factor is None:
+            jitter = 1e-12 * np.trace(self.sigma) / len(self.sigma)
+            self._factor = np.linalg.cholesky(self.sigma + jitter * np.eye(len(self.sigma)))
+        return self._factor
+    
+    def _solve(self, rhs: np.ndarray) -> np.ndarray:
+        # sigma^-1 rhs from the Cholesky factor (two triangular solves)
+        return np.linalg.solve(self.factor.T, np.linalg.solve(self.factor, rhs))
+    
+    def _unconstrained(self, n_points: int) -> np.ndarray:
+        ones = np.ones(len(self.mu))
+        x_ones, x_mu = self._solve(np.column_stack([ones, self.mu])).T
+        a, b, c = ones @ x_ones, ones @ x_mu, self.mu @ x_mu
+        d = a * c - b ** 2
+        
+        # Target returns from the minimum-variance portfolio up to the best asset
+        targets = np.linspace(b / a, max(self.mu.max(), b / a), n_points)
+        lam = (c - b * targets) / d
+        gamma = (a * targets - b) / d
+        return np.outer(x_ones, lam) + np.outer(x_mu, gamma)
+    
+    def _risk_aversions(self, n_points: int) -> np.ndarray:
+        # tau = 0 is the minimum-variance portfolio; large tau approaches the
+        # highest-return corner. The scale puts the interesting range mid-grid
+        spread = np.ptp(self.mu) or 1.0
+        scale = self.lipschitz / spread
+        return np.r_[0.0, np.logspace(np.log10(scale * 1e-4), np.log10(scale * 10), n_points - 1)]
+    
+    @property
+    def lipschitz(self) -> float:
+        # Largest eigenvalue of the covariance: the gradient's Lipschitz constant
+        if self._lipschitz is None:
+            self._lipschitz = float(np.linalg.eigvalsh(self.sigma)[-1])
+        return self._lipschitz
+    
+    def _fista(self, start: np.ndarray, taus: np.ndarray, tol: float, max_iter: int) -> np.ndarray:
+        step = 1.0 / self.lipschitz
+        weights = start.copy()
+        # Columns still iterating; converged columns drop out of the batch
+        active = np.arange(len(taus))
+        current = weights
+        momentum = weights
+        linear = self.mu[:, None] * taus[None, :]
+        theta = None
+        t = np.ones(len(taus))
+        for _ in range(max_iter):
+            gradient = self.sigma @ momentum - linear
+            updated, theta = project_capped_simplex(momentum - step * gradient, self.lower, self.upper, theta)
+            change = updated - current
+            
+            # Restart the momentum of columns that started moving uphill
+            restart = np.einsum('ij,ij->j', momentum - updated, change) > 0
+            t_next = np.where(restart, 1.0, (1 + np.sqrt(1 + 4 * t ** 2)) / 2)
+            momentum = updated + ((t - 1) / t_next)[None, :] * change * ~restart[None, :]
+            current, t = updated, t_next
+            
+            moving = np.abs(change).max(axis=0) >= tol
+            if not moving.all():
+                weights[:, active] = current
+                active, current, momentum = active[moving], current[:, moving], momentum[:, moving]
+                linear, theta, t = linear[:, moving], theta[moving], t[moving]
+                if len(active) == 0:
+                    break
+        weights[:, active] = current
+        return weights
+    
+    def _bounded(self, n_points: int, tol: float, max_iter: int) -> np.ndarray:
+        taus = self._risk_aversions(n_points)
+        if self._previous is not None and self._previous.shape == (len(self.mu), n_points):
+            return self._fista(self._previous, taus, tol, max_iter)
+        
+        # Solve every k-th point from an equal-weight start, then start the rest
+        # from the interpolation of their two converged neighbours
+        coarse = np.unique(np.r_[np.arange(0, n_points, 8), n_points - 1])
+        start, _ = project_capped_simplex(np.full((len(self.mu), len(coarse)), 1.0 / len(self.mu)), self.lower, self.upper)
+        solved = self._fista(start, taus[coarse], tol, max_iter)
+        
+        position = np.arange(n_points)
+        interpolated = np.stack([np.interp(position, coarse, row) for row in solved])
+        interpolated, _ = project_capped_simplex(interpolated, self.lower, self.upper)
+        interpolated[:, coarse] = solved
+        return self._fista(interpolated, taus, tol, max_iter)
+    
+    def trace(self, n_points: int = 100, risk_free_rate: float = 0.0, tol: float = 1e-7, max_iter: int = 5000) -> FrontierResult:
+        """
+        Compute the frontier.
+        
+        Parameters:
+        -----------
+        n_points : int
+            Number of frontier portfolios
+        risk_free_rate : float
+            Annual risk-free rate used for the Sharpe ratio
+        tol : float
+            Largest weight change per iteration at which bounded solves stop
+        max_iter : int
+            Iteration cap for bounded solves
+        
+        Returns:
+        --------
+        FrontierResult
+            points: DataFrame of annualized Return, Volatility and Sharpe per
+            portfolio, ordered from the minimum-variance portfolio upwards;
+            weights: portfolio x asset DataFrame
+        """
+        if self.bounds is None:
+            weights = self._unconstrained(n_points)
+        else:
+            weights = self._bounded(n_points, tol, max_iter)
+            self._previous = weights
+        
+        mean = self.mu @ weights
+        std = np.sqrt(np.maximum(np.einsum('ij,ij->j', weights, self.sigma @ weights), 0.0))
+        with np.errstate(invalid='ignore', divide='ignore'):
+            sharpe = np.sqrt(self.periods_per_year) * (mean - risk_free_rate / self.periods_per_year) / std
+        
+        points = pd.DataFrame({
+            'Return': (1 + mean) ** self.periods_per_year - 1,
+            'Volatility': std * np.sqrt(self.periods_per_year),
+            'Sharpe': sharpe,
+        })
+        order = np.argsort(points['Volatility'].to_numpy(), kind='stable')
+        points = points.iloc[order].reset_index(drop=True)
+        weights = pd.DataFrame(weights.T[order], columns=self.assets)
+        return FrontierResult(points, weights)
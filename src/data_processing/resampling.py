@@ -0,0 +1,198 @@
+"""
+OHLCV-aware resampling and a cached multi-resolution bar pyramid.
+
+resample_ohlcv aggregates bars in one grouped pass over the sorted index:
+open takes the first bar of each period, high the maximum, low the minimum,
+close the last bar and volume the sum (other columns keep their last value).
+Periods are found by flooring the wall-clock timestamps, so a daily bar of
+tz-aware exchange data covers the local trading day. Each bar is labeled
+with the start of its period, and periods without bars are left out
+(nights, weekends, holidays).
+
+ResamplingPyramid keeps every level of a bar hierarchy (1min -> 5min -> 1h
+-> 1d -> 1w by default), each built from the level below it. OHLCV
+aggregation is associative, so appending bars only recomputes the last,
+still-forming bar of every level:
+
+    pyramid = ResamplingPyramid()
+    pyramid.append(minute_bars)      # full history
+    pyramid.append(new_bars)         # touches only the tail of each level
+    weekly = pyramid['1w']           # no resampling at read time
+"""
+
+from typing import Dict, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+from pandas.tseries.frequencies import to_offset
+
+LEVELS = ['1min', '5min', '1h', '1d', '1w']
+
+# Aggregation of each OHLCV field; any other column keeps its last value
+OHLCV_AGGREGATIONS = {'open': 'first', 'high': 'max', 'low': 'min', 'close': 'last', 'volume': 'sum'}
+
+# Lower-case day and week names are deprecated pandas aliases
+_ALIASES = {'1d': '1D', '1w': 'W'}
+
+_NANOS = {'s': 1_000_000_000, 'ms': 1_000_000, 'us': 1_000, 'ns': 1}
+_DAY = 86_400_000_000_000
+
+
+def _bins(freq: str) -> Tuple[int, int]:
+    # (period length, origin) in nanoseconds; periods are [origin + k * length, ...)
+    try:
+        offset = to_offset(_ALIASES.get(freq, freq))
+    except ValueError:
+        raise ValueError(f"Frequency {freq} not supported. Available: {LEVELS} or any fixed frequency")
+    if isinstance(offset, pd.offsets.Week) and offset.weekday is not None:
+        # Weeks end on the anchor day (Sunday for 'W'); 1970-01-01 was a Thursday
+        first_day = (offset.weekday + 1 - 3) % 7
+        return offset.n * 7 * _DAY, first_day * _DAY
+    try:
+        return offset.nanos, 0
+    except ValueError:
+        raise ValueError(f"Frequency {freq} not supported. Available: {LEVELS} or any fixed frequency")
+
+
+def _wall_keys(index: pd.DatetimeIndex) -> np.ndarray:
+    # Wall-clock nanoseconds, so periods follow local days
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    return index.asi8 * _NANOS[index.unit]
+
+
+def _aggregate(bars: pd.DataFrame, keys: np.ndarray, length: int, origin: int):
+    # One grouped pass over sorted bars; returns the resampled bars and the
+    # wall-clock start of each period
+    periods = (keys - origin) // length * length + origin
+    if len(periods) == 0:
+        return bars.iloc[:0].copy(), periods
+    starts = np.flatnonzero(np.r_[True, periods[1:] != periods[:-1]])
+    ends = np.r_[starts[1:], len(periods)]
+    
+    columns = {}
+    for column in bars.columns:
+        values = bars[column].to_numpy()
+        how = OHLCV_AGGREGATIONS.get(str(column).lower(), 'last')
+        if how == 'first':
+            columns[column] = values[starts]
+        elif how == 'last':
+            columns[column] = values[ends - 1]
+        elif how == 'max':
+            # fmax/fmin skip missing values
+            columns[column] = np.fmax.reduceat(values, starts)
+        elif how == 'min':
+            columns[column] = np.fmin.reduceat(values, starts)
+        else:
+            columns[column] = np.add.reduceat(np.nan_to_num(values), starts)
+    
+    return pd.DataFrame(columns, index=_labels(bars.index, starts, keys, periods[starts])), periods[starts]
+
+
+def _labels(index: pd.DatetimeIndex, starts: np.ndarray, keys: np.ndarray, periods: np.ndarray) -> pd.DatetimeIndex:
+    # Period starts in the index's time zone
+    labels = pd.DatetimeIndex(periods.view('datetime64[ns]'), name=index.name)
+    if index.tz is None:
+        return labels
+    labels = labels.tz_localize(index.tz, ambiguous='NaT', nonexistent='shift_forward')
+    # A start inside the repeated hour when clocks go back is ambiguous; take
+    # the offset of the period's first bar, which falls in that same hour
+    fallback = index[starts] - pd.to_timedelta(keys[starts] - periods)
+    return labels.where(~labels.isna(), fallback)
+
+
+def resample_ohlcv(bars: pd.DataFrame, freq: str) -> pd.DataFrame:
+    """
+    Resample OHLCV bars to a coarser frequency.
+    
+    Parameters:
+    -----------
+    bars : pd.DataFrame
+        Bars with a DatetimeIndex and open/high/low/close/volume columns (any
+        case; missing fields are fine)
+    freq : str
+        '1min', '5min', '1h', '1d', '1w' or another fixed frequency; weekly
+        frequencies such as 'W-FRI' set the day weeks end on
+    
+    Returns:
+    --------
+    pd.DataFrame
+        One bar per period that has data, labeled with the period start
+    """
+    length, origin = _bins(freq)
+    if not bars.index.is_monotonic_increasing:
+        bars = bars.sort_index()
+    return _aggregate(bars, _wall_keys(bars.index), length, origin)[0]
+
+
+class ResamplingPyramid:
+    """Bars at several resolutions, each level built from the one below."""
+    
+    def __init__(self, levels: Sequence[str] = LEVELS):
+        """
+        Configure the levels.
+        
+        Parameters:
+        -----------
+        levels : list of str
+            Frequencies from finest to coarsest; every period of a level
+            must be made of whole periods of the level below
+        """
+        self.levels = list(levels)
+        self._bins = [_bins(level) for level in self.levels]
+        for i in range(1, len(self.levels)):
+            (fine, _), (coarse, origin) = self._bins[i - 1], self._bins[i]
+            if coarse % fine or origin % fine:
+                raise ValueError(f"Level {self.levels[i]} is not made of whole {self.levels[i - 1]} periods")
+        
+        self._bars: Dict[str, pd.DataFrame] = {}
+        self._keys: Dict[str, np.ndarray] = {}
+    
+    def append(self, bars: pd.DataFrame):
+        """
+        Add new bars and update every level.
+        
+        Parameters:
+        -----------
+        bars : pd.DataFrame
+            OHLCV bars at the finest level's resolution, each labeled with
+            the start of its period. Stored bars from the first new period on
+            are replaced, so re-sending the forming bar with updated values
+            revises it
+        """
+        if len(bars) == 0:
+            return
+        if not bars.index.is_monotonic_increasing:
+            bars = bars.sort_index()
+        
+        below, below_keys = bars, _wall_keys(bars.index)
+        # A finer bar would replace the stored bar of its period instead of
+        # adding to it
+        length, origin = self._bins[0]
+        if ((below_keys - origin) % length).any():
+            raise ValueError(
+                f"Bars must start on {self.levels[0]} boundaries; resample finer bars with resample_ohlcv first"
+            )
+        for i, (level, (length, origin)) in enumerate(zip(self.levels, self._bins)):
+            new, keys = _aggregate(below, below_keys, length, origin)
+            changed = 0
+            if level in self._bars:
+                # Keep the periods before the first one that changed
+                changed = np.searchsorted(self._keys[level], keys[0])
+                new = pd.concat([self._bars[level].iloc[:changed], new])
+                keys = np.r_[self._keys[level][:changed], keys]
+            self._bars[level] = new
+            self._keys[level] = keys
+            
+            if i + 1 < len(self.levels):
+                # The next level redoes its periods from the one holding the
+                # first changed bar, which may start before it
+                length, origin = self._bins[i + 1]
+                start = (keys[changed] - origin) // length * length + origin
+                first = np.searchsorted(keys, start)
+                below, below_keys = new.iloc[first:], keys[first:]
+    
+    def __getitem__(self, level: str) -> pd.DataFrame:
+        if level not in self.levels:
+            raise ValueError(f"Level {level} not supported. Available: {self.levels}")
+        return self._bars.get(level, pd.DataFrame())
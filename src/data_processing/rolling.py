@@ -0,0 +1,218 @@
+"""
+Multi-window rolling analytics for many tickers at once.
+
+RollingEngine computes rolling return, volatility, Sharpe, VaR, CVaR and
+drawdown for several windows in one pass over a T x N return matrix:
+
+- mean, volatility and Sharpe come from cumulative sums of returns and
+  squared returns, shared by every window
+- rolling peaks use the van Herk/Gil-Werman block algorithm, the vectorized
+  form of a monotonic-deque sliding maximum (about three comparisons per
+  element whatever the window length)
+- VaR and CVaR select the tail of each window with np.partition over
+  sliding-window views, processed in blocks to bound memory; max drawdown
+  takes a running peak over the same kind of views
+
+Windows follow pandas' default min_periods: a value is NaN until a full window
+of non-missing returns is available.
+"""
+
+from typing import Iterable, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_WINDOWS = (20, 60, 120, 252)
+METRICS = ['return', 'volatility', 'sharpe', 'var', 'cvar', 'drawdown', 'max_drawdown']
+
+# Upper bound on the number of elements materialized per block of sliding windows
+_BLOCK_ELEMENTS = 4_000_000
+
+
+def rolling_max(values: np.ndarray, window: int) -> np.ndarray:
+    """
+    Sliding maximum along axis 0 (van Herk/Gil-Werman).
+    
+    NaN is ignored inside a window; the first window - 1 rows are NaN.
+    """
+    rows = values.shape[0]
+    filled = np.where(np.isnan(values), -np.inf, values)
+    padded_rows = -(-rows // window) * window
+    padded = np.full((padded_rows,) + values.shape[1:], -np.inf)
+    padded[:rows] = filled
+    
+    blocks = padded.reshape((-1, window) + values.shape[1:])
+    prefix = np.maximum.accumulate(blocks, axis=1).reshape(padded.shape)
+    suffix = np.maximum.accumulate(blocks[:, ::-1], axis=1)[:, ::-1].reshape(padded.shape)
+    
+    result = np.full(values.shape, np.nan)
+    if rows >= window:
+        # Window [t - window + 1, t] = suffix of one block + prefix of the next
+        result[window - 1:] = np.maximum(suffix[:rows - window + 1], prefix[window - 1:rows])
+    result[np.isneginf(result)] = np.nan
+    return result
+
+
+class RollingEngine:
+    """Rolling risk metrics for several windows over a T x N return matrix."""
+    
+    def __init__(
+        self,
+        returns,
+        windows: Sequence[int] = DEFAULT_WINDOWS,
+        risk_free_rate: float = 0.0,
+        periods_per_year: int = 252,
+        confidence_level: float = 0.05
+    ):
+        """
+        Prepare the shared state for the given returns.
+        
+        Parameters:
+        -----------
+        returns : pd.DataFrame or pd.Series
+            Returns, T dates x N tickers
+        windows : list of int
+            Window lengths, e.g. [20, 60, 120, 252]
+        risk_free_rate : float
+            Annual risk-free rate used for the Sharpe ratio
+        periods_per_year : int
+            Periods used to annualize
+        confidence_level : float
+            Tail probability for VaR and CVaR (0.05 for 95%)
+        """
+        if isinstance(returns, pd.Series):
+            returns = returns.to_frame(name=returns.name if returns.name is not None else 'returns')
+        self.returns = returns
+        self.windows = sorted(set(windows))
+        self.risk_free_rate = risk_free_rate
+        self.periods_per_year = periods_per_year
+        self.confidence_level = confidence_level
+        
+        self.values = returns.to_numpy(dtype=float)
+        valid = ~np.isnan(self.values)
+        
+        # Centering before the cumulative sums keeps the variance from losing
+        # precision to cancellation over long histories
+        counts = valid.sum(axis=0)
+        self._center = np.where(valid, self.values, 0.0).sum(axis=0) / np.maximum(counts, 1)
+        centered = np.where(valid, self.values - self._center, 0.0)
+        self._sum = self._cumsum(centered)
+        self._sum_sq = self._cumsum(centered ** 2)
+        self._count = self._cumsum(valid.astype(float))
+        
+        # Growth of 1, flat across missing returns
+        self._growth = np.cumprod(np.where(valid, 1 + self.values, 1.0), axis=0)
+    
+    @staticmethod
+    def _cumsum(values: np.ndarray) -> np.ndarray:
+        # Leading zero row so window sums are differences of two rows
+        return np.concatenate([np.zeros((1,) + values.shape[1:]), np.cumsum(values, axis=0)])
+    
+    def _window_sum(self, cumulative: np.ndarray, window: int) -> np.ndarray:
+        result = np.full(self.values.shape, np.nan)
+        result[window - 1:] = cumulative[window:] - cumulative[:-window]
+        return result
+    
+    def _moments(self, window: int):
+        count = self._window_sum(self._count, window)
+        full = count == window
+        total = self._window_sum(self._sum, window)
+        total_sq = self._window_sum(self._sum_sq, window)
+        
+        mean = np.where(full, total / window + self._center, np.nan)
+        variance = (total_sq - total ** 2 / window) / (window - 1) if window > 1 else np.zeros_like(total)
+        std = np.where(full, np.sqrt(np.maximum(variance, 0.0)), np.nan)
+        return mean, std
+    
+    def _tail(self, window: int):
+        # pandas-style linear-interpolated quantile and the mean of the
+        # returns at or below it, from a partial sort of each window
+        position = self.confidence_level * (window - 1)
+        lower = int(np.floor(position))
+        fraction = position - lower
+        
+        var = np.full(self.values.shape, np.nan)
+        cvar = np.full(self.values.shape, np.nan)
+        if len(self.values) < window:
+            return var, cvar
+        
+        # Windows laid out along contiguous memory (ticker-major) partition
+        # much faster than strided column windows
+        views = np.lib.stride_tricks.sliding_window_view(np.ascontiguousarray(self.values.T), window, axis=1)
+        count = self._window_sum(self._count, window)[window - 1:].T
+        block = max(1, _BLOCK_ELEMENTS // max(1, window * self.values.shape[1]))
+        for start in range(0, views.shape[1], block):
+            chunk = np.partition(views[:, start:start + block], lower, axis=-1)
+            low = chunk[..., lower]
+            high = chunk[..., lower + 1:].min(axis=-1) if lower + 1 < window else low
+            full = count[:, start:start + block] == window
+            
+            rows = slice(window - 1 + start, window - 1 + start + chunk.shape[1])
+            var[rows] = np.where(full, low + (high - low) * fraction, np.nan).T
+            # After partitioning, the lower + 1 smallest returns (the ones at
+            # or below the quantile, ties aside) come first
+            cvar[rows] = np.where(full, chunk[..., :lower + 1].mean(axis=-1), np.nan).T
+        return var, cvar
+    
+    def _drawdown(self, window: int):
+        peak = rolling_max(self._growth, window)
+        drawdown = self._growth / peak - 1
+        
+        # Max drawdown of each window's own path: the peak restarts at the
+        # level the window starts from, so nothing before the window counts
+        worst = np.full(self.values.shape, np.nan)
+        if len(self.values) < window:
+            return drawdown, worst
+        levels = np.vstack([np.ones((1, self.values.shape[1])), self._growth])
+        views = np.lib.stride_tricks.sliding_window_view(np.ascontiguousarray(levels.T), window + 1, axis=1)
+        block = max(1, _BLOCK_ELEMENTS // max(1, (window + 1) * self.values.shape[1]))
+        for start in range(0, views.shape[1], block):
+            chunk = views[:, start:start + block]
+            path = chunk / np.maximum.accumulate(chunk, axis=-1) - 1
+            worst[window - 1 + start:window - 1 + start + chunk.shape[1]] = path.min(axis=-1).T
+        # Missing returns leave the growth flat; like the other metrics, a
+        # window needs all of its returns
+        full = self._window_sum(self._count, window) == window
+        return drawdown, np.where(full, worst, np.nan)
+    
+    def compute(self, metrics: Optional[Iterable[str]] = None) -> pd.DataFrame:
+        """
+        Compute the requested metrics for every window.
+        
+        Parameters:
+        -----------
+        metrics : list of str, optional
+            Any of 'return', 'volatility', 'sharpe', 'var', 'cvar', 'drawdown'
+            and 'max_drawdown' (all by default)
+        
+        Returns:
+        --------
+        pd.DataFrame
+            Dates x (metric, window, ticker) columns
+        """
+        metrics = list(METRICS if metrics is None else metrics)
+        unknown = set(metrics) - set(METRICS)
+        if unknown:
+            raise ValueError(f"Unknown metrics {sorted(unknown)}. Available: {METRICS}")
+        
+        computed = {}
+        for window in self.windows:
+            if {'return', 'volatility', 'sharpe'} & set(metrics):
+                mean, std = self._moments(window)
+                computed['return', window] = (1 + mean) ** self.periods_per_year - 1
+                computed['volatility', window] = std * np.sqrt(self.periods_per_year)
+                with np.errstate(invalid='ignore', divide='ignore'):
+                    excess = mean - self.risk_free_rate / self.periods_per_year
+                    computed['sharpe', window] = np.sqrt(self.periods_per_year) * excess / std
+            if {'var', 'cvar'} & set(metrics):
+                computed['var', window], computed['cvar', window] = self._tail(window)
+            if {'drawdown', 'max_drawdown'} & set(metrics):
+                computed['drawdown', window], computed['max_drawdown', window] = self._drawdown(window)
+        
+        keys = [(metric, window) for metric in metrics for window in self.windows]
+        columns = pd.MultiIndex.from_tuples(
+            [(metric, window, ticker) for metric, window in keys for ticker in self.returns.columns],
+            names=['metric', 'window', 'ticker']
+        )
+        values = np.hstack([computed[key] for key in keys]) if keys else np.empty((len(self.values), 0))
+        return pd.DataFrame(values, index=self.returns.index, columns=columns)
@@ -0,0 +1,264 @@
+"""
+Streaming risk metrics with constant-time updates.
+
+RiskAccumulator keeps the state behind VolatilityCalculator's metrics for many
+symbols at once (Welford mean/variance, running peak and drawdown, and a
+fixed-size window for rolling volatility). Each new bar updates the state in
+O(1) per symbol instead of recomputing over the full return history, and the
+state can be saved with to_dict and restored with from_dict.
+"""
+
+from typing import Any, Dict, Iterable, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+
+class RiskAccumulator:
+    """Running risk metrics for N symbols, updated one bar or one batch at a time."""
+    
+    def __init__(
+        self,
+        symbols: Union[int, Iterable[str]] = 1,
+        window: Optional[int] = None,
+        risk_free_rate: float = 0.0,
+        periods_per_year: int = 252
+    ):
+        """
+        Initialize empty accumulators.
+        
+        Parameters:
+        -----------
+        symbols : int or list of str
+            Number of symbols, or their names
+        window : int, optional
+            Window length for rolling volatility (same as rolling_volatility's
+            window); no rolling state is kept when omitted
+        risk_free_rate : float
+            Annual risk-free rate used for the Sharpe ratio
+        periods_per_year : int
+            Periods used to annualize
+        """
+        self.symbols = list(range(symbols)) if isinstance(symbols, int) else list(symbols)
+        self.window = window
+        self.risk_free_rate = risk_free_rate
+        self.periods_per_year = periods_per_year
+        
+        n = len(self.symbols)
+        self._index = {symbol: i for i, symbol in enumerate(self.symbols)}
+        
+        # Welford state over the full history
+        self.count = np.zeros(n, dtype=np.int64)
+        self.mean = np.zeros(n)
+        self.m2 = np.zeros(n)
+        
+        # Growth of 1 invested at the first return, its running peak and the
+        # deepest drawdown seen so far
+        self.growth = np.ones(n)
+        self.peak = np.full(n, -np.inf)
+        self.max_drawdown = np.zeros(n)
+        
+        # Ring buffer of the last `window` returns per symbol, with Welford
+        # state for the values currently inside the window
+        if window is not None:
+            self.buffer = np.zeros((window, n))
+            self.position = np.zeros(n, dtype=np.int64)
+            self.window_count = np.zeros(n, dtype=np.int64)
+            self.window_mean = np.zeros(n)
+            self.window_m2 = np.zeros(n)
+    
+    def _as_row(self, returns) -> np.ndarray:
+        # One return per symbol; missing symbols are NaN and left untouched
+        if isinstance(returns, dict):
+            returns = pd.Series(returns)
+        if isinstance(returns, pd.Series):
+            row = np.full(len(self.symbols), np.nan)
+            for symbol, value in returns.items():
+                row[self._index[symbol]] = value
+            return row
+        return np.broadcast_to(np.asarray(returns, dtype=float), (len(self.symbols),))
+    
+    def update(self, returns) -> 'RiskAccumulator':
+        """
+        Add one bar of returns.
+        
+        Parameters:
+        -----------
+        returns : float, array, dict or pd.Series
+            One return per symbol (a float for a single symbol). NaN or
+            missing symbols are skipped for this bar
+        """
+        row = self._as_row(returns)
+        active = ~np.isnan(row)
+        if not active.any():
+            return self
+        x = row[active]
+        
+        count = self.count[active] + 1
+        delta = x - self.mean[active]
+        mean = self.mean[active] + delta / count
+        self.m2[active] += delta * (x - mean)
+        self.mean[active] = mean
+        self.count[active] = count
+        
+        growth = self.growth[active] * (1 + x)
+        peak = np.maximum(self.peak[active], growth)
+        self.growth[active] = growth
+        self.peak[active] = peak
+        self.max_drawdown[active] = np.minimum(self.max_drawdown[active], (growth - peak) / peak)
+        
+        if self.window is not None:
+            self._update_window(np.flatnonzero(active), x)
+        return self
+    
+    def _update_window(self, columns: np.ndarray, x: np.ndarray):
+        position = self.position[columns]
+        full = self.window_count[columns] == self.window
+        old = self.buffer[position, columns]
+        self.buffer[position, columns] = x
+        self.position[columns] = (position + 1) % self.window
+        
+        mean = self.window_mean[columns]
+        m2 = self.window_m2[columns]
+        count = self.window_count[columns]
+        
+        # Window not full yet: plain Welford insert
+        grow = ~full
+        count[grow] += 1
+        delta = x[grow] - mean[grow]
+        new_mean = mean[grow] + delta / count[grow]
+        m2[grow] += delta * (x[grow] - new_mean)
+        mean[grow] = new_mean
+        
+        # Window full: replace the oldest value in one step
+        delta = x[full] - old[full]
+        new_mean = mean[full] + delta / self.window
+        m2[full] += delta * (x[full] - new_mean + old[full] - mean[full])
+        mean[full] = new_mean
+        
+        self.window_mean[columns] = mean
+        self.window_m2[columns] = np.maximum(m2, 0.0)
+        self.window_count[columns] = count
+    
+    def update_batch(self, returns) -> 'RiskAccumulator':
+        """
+        Add several bars of returns.
+        
+        Parameters:
+        -----------
+        returns : array or pd.DataFrame
+            T x N returns in time order (a DataFrame is aligned on symbols)
+        """
+        if isinstance(returns, pd.DataFrame):
+            returns = returns.reindex(columns=self.symbols)
+        values = np.asarray(returns, dtype=float)
+        if values.ndim == 1:
+            values = values[:, None]
+        
+        if self.window is not None:
+            # The ring buffer has to see values in order
+            for row in values:
+                self.update(row)
+            return self
+        
+        # Without a window, merge the batch's moments in one step (Chan et al.)
+        valid = ~np.isnan(values)
+        batch_count = valid.sum(axis=0)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            batch_mean = np.where(batch_count > 0, np.nansum(values, axis=0) / batch_count, 0.0)
+        batch_m2 = np.nansum(np.where(valid, values - batch_mean, 0.0) ** 2, axis=0)
+        
+        count = self.count + batch_count
+        delta = batch_mean - self.mean
+        with np.errstate(invalid='ignore', divide='ignore'):
+            weight = np.where(count > 0, batch_count / count, 0.0)
+        self.m2 = self.m2 + batch_m2 + delta ** 2 * self.count * weight
+        self.mean = self.mean + delta * weight
+        self.count = count
+        
+        growth = self.growth * np.cumprod(np.where(valid, 1 + values, 1.0), axis=0)
+        started = (self.count - batch_count > 0) | np.logical_or.accumulate(valid, axis=0)
+        peak = np.maximum(self.peak, np.maximum.accumulate(np.where(started, growth, -np.inf), axis=0))
+        with np.errstate(invalid='ignore', divide='ignore'):
+            drawdown = np.where(started, (growth - peak) / peak, 0.0)
+        if len(values):
+            self.growth = growth[-1]
+            self.peak = peak[-1]
+            self.max_drawdown = np.minimum(self.max_drawdown, drawdown.min(axis=0))
+        return self
+    
+    def _annualized_std(self, m2, count) -> np.ndarray:
+        with np.errstate(invalid='ignore', divide='ignore'):
+            variance = np.where(count > 1, m2 / (count - 1), np.nan)
+        return np.sqrt(variance * self.periods_per_year)
+    
+    @property
+    def realized_volatility(self) -> np.ndarray:
+        return self._annualized_std(self.m2, self.count)
+    
+    @property
+    def sharpe_ratio(self) -> np.ndarray:
+        std = np.sqrt(self.m2 / np.maximum(self.count - 1, 1))
+        excess = self.mean - self.risk_free_rate / self.periods_per_year
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.where(self.count > 1, np.sqrt(self.periods_per_year) * excess / std, np.nan)
+    
+    @property
+    def rolling_volatility(self) -> np.ndarray:
+        if self.window is None:
+            raise ValueError("Accumulator was created without a window")
+        volatility = self._annualized_std(self.window_m2, self.window_count)
+        return np.where(self.window_count == self.window, volatility, np.nan)
+    
+    @property
+    def drawdown(self) -> np.ndarray:
+        # Current drawdown from the running peak
+        with np.errstate(invalid='ignore'):
+            return np.where(self.count > 0, (self.growth - self.peak) / self.peak, np.nan)
+    
+    def metrics(self) -> pd.DataFrame:
+        """Current metrics as a symbol x metric table."""
+        metrics = {
+            'Volatility': self.realized_volatility,
+            'Sharpe': self.sharpe_ratio,
+            'MaxDD': np.where(self.count > 0, self.max_drawdown, np.nan),
+            'Drawdown': self.drawdown,
+        }
+        if self.window is not None:
+            metrics['RollingVolatility'] = self.rolling_volatility
+        return pd.DataFrame(metrics, index=self.symbols)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the full state as JSON-serializable values."""
+        state = {
+            'symbols': self.symbols,
+            'window': self.window,
+            'risk_free_rate': self.risk_free_rate,
+            'periods_per_year': self.periods_per_year,
+        }
+        arrays = ['count', 'mean', 'm2', 'growth', 'peak', 'max_drawdown']
+        if self.window is not None:
+            arrays += ['buffer', 'position', 'window_count', 'window_mean', 'window_m2']
+        for name in arrays:
+            state[name] = getattr(self, name).tolist()
+        # A symbol without returns has no peak yet (-inf in memory), which
+        # JSON cannot represent
+        state['peak'] = [peak if np.isfinite(peak) else None for peak in state['peak']]
+        return state
+    
+    @classmethod
+    def from_dict(cls, state: Dict[str, Any]) -> 'RiskAccumulator':
+        """Restore an accumulator saved with to_dict."""
+        accumulator = cls(
+            state['symbols'],
+            window=state['window'],
+            risk_free_rate=state['risk_free_rate'],
+            periods_per_year=state['periods_per_year']
+        )
+        for name, value in state.items():
+            current = getattr(accumulator, name, None)
+            if isinstance(current, np.ndarray):
+                if name == 'peak':
+                    value = [-np.inf if peak is None else peak for peak in value]
+                setattr(accumulator, name, np.asarray(value, dtype=current.dtype).reshape(current.shape))
+        return accumulator
@@ -0,0 +1,92 @@
+"""
+Import-time report for holding a cold-start budget.
+
+Each module is imported in a fresh interpreter with `python -X importtime`,
+so the numbers reflect a cold start rather than what is already cached in
+this process.
+
+Usage:
+    python -m src.import_report
+    python -m src.import_report --budget 2.5 src.data_fetchers plotly.graph_objects
+"""
+
+import argparse
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+# What app.py needs before the first render
+DEFAULT_MODULES = ['streamlit', 'src.data_fetchers', 'src.data_processing']
+
+
+def measure_import(module: str) -> Tuple[float, List[Tuple[float, str]]]:
+    """
+    Import a module in a fresh interpreter and time it.
+    
+    Returns:
+    --------
+    tuple
+        (total seconds, [(cumulative seconds, module name), ...]) where the
+        list holds every module imported along the way
+    """
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        capture_output=True,
+        text=True
+    )
+    if result.returncode != 0:
+        raise ImportError(f"Could not import {module}: {result.stderr.strip().splitlines()[-1]}")
+    
+    timings = []
+    for line in result.stderr.splitlines():
+        # import time:  self [us] | cumulative | imported package
+        if not line.startswith('import time:') or 'imported package' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        timings.append((int(cumulative) / 1e6, name[1:].rstrip()))
+    
+    # Only count top-level (unindented) entries belonging to the requested
+    # package, leaving out interpreter startup imports such as site
+    root = module.split('.')[0]
+    total = sum(
+        seconds for seconds, name in timings
+        if not name.startswith(' ') and name.split('.')[0] == root
+    )
+    return total, timings
+
+
+def report(modules: List[str], top: int = 10) -> Dict[str, float]:
+    """Print the cold import time of each module and its heaviest dependencies."""
+    totals = {}
+    for module in modules:
+        total, timings = measure_import(module)
+        totals[module] = total
+        
+        print(f"\n{module}: {total:.3f}s")
+        heaviest = sorted(timings, reverse=True)[:top]
+        for seconds, name in heaviest:
+            print(f"  {seconds:8.3f}s  {name.strip()}")
+    return totals
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Report cold import times against a startup budget.")
+    parser.add_argument('modules', nargs='*', default=DEFAULT_MODULES)
+    parser.add_argument('--budget', type=float, default=None, help="Fail if the total exceeds this many seconds")
+    parser.add_argument('--top', type=int, default=10, help="Number of heaviest imports to list per module")
+    args = parser.parse_args()
+    
+    totals = report(args.modules, top=args.top)
+    total = sum(totals.values())
+    
+    print("\n" + "=" * 60)
+    print(f"Total: {total:.3f}s")
+    if args.budget is not None:
+        status = "PASS" if total <= args.budget else "FAIL"
+        print(f"Budget: {args.budget:.3f}s  {status}")
+        return total <= args.budget
+    return True
+
+
+if __name__ == '__main__':
+    sys.exit(0 if main() else 1)
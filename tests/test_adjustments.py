@@ -0,0 +1,24 @@
+"""CorporateActionAdjuster: incremental actions."""
+
+import numpy as np
+import pandas as pd
+
+from src.data_processing.adjustments import CorporateActionAdjuster
+
+
+def test_action_after_last_row_is_applied_when_its_row_arrives():
+    close = pd.DataFrame({'X': [10.0, 10.0]}, index=pd.date_range('2024-01-02', periods=2))
+    dividends = pd.DataFrame({'X': [1.0]}, index=pd.DatetimeIndex(['2024-01-05']))
+    adjuster = CorporateActionAdjuster(close, dividends=dividends)
+    assert np.allclose(adjuster.factors['X'], 1.0)
+    
+    # Not reached yet: still pending
+    adjuster.extend(pd.DataFrame({'X': [10.0]}, index=pd.DatetimeIndex(['2024-01-04'])))
+    assert np.allclose(adjuster.factors['X'], 1.0)
+    
+    # First row on or after the ex-date (no row on the ex-date itself)
+    adjuster.extend(pd.DataFrame({'X': [9.0]}, index=pd.DatetimeIndex(['2024-01-08'])))
+    assert np.allclose(adjuster.factors['X'], [0.9, 0.9, 0.9, 1.0])
+    
+    adjuster.extend(pd.DataFrame({'X': [9.0]}, index=pd.DatetimeIndex(['2024-01-09'])))
+    assert np.allclose(adjuster.factors['X'], [0.9, 0.9, 0.9, 1.0, 1.0])
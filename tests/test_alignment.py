@@ -0,0 +1,24 @@
+"""FrameAligner with mixed frames and Series."""
+
+import pandas as pd
+
+from src.data_processing.alignment import FrameAligner
+from src.data_processing.cleaners import DataCleaner
+
+
+def test_series_come_back_as_series():
+    prices = pd.DataFrame({'close': [1, 2, 3]}, index=pd.date_range('2024-01-02', periods=3))
+    rate = pd.Series([4.0, 5.0], index=pd.DatetimeIndex(['2024-01-03', '2024-01-04']), name='rate')
+    unnamed = pd.Series([7, 8, 9], index=prices.index[::-1])
+    
+    aligned, series, other = DataCleaner.align_dataframes([prices, rate, unnamed], method='outer')
+    
+    assert isinstance(aligned, pd.DataFrame) and aligned['close'].dtype == 'float64'
+    assert isinstance(series, pd.Series) and series.name == 'rate'
+    assert series.index.equals(prices.index)
+    assert series.iloc[1:].tolist() == [4.0, 5.0] and pd.isna(series.iloc[0])
+    assert isinstance(other, pd.Series) and other.name is None
+    assert other.tolist() == [9.0, 8.0, 7.0]
+    
+    panel = FrameAligner('inner').panel([prices, rate], keys=['px', 'fred'])
+    assert list(panel.columns) == [('px', 'close'), ('fred', 'rate')]
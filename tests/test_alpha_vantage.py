@@ -0,0 +1,45 @@
+"""AlphaVantageFetcher: month-by-month intraday history through a transport."""
+
+import requests
+
+from src.data_fetchers.alpha_vantage import AlphaVantageFetcher
+from src.data_fetchers.transport import RecordingTransport, ReplayTransport
+
+MONTHS = ['2024-01', '2024-02', '2024-03']
+
+
+class _Response:
+    def __init__(self, params):
+        bar = {'1. open': '1', '2. high': '2', '3. low': '0.5', '4. close': '1.5', '5. volume': '100'}
+        # One bar on the first day of the requested month
+        self.payload = {'Time Series (1min)': {f"{params['month']}-01 09:30:00": bar}}
+    
+    def raise_for_status(self):
+        pass
+    
+    def json(self):
+        return self.payload
+
+
+def test_each_month_is_requested_and_replayed_separately(tmp_path, monkeypatch):
+    requested = []
+    
+    def get(url, params, timeout):
+        requested.append(dict(params))
+        return _Response(params)
+    
+    monkeypatch.setattr(requests, 'get', get)
+    fetcher = AlphaVantageFetcher(api_key='demo', transport=ReplayTransport(str(tmp_path), strict=True))
+    fetcher.transport = RecordingTransport(str(tmp_path))
+    recorded = dict(fetcher.iter_intraday_history('IBM', MONTHS[0], MONTHS[-1]))
+    
+    assert [params['month'] for params in requested] == MONTHS
+    assert all(params['function'] == 'TIME_SERIES_INTRADAY' for params in requested)
+    assert len(list(tmp_path.glob('alpha_vantage/intraday_month/*.pkl'))) == len(MONTHS)
+    
+    monkeypatch.setattr(requests, 'get', None)
+    fetcher.transport = ReplayTransport(str(tmp_path), strict=True)
+    for month, data in fetcher.iter_intraday_history('IBM', MONTHS[0], MONTHS[-1]):
+        assert str(data.index[0].to_period('M')) == month
+        assert data.equals(recorded[month])
+        assert list(data.columns) == ['open', 'high', 'low', 'close', 'volume']
@@ -0,0 +1,22 @@
+"""Vectorized calculators against their per-ticker pandas counterparts."""
+
+import numpy as np
+import pandas as pd
+
+from src.data_processing.calculators import ReturnCalculator
+
+
+def test_batch_simple_returns_match_each_column_on_an_outer_aligned_panel():
+    rng = np.random.default_rng(0)
+    index = pd.bdate_range('2024-01-01', periods=300)
+    prices = pd.DataFrame(100 * np.exp(rng.normal(0, 0.01, (300, 3)).cumsum(axis=0)), index=index, columns=list('ABC'))
+    # Different holidays, a late listing and a trading halt
+    prices.iloc[rng.choice(300, 20, replace=False), 0] = np.nan
+    prices.iloc[:40, 1] = np.nan
+    prices.iloc[100:110, 2] = np.nan
+    
+    returns = ReturnCalculator.batch_simple_returns(prices)
+    
+    for ticker in prices.columns:
+        expected = ReturnCalculator.simple_returns(prices[ticker].dropna())
+        pd.testing.assert_series_equal(returns[ticker].dropna(), expected, check_freq=False)
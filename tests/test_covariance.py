@@ -0,0 +1,47 @@
+"""EWMACovariance against a bar-by-bar reference."""
+
+import numpy as np
+import pandas as pd
+
+from src.data_processing.covariance import EWMACovariance
+
+
+def _reference(values, decay):
+    # Pairwise-complete EWMA: each pair only uses the bars where both have returns
+    n = values.shape[1]
+    weights = (1 - decay) * decay ** np.arange(len(values) - 1, -1, -1)
+    covariance = np.empty((n, n))
+    for i in range(n):
+        for j in range(n):
+            both = ~np.isnan(values[:, i]) & ~np.isnan(values[:, j])
+            w = weights[both]
+            covariance[i, j] = np.sum(w * values[both, i] * values[both, j]) / w.sum()
+    return covariance
+
+
+def test_missing_returns_are_skipped_pair_by_pair():
+    rng = np.random.default_rng(0)
+    values = rng.normal(0, 0.01, (200, 5)) @ rng.normal(size=(5, 5))
+    values[rng.random(values.shape) < 0.1] = np.nan
+    values[:30, 4] = np.nan
+    returns = pd.DataFrame(values, columns=list('ABCDE'))
+    
+    # Complete bars first, then missing ones, folded in over several updates
+    estimate = EWMACovariance(returns.columns, block_size=2)
+    estimate.update(returns.iloc[:1].fillna(0.0))
+    for start in range(1, 200, 37):
+        estimate.update(returns.iloc[start:start + 37])
+    
+    values[0] = np.nan_to_num(values[0])
+    expected = _reference(values, 0.94)
+    np.testing.assert_allclose(estimate.covariance(as_frame=False), expected, rtol=1e-10)
+    scale = 1 / np.sqrt(np.diag(expected))
+    np.testing.assert_allclose(estimate.correlation(as_frame=False), expected * np.outer(scale, scale), rtol=1e-10)
+
+
+def test_complete_bars_match_the_bias_corrected_estimate():
+    values = np.random.default_rng(1).normal(0, 0.01, (50, 3))
+    estimate = EWMACovariance(3).update(values)
+    
+    assert estimate.pair_weights is None
+    np.testing.assert_allclose(estimate.covariance(as_frame=False), _reference(values, 0.94), rtol=1e-10)
@@ -0,0 +1,44 @@
+"""IntradayBarStore: merges and zero-copy reads."""
+
+import numpy as np
+import pandas as pd
+
+from src.data_fetchers.intraday_store import BAR_COLUMNS, IntradayBarStore
+
+
+def _bars(start, periods):
+    index = pd.date_range(start, periods=periods, freq='min')
+    return pd.DataFrame({name: np.arange(periods, dtype=float) for name in BAR_COLUMNS}, index=index)
+
+
+def test_query_frame_within_a_month_is_backed_by_the_mapped_file(tmp_path, monkeypatch):
+    store = IntradayBarStore(str(tmp_path))
+    store.write('X', _bars('2024-01-02 09:30', 1000))
+    
+    columns = store.query('X')
+    monkeypatch.setattr(store, 'query', lambda *args, **kwargs: dict(columns))
+    frame = store.query_frame('X')
+    
+    assert list(frame.columns) == list(BAR_COLUMNS)
+    for name in BAR_COLUMNS:
+        assert np.shares_memory(frame[name].to_numpy(), columns[name])
+
+
+def test_query_frame_spans_months(tmp_path):
+    store = IntradayBarStore(str(tmp_path))
+    store.write('X', _bars('2024-01-31 23:00', 120))
+    
+    frame = store.query_frame('X', '2024-01-31 23:30', '2024-02-01 00:30')
+    assert len(frame) == 60
+    assert frame.index.is_monotonic_increasing
+
+
+def test_write_replaces_duplicate_timestamps(tmp_path):
+    store = IntradayBarStore(str(tmp_path))
+    store.write('X', _bars('2024-01-02 09:30', 5))
+    revised = _bars('2024-01-02 09:34', 2) + 100
+    store.write('X', revised)
+    
+    frame = store.query_frame('X')
+    assert len(frame) == 6
+    assert frame['close'].iloc[-2] == 100.0
@@ -0,0 +1,70 @@
+"""Kernel backends: NumPy results against pandas, numba against NumPy."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.data_processing import kernels
+
+
+@pytest.fixture
+def returns():
+    rng = np.random.default_rng(0)
+    values = rng.normal(0, 0.02, (2000, 4))
+    values[rng.random(values.shape) < 0.01] = np.nan
+    values[:50, 3] = np.nan
+    return values
+
+
+@pytest.fixture
+def backend():
+    previous = kernels.get_backend()
+    yield kernels.set_backend
+    kernels.set_backend(previous)
+
+
+def test_max_drawdown_numpy_matches_pandas(returns, backend):
+    backend('numpy')
+    growth = (1 + pd.DataFrame(returns)).cumprod()
+    expected = (growth / growth.cummax() - 1).min().to_numpy()
+    np.testing.assert_allclose(kernels.max_drawdown(returns), expected, rtol=1e-12)
+
+
+def test_tail_mean_numpy_matches_pandas(returns, backend):
+    backend('numpy')
+    frame = pd.DataFrame(returns)
+    thresholds = frame.quantile(0.05).to_numpy()
+    expected = frame[frame <= thresholds].mean().to_numpy()
+    np.testing.assert_allclose(kernels.tail_mean(returns, thresholds), expected, rtol=1e-12)
+
+
+def test_all_missing_column_is_nan(backend):
+    backend('numpy')
+    values = np.full((10, 2), np.nan)
+    values[:, 0] = 0.01
+    assert np.isnan(kernels.max_drawdown(values)[1])
+    assert np.isnan(kernels.tail_mean(values, [0.0, 0.0])[1])
+
+
+def test_numba_backend_matches_numpy(returns, backend):
+    pytest.importorskip('numba')
+    thresholds = np.nanquantile(returns, 0.05, axis=0)
+    outputs = {}
+    for name in kernels.BACKENDS:
+        backend(name)
+        outputs[name] = (kernels.max_drawdown(returns), kernels.tail_mean(returns, thresholds))
+    for expected, actual in zip(outputs['numpy'], outputs['numba']):
+        np.testing.assert_allclose(actual, expected, rtol=1e-12, equal_nan=True)
+
+
+def test_check_parity_reports_every_kernel():
+    pytest.importorskip('numba')
+    results = kernels.check_parity(size=10_000)
+    assert set(results) == {'max_drawdown', 'tail_mean'}
+    assert all(results.values())
+
+
+def test_numba_backend_requires_numba(backend, monkeypatch):
+    monkeypatch.setattr(kernels, 'numba', None)
+    with pytest.raises(ImportError):
+        backend('numba')
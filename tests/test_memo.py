@@ -0,0 +1,37 @@
+"""MemoizedCalculator: keys and returned results."""
+
+import numpy as np
+import pandas as pd
+
+from src.data_processing.calculators import VolatilityCalculator
+from src.data_processing.memo import MemoizedCalculator, ResultCache
+
+
+def _returns():
+    return pd.Series(np.random.default_rng(0).normal(0, 0.01, 500))
+
+
+def test_argument_spellings_share_one_entry():
+    cache = ResultCache()
+    calc = MemoizedCalculator(VolatilityCalculator(), cache)
+    returns = _returns()
+    
+    calc.sharpe_ratio(returns)
+    calc.sharpe_ratio(returns, 0.0)
+    calc.sharpe_ratio(returns, risk_free_rate=0.0, periods_per_year=252)
+    calc.sharpe_ratio(returns=returns)
+    
+    assert cache.stats == {'hits': 3, 'misses': 1, 'evictions': 0}
+    calc.sharpe_ratio(returns, 0.02)
+    assert cache.stats['misses'] == 2
+
+
+def test_modifying_a_result_leaves_the_cache_intact():
+    calc = MemoizedCalculator(VolatilityCalculator(), ResultCache())
+    returns = _returns()
+    
+    drawdown = calc.drawdown(returns)
+    expected = drawdown.copy()
+    drawdown.iloc[:] = 0.0
+    
+    pd.testing.assert_series_equal(calc.drawdown(returns), expected)
@@ -0,0 +1,18 @@
+"""OutlierDetector on short and empty data."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.data_processing.outliers import METHODS, OutlierDetector
+
+
+@pytest.mark.parametrize('method', METHODS)
+@pytest.mark.parametrize('rows', [0, 1, 5, 11])
+def test_short_and_empty_frames_are_not_flagged(method, rows):
+    df = pd.DataFrame({'a': np.arange(rows, dtype=float), 'b': np.ones(rows)})
+    detector = OutlierDetector(method, window=21)
+    
+    assert not detector.detect(df).to_numpy().any()
+    assert len(detector.clean(df, 'drop')) == rows
+    pd.testing.assert_frame_equal(detector.clean(df, 'clip'), df)
@@ -0,0 +1,23 @@
+"""RollingEngine against pandas rolling windows."""
+
+import numpy as np
+import pandas as pd
+
+from src.data_processing.rolling import RollingEngine
+
+
+def _max_drawdown(window):
+    levels = np.r_[1.0, np.cumprod(1 + window)]
+    return (levels / np.maximum.accumulate(levels) - 1).min()
+
+
+def test_max_drawdown_is_nan_for_windows_with_missing_returns():
+    rng = np.random.default_rng(0)
+    returns = pd.DataFrame(rng.normal(0, 0.02, (300, 2)), columns=['A', 'B'])
+    returns.iloc[rng.choice(300, 15, replace=False), 0] = np.nan
+    
+    result = RollingEngine(returns, [20]).compute(['max_drawdown'])
+    
+    for ticker in returns.columns:
+        expected = returns[ticker].rolling(20).apply(_max_drawdown, raw=True)
+        np.testing.assert_allclose(result['max_drawdown', 20, ticker], expected, rtol=1e-12)
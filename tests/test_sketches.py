@@ -0,0 +1,21 @@
+"""TDigest serialization."""
+
+import json
+
+import numpy as np
+
+from src.data_processing.sketches import TDigest
+
+
+def test_empty_digest_round_trips_through_strict_json():
+    state = json.loads(json.dumps(TDigest().to_dict(), allow_nan=False))
+    digest = TDigest.from_dict(state).update([2.0, 1.0])
+    
+    assert (digest.min, digest.max) == (1.0, 2.0)
+
+
+def test_digest_round_trips_through_json():
+    digest = TDigest().update(np.random.default_rng(0).normal(size=10_000))
+    restored = TDigest.from_dict(json.loads(json.dumps(digest.to_dict(), allow_nan=False)))
+    
+    assert restored.quantile(0.01) == digest.quantile(0.01)
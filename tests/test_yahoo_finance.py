@@ -0,0 +1,23 @@
+"""YahooFinanceFetcher: info caching."""
+
+from src.data_fetchers.transport import LiveTransport
+from src.data_fetchers.ttl_cache import TTLCache
+from src.data_fetchers.yahoo_finance import YahooFinanceFetcher
+
+
+class _StubTransport(LiveTransport):
+    def __init__(self, name):
+        self.name = name
+    
+    def call(self, source, client, method, *args, **kwargs):
+        return {'shortName': self.name}
+
+
+def test_shared_info_cache_keeps_transports_apart():
+    cache = TTLCache()
+    first = YahooFinanceFetcher(transport=_StubTransport('first'), info_cache=cache)
+    second = YahooFinanceFetcher(transport=_StubTransport('second'), info_cache=cache)
+    
+    assert first.get_stock_info('aapl')['shortName'] == 'first'
+    assert second.get_stock_info('AAPL')['shortName'] == 'second'
+    assert first.get_stock_info('AAPL')['shortName'] == 'first'